@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import sqlite3
 import json
@@ -7,53 +7,123 @@ import time
 import os
 from typing import Dict, List, Optional
 
+from connection_pool import ConnectionPool
+from change_feed import ChangeFeed
+from dictionary_schema import create_change_log, create_payload_column, create_trigram_index, trigram_match_query
+from word_payload import WordEntry, encode_payload, word_data
+from word_signatures import create_signature_columns, backfill_signatures, word_signatures
+from word_cache import WordCache, MISSING
+from autocomplete import AutocompleteIndex
+from random_sampler import RandomSampler
+from spelling_suggestions import SpellingIndex
+from missing_words import MissingWordCache, create_missing_words_table
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
 # Database configuration
-DATABASE_PATH = 'dictionary.db'
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'dictionary.db')
+
+# Word cache configuration
+WORD_CACHE_SIZE = 10000
+WORD_CACHE_TTL = 300  # seconds
+
+# Batch lookup configuration
+BATCH_MAX_WORDS = 100
+SQL_IN_CHUNK_SIZE = 500  # stay under SQLite's bound parameter limit
+
+# Autocomplete configuration
+AUTOCOMPLETE_TOP_K = 10
+
+# Spelling suggestion configuration
+SUGGEST_MAX_DISTANCE = 2  # edits
+SUGGEST_LIMIT = 5
+
+# Negative cache of words the upstream API has no entry for
+MISSING_WORD_CACHE_SIZE = 10000
+MISSING_WORD_TTL = 86400  # seconds before a missing word is retried upstream
+PERSIST_MISSING_WORDS = True  # share misses across workers and restarts
 
 class DictionaryAPI:
     def __init__(self):
+        self.pool = ConnectionPool(DATABASE_PATH)
+        self.word_cache = WordCache(WORD_CACHE_SIZE, WORD_CACHE_TTL)
+        self.autocomplete = AutocompleteIndex(AUTOCOMPLETE_TOP_K)
+        self.random_sampler = RandomSampler()
+        self.spelling = SpellingIndex(SUGGEST_MAX_DISTANCE)
+        self.missing_words = MissingWordCache(self.pool if PERSIST_MISSING_WORDS else None,
+                                              MISSING_WORD_CACHE_SIZE, MISSING_WORD_TTL)
         self.init_database()
     
     def init_database(self):
         """Initialize SQLite database with dictionary table"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            # Create dictionary table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS dictionary (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    word TEXT UNIQUE NOT NULL,
+                    definitions TEXT NOT NULL,
+                    phonetic TEXT,
+                    part_of_speech TEXT,
+                    example TEXT,
+                    etymology TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Create index for faster word lookups
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_word ON dictionary(word)')
+            
+            # Pre-serialized /api/word bodies, written by store_word
+            create_payload_column(cursor)
+            
+            # Anagram and cryptogram signatures, written by store_word and filled in for older rows
+            create_signature_columns(cursor)
+            backfill_signatures(cursor)
+            
+            # Upstream misses, so they are not requested again until they expire
+            if PERSIST_MISSING_WORDS:
+                create_missing_words_table(cursor)
+                self.missing_words.prune(cursor)
+            
+            # Log writes so cached words are invalidated, whoever writes them
+            create_change_log(cursor)
+            
+            # Trigram index for substring search (kept in sync by triggers)
+            self.has_trigram_index = create_trigram_index(cursor, 'word')
         
-        # Create dictionary table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS dictionary (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT UNIQUE NOT NULL,
-                definitions TEXT NOT NULL,
-                phonetic TEXT,
-                part_of_speech TEXT,
-                example TEXT,
-                etymology TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create index for faster word lookups
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_word ON dictionary(word)')
-        
-        conn.commit()
-        conn.close()
+        # Start the feed before loading so no write falls in between
+        self.change_feed = ChangeFeed(self.pool)
+        self.change_feed.subscribe(self.on_dictionary_changes)
+        self.autocomplete.load(self.pool.reader())
+        self.random_sampler.load(self.pool.reader())
+        self.spelling.load(self.pool.reader())
         
         # Populate with initial common words if database is empty
         if self.get_word_count() == 0:
             self.populate_initial_words()
     
+    def on_dictionary_changes(self, changes):
+        """Update the word cache and in-memory indexes after writes"""
+        if changes is None:
+            self.word_cache.clear()
+            self.autocomplete.load(self.pool.reader())
+            self.random_sampler.load(self.pool.reader())
+            self.spelling.load(self.pool.reader())
+        else:
+            self.word_cache.invalidate_many(change.word for change in changes)
+            self.autocomplete.refresh(self.pool.reader(), changes)
+            self.random_sampler.refresh(self.pool.reader(), (change.word_id for change in changes))
+            self.spelling.refresh(self.pool.reader(), changes)
+    
     def get_word_count(self) -> int:
         """Get total number of words in database"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        cursor = self.pool.reader().cursor()
         cursor.execute('SELECT COUNT(*) FROM dictionary')
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        return cursor.fetchone()[0]
     
     def populate_initial_words(self):
         """Populate database with common English words"""
@@ -104,10 +174,19 @@ class DictionaryAPI:
     
     def fetch_word_definition(self, word: str) -> Optional[Dict]:
         """Fetch word definition from Free Dictionary API"""
+        # Known misses are answered locally instead of waiting on the network
+        if word in self.missing_words:
+            return None
+        
         try:
             url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word.lower()}"
             response = requests.get(url, timeout=5)
             
+            # Only a definite "not found" is remembered; timeouts and 5xx are retried
+            if response.status_code == 404:
+                self.missing_words.add(word)
+                return None
+            
             if response.status_code == 200:
                 data = response.json()
                 if data and len(data) > 0:
@@ -144,82 +223,167 @@ class DictionaryAPI:
     
     def store_word(self, word: str, definition_data: Dict):
         """Store word and definition in database"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO dictionary 
-                (word, definitions, phonetic, part_of_speech, example, etymology)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                word.lower(),
-                json.dumps(definition_data['definitions']),
-                definition_data.get('phonetic', ''),
-                definition_data.get('part_of_speech', ''),
-                definition_data.get('example', ''),
-                definition_data.get('etymology', '')
-            ))
-            conn.commit()
+            row = {
+                'word': word.lower(),
+                'definitions': json.dumps(definition_data['definitions']),
+                'phonetic': definition_data.get('phonetic', ''),
+                'part_of_speech': definition_data.get('part_of_speech', ''),
+                'example': definition_data.get('example', ''),
+                'etymology': definition_data.get('etymology', '')
+            }
+            with self.pool.writer() as conn:
+                conn.execute('''
+                    INSERT INTO dictionary 
+                    (word, definitions, phonetic, part_of_speech, example, etymology, payload,
+                     letters_sorted, letter_pattern)
+                    VALUES (:word, :definitions, :phonetic, :part_of_speech, :example, :etymology, :payload,
+                            :letters_sorted, :letter_pattern)
+                    ON CONFLICT(word) DO UPDATE SET
+                        definitions = excluded.definitions,
+                        phonetic = excluded.phonetic,
+                        part_of_speech = excluded.part_of_speech,
+                        example = excluded.example,
+                        etymology = excluded.etymology,
+                        payload = excluded.payload
+                ''', dict(row, payload=encode_payload(word_data(row)), **word_signatures(word)))
+            # A stored word is no longer a miss, even if it is deleted again later
+            self.missing_words.discard(word)
         except Exception as e:
             print(f"Error storing word {word}: {e}")
-        finally:
-            conn.close()
+        
+        # Pick up our own write right away instead of on the next poll
+        self.change_feed.poll(force=True)
     
     def get_word(self, word: str) -> Optional[Dict]:
-        """Get word definition from database"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        """Get word definition, served from the word cache when possible"""
+        entry = self.get_word_entry(word)
+        return entry.data() if entry else None
+    
+    def get_word_entry(self, word: str) -> Optional[WordEntry]:
+        """Get a word's ready-to-send response body, served from the word cache when possible"""
+        self.change_feed.poll()
+        
+        key = word.lower()
+        cached = self.word_cache.get(key)
+        if cached is not MISSING:
+            return cached
+        
+        version = self.change_feed.last_id
+        entry = self.load_word_entry(key)
+        if self.change_feed.last_id == version:
+            self.word_cache.set(key, entry)
+        return entry
+    
+    def load_word_entry(self, word: str) -> Optional[WordEntry]:
+        """Get a word's stored payload from the database, or build it from the row"""
+        cursor = self.pool.reader().cursor()
         
         cursor.execute('''
-            SELECT word, definitions, phonetic, part_of_speech, example, etymology
+            SELECT payload, word, definitions, phonetic, part_of_speech, example, etymology
             FROM dictionary WHERE word = ? LIMIT 1
         ''', (word.lower(),))
         
         row = cursor.fetchone()
-        conn.close()
         
         if row:
-            return {
-                'word': row[0],
-                'definitions': json.loads(row[1]) if row[1] else [],
-                'phonetic': row[2],
-                'part_of_speech': row[3],
-                'example': row[4],
-                'etymology': row[5]
-            }
+            if row['payload']:
+                return WordEntry.from_payload(row['payload'])
+            return WordEntry.from_data(word_data(row))
         return None
     
+    def get_words(self, words: List[str]) -> Dict[str, Optional[Dict]]:
+        """Get many word definitions at once, keyed by lowercase word"""
+        self.change_feed.poll()
+        
+        results = {}
+        to_load = []
+        for word in words:
+            key = word.lower()
+            if key in results:
+                continue
+            cached = self.word_cache.get(key)
+            if cached is MISSING:
+                results[key] = None
+                to_load.append(key)
+            else:
+                results[key] = cached.data() if cached else None
+        
+        if not to_load:
+            return results
+        
+        version = self.change_feed.last_id
+        cursor = self.pool.reader().cursor()
+        for start in range(0, len(to_load), SQL_IN_CHUNK_SIZE):
+            chunk = to_load[start:start + SQL_IN_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT word, definitions, phonetic, part_of_speech, example, etymology
+                FROM dictionary WHERE word IN ({placeholders})
+            ''', chunk)
+            for row in cursor.fetchall():
+                results[row[0]] = word_data(row)
+        
+        if self.change_feed.last_id == version:
+            for key in to_load:
+                self.word_cache.set(key, WordEntry.from_data(results[key]) if results[key] else None)
+        
+        return results
+    
+    def suggest_words(self, word: str, limit: int = SUGGEST_LIMIT) -> List[Dict]:
+        """Get the closest stored spellings of a word from memory"""
+        self.change_feed.poll()
+        return [{'word': suggestion, 'distance': distance}
+                for suggestion, distance in self.spelling.suggest(word, limit)]
+    
+    def autocomplete_words(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get prefix completions from the in-memory index"""
+        self.change_feed.poll()
+        return self.autocomplete.complete(prefix, limit)
+    
     def search_words(self, pattern: str, limit: int = 50) -> List[str]:
         """Search for words matching pattern"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        cursor = self.pool.reader().cursor()
         
-        cursor.execute('''
-            SELECT word FROM dictionary 
-            WHERE word LIKE ? 
-            ORDER BY word 
-            LIMIT ?
-        ''', (f'%{pattern.lower()}%', limit))
-        
-        words = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return words
+        if self.has_trigram_index and len(pattern) >= 3:
+            cursor.execute('''
+                SELECT d.word FROM dictionary_trigram t
+                JOIN dictionary d ON d.id = t.rowid
+                WHERE dictionary_trigram MATCH ?
+                ORDER BY d.word 
+                LIMIT ?
+            ''', (trigram_match_query(pattern.lower()), limit))
+        else:
+            cursor.execute('''
+                SELECT word FROM dictionary 
+                WHERE word LIKE ? 
+                ORDER BY word 
+                LIMIT ?
+            ''', (f'%{pattern.lower()}%', limit))
+        
+        return [row[0] for row in cursor.fetchall()]
     
     def get_random_words(self, count: int = 10) -> List[Dict]:
-        """Get random words from database"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        """Get random words, sampled in memory and fetched by primary key"""
+        self.change_feed.poll()
         
-        cursor.execute('''
-            SELECT word, definitions, phonetic, part_of_speech, example
+        word_ids = self.random_sampler.sample(count)
+        if not word_ids:
+            return []
+        
+        cursor = self.pool.reader().cursor()
+        
+        placeholders = ','.join('?' * len(word_ids))
+        cursor.execute(f'''
+            SELECT id, word, definitions, phonetic, part_of_speech, example
             FROM dictionary 
-            ORDER BY RANDOM() 
-            LIMIT ?
-        ''', (count,))
+            WHERE id IN ({placeholders})
+        ''', word_ids)
+        
+        rows = {row[0]: row[1:] for row in cursor.fetchall()}
         
         words = []
-        for row in cursor.fetchall():
+        for row in (rows[word_id] for word_id in word_ids if word_id in rows):
             words.append({
                 'word': row[0],
                 'definitions': json.loads(row[1]) if row[1] else [],
@@ -228,7 +392,6 @@ class DictionaryAPI:
                 'example': row[4]
             })
         
-        conn.close()
         return words
 
 # Initialize dictionary API
@@ -241,7 +404,10 @@ def home():
         'message': 'Dictionary API for MultigameApp',
         'endpoints': {
             '/api/word/<word>': 'GET - Get definition for a specific word',
+            '/api/words/batch': 'POST - Get definitions for a list of words (body: {"words": [...]})',
             '/api/search': 'GET - Search words (query parameter: q)',
+            '/api/autocomplete': 'GET - Prefix completions (query parameters: q, limit)',
+            '/api/suggest': 'GET - Spelling suggestions (query parameters: q, limit)',
             '/api/random': 'GET - Get random words (query parameter: count)',
             '/api/stats': 'GET - Get database statistics',
             '/api/add-word': 'POST - Add a new word to database'
@@ -254,24 +420,23 @@ def get_word_definition(word):
     """Get definition for a specific word"""
     try:
         # First check database
-        definition = dictionary_api.get_word(word)
+        entry = dictionary_api.get_word_entry(word)
         
-        if not definition:
+        if not entry:
             # If not in database, try to fetch from API
             definition_data = dictionary_api.fetch_word_definition(word)
             if definition_data:
                 dictionary_api.store_word(word, definition_data)
-                definition = dictionary_api.get_word(word)
+                entry = dictionary_api.get_word_entry(word)
         
-        if definition:
-            return jsonify({
-                'success': True,
-                'data': definition
-            })
+        if entry:
+            # Stored bodies are sent as-is, without a parse/serialize round trip
+            return Response(entry.body, mimetype='application/json')
         else:
             return jsonify({
                 'success': False,
-                'message': f'Word "{word}" not found'
+                'message': f'Word "{word}" not found',
+                'suggestions': dictionary_api.suggest_words(word)
             }), 404
             
     except Exception as e:
@@ -280,6 +445,57 @@ def get_word_definition(word):
             'message': f'Error: {str(e)}'
         }), 500
 
+@app.route('/api/words/batch', methods=['POST'])
+def get_word_definitions_batch():
+    """Get definitions for a list of words from the database"""
+    try:
+        data = request.get_json(silent=True) or {}
+        words = data.get('words')
+        
+        if not isinstance(words, list) or not words:
+            return jsonify({
+                'success': False,
+                'message': 'Request body must contain a non-empty "words" list'
+            }), 400
+        
+        if len(words) > BATCH_MAX_WORDS:
+            return jsonify({
+                'success': False,
+                'message': f'At most {BATCH_MAX_WORDS} words can be looked up per request'
+            }), 400
+        
+        words = [str(word).strip() for word in words if str(word).strip()]
+        results = dictionary_api.get_words(words)
+        
+        found = []
+        missing = []
+        seen = set()
+        for word in words:
+            key = word.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            if results.get(key):
+                found.append(results[key])
+            else:
+                missing.append(word)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'requested': len(seen),
+                'found_count': len(found),
+                'words': found,
+                'missing': missing
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
 @app.route('/api/search')
 def search_words():
     """Search for words matching pattern"""
@@ -310,6 +526,66 @@ def search_words():
             'message': f'Error: {str(e)}'
         }), 500
 
+@app.route('/api/autocomplete')
+def autocomplete_words():
+    """Get type-ahead completions for a prefix"""
+    try:
+        query = request.args.get('q', '').strip()
+        limit = min(int(request.args.get('limit', AUTOCOMPLETE_TOP_K)), 50)  # Max 50 results
+        
+        if not query:
+            return jsonify({
+                'success': False,
+                'message': 'Query parameter q is required'
+            }), 400
+        
+        words = dictionary_api.autocomplete_words(query, limit)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'query': query,
+                'count': len(words),
+                'words': words
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@app.route('/api/suggest')
+def suggest_words():
+    """Get "did you mean" spellings for a possibly misspelled word"""
+    try:
+        query = request.args.get('q', '').strip()
+        limit = min(int(request.args.get('limit', SUGGEST_LIMIT)), 50)  # Max 50 results
+        
+        if not query:
+            return jsonify({
+                'success': False,
+                'message': 'Query parameter q is required'
+            }), 400
+        
+        suggestions = dictionary_api.suggest_words(query, limit)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'query': query,
+                'count': len(suggestions),
+                'suggestions': suggestions
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
 @app.route('/api/random')
 def get_random_words():
     """Get random words from database"""
@@ -341,6 +617,12 @@ def get_stats():
             'success': True,
             'data': {
                 'total_words': total_words,
+                'connection_pool': dictionary_api.pool.stats(),
+                'word_cache': dictionary_api.word_cache.stats(),
+                'autocomplete': dictionary_api.autocomplete.stats(),
+                'random_sampler': dictionary_api.random_sampler.stats(),
+                'spelling': dictionary_api.spelling.stats(),
+                'missing_words': dictionary_api.missing_words.stats(),
                 'database_size': f"{os.path.getsize(DATABASE_PATH) / 1024 / 1024:.2f} MB" if os.path.exists(DATABASE_PATH) else "0 MB"
             }
         })
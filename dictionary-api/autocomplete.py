@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+In-Memory Autocomplete Index
+Sorted word array with precomputed top-k completions for short prefixes
+"""
+
+import bisect
+import heapq
+import threading
+import time
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from dictionary_schema import table_columns
+
+logger = logging.getLogger(__name__)
+
+# Rank tuples sort ascending: common words first, then by frequency rank,
+# then by usage frequency (higher first), then shorter words
+Rank = Tuple[int, int, int, int]
+
+
+def rank_key(ranks: Dict[str, Rank]) -> Callable[[str], Tuple[Rank, str]]:
+    """Sort key for words by rank, ties broken alphabetically, shared by every top-k path"""
+    return lambda word: (ranks[word], word)
+
+
+class AutocompleteIndex:
+    """
+    Prefix completion over every word in the dictionary table.
+
+    Words are kept in one sorted list, so the completions for any prefix are
+    a contiguous slice found with two binary searches. For prefixes up to
+    ``precompute_depth`` characters, where that slice can cover a large part
+    of the dictionary, the best ``top_k`` completions are precomputed.
+    """
+
+    def __init__(self, top_k: int = 10, precompute_depth: int = 3):
+        self.top_k = top_k
+        self.precompute_depth = precompute_depth
+
+        self._words: List[str] = []
+        self._ranks: Dict[str, Rank] = {}
+        self._top: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+        self.build_seconds = 0.0
+        self.updates = 0
+
+    @staticmethod
+    def _rank_select(cursor) -> str:
+        """SELECT list for (word, rank fields), tolerant of older schemas"""
+        columns = table_columns(cursor)
+        is_common = 'COALESCE(is_common, 0)' if 'is_common' in columns else '0'
+        frequency_rank = 'COALESCE(frequency_rank, 999999)' if 'frequency_rank' in columns else '999999'
+        usage_frequency = 'COALESCE(usage_frequency, 0)' if 'usage_frequency' in columns else '0'
+        return f'lower(word), {is_common}, {frequency_rank}, {usage_frequency}'
+
+    @staticmethod
+    def _rank(word: str, is_common, frequency_rank, usage_frequency) -> Rank:
+        return (0 if is_common else 1, frequency_rank, -usage_frequency, len(word))
+
+    def load(self, conn):
+        """(Re)build the whole index from the dictionary table"""
+        start = time.perf_counter()
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT {self._rank_select(cursor)} FROM dictionary')
+
+        ranks = {}
+        for word, is_common, frequency_rank, usage_frequency in cursor:
+            ranks[word] = self._rank(word, is_common, frequency_rank, usage_frequency)
+
+        words = sorted(ranks)
+        top = self._precompute(words, ranks)
+
+        with self._lock:
+            self._words, self._ranks, self._top = words, ranks, top
+
+        self.build_seconds = time.perf_counter() - start
+        logger.info(f"Autocomplete index built: {len(words)} words in {self.build_seconds:.2f}s")
+
+    def _precompute(self, words: List[str], ranks: Dict[str, Rank]) -> Dict[str, List[str]]:
+        """Best completions for every prefix up to precompute_depth characters"""
+        top = {}
+        for depth in range(1, self.precompute_depth + 1):
+            lo = 0
+            while lo < len(words):
+                prefix = words[lo][:depth]
+                hi = bisect.bisect_left(words, prefix + '\uffff', lo)
+                if len(prefix) == depth:
+                    top[prefix] = heapq.nsmallest(self.top_k, words[lo:hi], key=rank_key(ranks))
+                lo = hi
+        return top
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect.bisect_left(self._words, prefix)
+        hi = bisect.bisect_left(self._words, prefix + '\uffff', lo)
+        return lo, hi
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Get the best-ranked words starting with ``prefix``"""
+        prefix = prefix.lower()
+        limit = limit or self.top_k
+
+        with self._lock:
+            if limit <= self.top_k and prefix in self._top:
+                return self._top[prefix][:limit]
+
+            lo, hi = self._range(prefix)
+            return heapq.nsmallest(limit, self._words[lo:hi], key=rank_key(self._ranks))
+
+    def refresh(self, conn, changes: Iterable):
+        """Re-read changed rows (``Change`` tuples) and update the index"""
+        changes = list(changes)
+        if not changes:
+            return
+
+        words = {change.word for change in changes}
+        word_ids = list({change.word_id for change in changes})
+
+        cursor = conn.cursor()
+        select = self._rank_select(cursor)
+        current = {}
+        for start in range(0, len(word_ids), 500):
+            chunk = word_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'SELECT {select} FROM dictionary WHERE id IN ({placeholders})', chunk)
+            for word, is_common, frequency_rank, usage_frequency in cursor.fetchall():
+                current[word] = self._rank(word, is_common, frequency_rank, usage_frequency)
+        words.update(current)
+
+        with self._lock:
+            for word in words:
+                present = word in self._ranks
+                if word in current:
+                    if not present:
+                        bisect.insort(self._words, word)
+                    self._ranks[word] = current[word]
+                elif present:
+                    index = bisect.bisect_left(self._words, word)
+                    del self._words[index]
+                    del self._ranks[word]
+
+            # Only the precomputed prefixes of changed words can be affected
+            by_prefix = {}
+            for word in words:
+                for depth in range(1, min(len(word), self.precompute_depth) + 1):
+                    by_prefix.setdefault(word[:depth], set()).add(word)
+            for prefix, changed in by_prefix.items():
+                self._update_top(prefix, changed)
+
+            self.updates += len(words)
+
+    def _update_top(self, prefix: str, changed: Set[str]):
+        """Fix up a precomputed prefix after ``changed`` words moved (lock held)"""
+        top = self._top.get(prefix)
+
+        # Words outside the current top-k can only enter it, so unless a
+        # top-k word itself changed a merge (or nothing) is enough
+        if top is not None and changed.isdisjoint(top):
+            entering = [word for word in changed if word in self._ranks]
+            if entering:
+                self._top[prefix] = heapq.nsmallest(
+                    self.top_k, top + entering, key=rank_key(self._ranks)
+                )
+            return
+
+        lo, hi = self._range(prefix)
+        if lo < hi:
+            self._top[prefix] = heapq.nsmallest(
+                self.top_k, self._words[lo:hi], key=rank_key(self._ranks)
+            )
+        else:
+            self._top.pop(prefix, None)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def stats(self) -> Dict:
+        """Get index size and build information"""
+        return {
+            'words': len(self._words),
+            'precomputed_prefixes': len(self._top),
+            'top_k': self.top_k,
+            'build_seconds': round(self.build_seconds, 3),
+            'updates': self.updates
+        }
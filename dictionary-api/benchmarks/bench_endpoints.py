@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Endpoint Latency Benchmarks
+Drives the routes of app.py or enhanced_api.py against a synthetic dictionary,
+either in-process through the Flask test client or over HTTP against a real
+server, and reports throughput and latency percentiles as JSON
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import logging
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, API_DIR)
+
+logger = logging.getLogger(__name__)
+
+# (method, path, JSON body)
+Request = Tuple[str, str, Optional[dict]]
+
+# Rules every Flask app registers that are not part of the API
+IGNORED_RULES = {'/static/<path:filename>'}
+
+
+class Unpaginated(Exception):
+    """The route answered a page request without a next_cursor field"""
+
+
+class Workload:
+    """Request generators for each benchmarked endpoint, fed by real words"""
+
+    def __init__(self, database_path: str, seed: int = 7, sample_size: int = 5000):
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        conn = sqlite3.connect(database_path)
+        rows = conn.execute(
+            'SELECT word FROM dictionary ORDER BY random() LIMIT ?', (sample_size,)
+        ).fetchall()
+        self.total_words = conn.execute('SELECT COUNT(*) FROM dictionary').fetchone()[0]
+        conn.close()
+        self.words = [row[0] for row in rows]
+
+        # Sends a request and returns its JSON body; run() installs it so the
+        # page-2 generators can follow a real next_cursor
+        self.fetch: Optional[Callable[[Request], dict]] = None
+
+        # name -> (route rule it needs, request generator)
+        self.endpoints: Dict[str, Tuple[str, Callable[[], Request]]] = {
+            'docs': ('/', lambda: ('GET', '/', None)),
+            'word': ('/api/word/<word>', lambda: ('GET', f'/api/word/{self.word()}', None)),
+            'word_missing': ('/api/word/<word>', lambda: ('GET', f'/api/word/{self.word()}qzx', None)),
+            'words_batch': ('/api/words/batch', lambda: (
+                'POST', '/api/words/batch', {'words': [self.word() for _ in range(20)]}
+            )),
+            'search': ('/api/search', lambda: ('GET', f'/api/search?q={self.substring(3)}&limit=50', None)),
+            'search_short': ('/api/search', lambda: ('GET', f'/api/search?q={self.substring(2)}&limit=50', None)),
+            'autocomplete': ('/api/autocomplete', lambda: (
+                'GET', f'/api/autocomplete?q={self.word()[:self.choice((1, 2, 3, 4))]}', None
+            )),
+            'random': ('/api/random', lambda: ('GET', '/api/random?count=10', None)),
+            'random_filtered': ('/api/random', lambda: (
+                'GET', f'/api/random?count=10&difficulty={self.choice((1, 2, 3, 4, 5))}&common_only=true', None
+            )),
+            'full_text': ('/api/search/full-text', lambda: (
+                'GET', f'/api/search/full-text?q={self.word()}&limit=20', None
+            )),
+            'criteria': ('/api/words/criteria', lambda: (
+                'GET', f'/api/words/criteria?part_of_speech=noun&difficulty={self.choice((1, 2, 3, 4, 5))}'
+                       f'&min_length=4&max_length=8&limit=50', None
+            )),
+            'stats': ('/api/stats', lambda: ('GET', '/api/stats', None)),
+            'suggest': ('/api/suggest', lambda: ('GET', f'/api/suggest?q={self.typo()}', None)),
+            'anagrams': ('/api/anagrams', lambda: ('GET', f'/api/anagrams?letters={self.shuffled()}', None)),
+            'pattern': ('/api/pattern', lambda: ('GET', f'/api/pattern?{self.hangman_mask()}', None)),
+            'cryptogram': ('/api/cryptogram/candidates', lambda: (
+                'GET', f'/api/cryptogram/candidates?pattern={self.word()}', None
+            )),
+            'export': ('/api/export', lambda: (
+                'GET', f'/api/export?difficulty={self.choice((1, 2, 3, 4, 5))}&part_of_speech=noun&is_common=true', None
+            )),
+            'metrics': ('/metrics', lambda: ('GET', '/metrics', None)),
+            # Existing words only: a new word would go to the upstream dictionary API
+            'add_word_existing': ('/api/add-word', lambda: ('POST', '/api/add-word', {'word': self.word()})),
+            'search_page2': ('/api/search', lambda: self.next_page(
+                lambda: f'/api/search?q={self.substring(2)}&limit=20'
+            )),
+            'full_text_page2': ('/api/search/full-text', lambda: self.next_page(
+                lambda: f'/api/search/full-text?q={self.substring(3)}&limit=5'
+            )),
+            'criteria_page2': ('/api/words/criteria', lambda: self.next_page(
+                lambda: f'/api/words/criteria?part_of_speech=noun&difficulty={self.choice((1, 2, 3, 4, 5))}'
+                        f'&min_length=4&max_length=8&limit=50'
+            )),
+        }
+
+    def choice(self, values):
+        with self._lock:
+            return self.rng.choice(values)
+
+    def word(self) -> str:
+        return self.choice(self.words)
+
+    def substring(self, length: int) -> str:
+        word = self.word()
+        with self._lock:
+            start = self.rng.randint(0, max(0, len(word) - length))
+        return word[start:start + length]
+
+    def typo(self) -> str:
+        """A word with one letter replaced, one edit away from the original"""
+        word = self.word()
+        with self._lock:
+            index = self.rng.randrange(len(word))
+            letter = self.rng.choice('abcdefghijklmnopqrstuvwxyz')
+        return word[:index] + letter + word[index + 1:]
+
+    def shuffled(self) -> str:
+        letters = list(self.word())
+        with self._lock:
+            self.rng.shuffle(letters)
+        return ''.join(letters)
+
+    def hangman_mask(self) -> str:
+        """Query string for a hangman position: some letters revealed, a few guessed wrong"""
+        word = self.word()
+        with self._lock:
+            distinct = sorted(set(word))
+            revealed = set(self.rng.sample(distinct, self.rng.randint(0, max(0, len(distinct) - 1))))
+            wrong = self.rng.sample(sorted(set('etaoinshrdlu') - set(word)), 2)
+        mask = ''.join(c if c in revealed else '_' for c in word)
+        return f'mask={quote(mask)}&exclude={"".join(wrong)}'
+
+    def next_page(self, first_page: Callable[[], str], attempts: int = 20) -> Request:
+        """
+        The request for page 2 of a paginated query, using the cursor the API
+        returned for page 1. Falls back to page 1 if no sampled query has one.
+        """
+        for _ in range(attempts):
+            path = first_page()
+            data = self.fetch(('GET', path, None)).get('data') or {}
+            if 'next_cursor' not in data:
+                raise Unpaginated(path)
+            if data['next_cursor']:
+                return 'GET', f"{path}&cursor={quote(data['next_cursor'])}", None
+        return 'GET', path, None
+
+    def available(self, rules) -> List[str]:
+        """Endpoints whose route exists in an app's URL map"""
+        return [name for name, (rule, _) in self.endpoints.items() if rule in rules]
+
+    def uncovered(self, rules) -> List[str]:
+        """Routes in an app's URL map that no endpoint exercises"""
+        covered = {rule for rule, _ in self.endpoints.values()}
+        return sorted(set(rules) - covered - IGNORED_RULES)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], statuses: Dict[int, int], elapsed: float) -> Dict:
+    latencies = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    errors = sum(count for status, count in statuses.items() if status >= 500 or status == 0)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'status_counts': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            'p50': ms(percentile(latencies, 50)),
+            'p95': ms(percentile(latencies, 95)),
+            'p99': ms(percentile(latencies, 99)),
+            'max': ms(latencies[-1]) if latencies else 0.0
+        }
+    }
+
+
+def run_endpoint(make_sender: Callable[[], Callable[[Request], int]],
+                 generate: Callable[[], Request],
+                 requests: int, concurrency: int, warmup: int) -> Dict:
+    """Send ``requests`` requests from ``concurrency`` threads and summarize them"""
+    local = threading.local()
+
+    def send(request: Request) -> Tuple[float, int]:
+        sender = getattr(local, 'sender', None)
+        if sender is None:
+            sender = local.sender = make_sender()
+        start = time.perf_counter()
+        try:
+            status = sender(request)
+        except Exception as e:
+            logger.debug(f"Request {request[1]} failed: {e}")
+            status = 0
+        return time.perf_counter() - start, status
+
+    requests_to_send = [generate() for _ in range(warmup + requests)]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, requests_to_send[:warmup]))
+
+        start = time.perf_counter()
+        results = list(executor.map(send, requests_to_send[warmup:]))
+        elapsed = time.perf_counter() - start
+
+    statuses = {}
+    for _, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return summarize([latency for latency, _ in results], statuses, elapsed)
+
+
+def configure_environment(database_path: str):
+    """Point the API modules at the benchmark database before they are imported"""
+    os.environ['DATABASE_PATH'] = os.path.abspath(database_path)
+    # Benchmarks measure the endpoints, not the limiter's 429 responses
+    os.environ.setdefault('RATE_LIMIT_REQUESTS', str(10 ** 9))
+
+
+def load_app(module_name: str):
+    os.chdir(API_DIR)
+    module = __import__(module_name)
+    return module.app
+
+
+def test_client_sender(app) -> Callable[[], Callable[[Request], int]]:
+    def make_sender():
+        client = app.test_client()
+
+        def send(request: Request) -> int:
+            method, path, body = request
+            response = client.open(path, method=method, json=body)
+            response.get_data()
+            return response.status_code
+        return send
+    return make_sender
+
+
+def test_client_fetcher(app) -> Callable[[Request], dict]:
+    client = app.test_client()
+
+    def fetch(request: Request) -> dict:
+        method, path, body = request
+        return client.open(path, method=method, json=body).get_json(silent=True) or {}
+    return fetch
+
+
+def http_sender(base_url: str) -> Callable[[], Callable[[Request], int]]:
+    import requests as http
+
+    def make_sender():
+        session = http.Session()
+
+        def send(request: Request) -> int:
+            method, path, body = request
+            response = session.request(method, base_url + path, json=body, timeout=30)
+            return response.status_code
+        return send
+    return make_sender
+
+
+def http_fetcher(base_url: str) -> Callable[[Request], dict]:
+    import requests as http
+    session = http.Session()
+
+    def fetch(request: Request) -> dict:
+        method, path, body = request
+        response = session.request(method, base_url + path, json=body, timeout=30)
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+    return fetch
+
+
+def start_server(module_name: str, database_path: str, port: int) -> Tuple[subprocess.Popen, set]:
+    """
+    Run the app under werkzeug's threaded server in a child process, so the
+    load generator does not share its GIL. Returns the process and the app's
+    route rules.
+    """
+    configure_environment(database_path)
+    routes_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+    routes_file.close()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'serve', '--app', module_name,
+         '--port', str(port), '--routes-file', routes_file.name],
+        env=dict(os.environ), cwd=API_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    import requests as http
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{module_name} server exited with code {process.returncode}")
+        try:
+            http.get(f'http://127.0.0.1:{port}/api/stats', timeout=1)
+            with open(routes_file.name) as f:
+                rules = set(json.load(f))
+            os.remove(routes_file.name)
+            return process, rules
+        except http.RequestException:
+            time.sleep(0.25)
+
+    process.terminate()
+    raise RuntimeError(f"{module_name} server did not start on port {port}")
+
+
+def serve(module_name: str, port: int, routes_file: str):
+    from werkzeug.serving import WSGIRequestHandler, run_simple
+
+    app = load_app(module_name)
+    with open(routes_file, 'w') as f:
+        json.dump([rule.rule for rule in app.url_map.iter_rules()], f)
+
+    # Keep-alive so the client measures requests rather than TCP handshakes
+    WSGIRequestHandler.protocol_version = 'HTTP/1.1'
+    run_simple('127.0.0.1', port, app, threaded=True)
+
+
+def run(args) -> Dict:
+    configure_environment(args.database)
+    workload = Workload(args.database)
+    endpoints = {}
+
+    if args.mode == 'test-client':
+        app = load_app(args.app)
+        rules = {rule.rule for rule in app.url_map.iter_rules()}
+        make_sender = test_client_sender(app)
+        workload.fetch = test_client_fetcher(app)
+        server = None
+    else:
+        server, rules = start_server(args.app, args.database, args.port)
+        make_sender = http_sender(f'http://127.0.0.1:{args.port}')
+        workload.fetch = http_fetcher(f'http://127.0.0.1:{args.port}')
+
+    try:
+        # A route without a workload would silently drop out of every report
+        uncovered = workload.uncovered(rules)
+        if uncovered:
+            raise RuntimeError(f"{args.app} routes without a benchmark workload: {', '.join(uncovered)}")
+
+        names = workload.available(rules)
+        if args.endpoints:
+            names = [name for name in names if name in args.endpoints]
+
+        for name in names:
+            _, generate = workload.endpoints[name]
+            try:
+                endpoints[name] = run_endpoint(make_sender, generate, args.requests,
+                                               args.concurrency, args.warmup)
+            except Unpaginated as e:
+                logger.info(f"{name:16} skipped: {e} returns no next_cursor")
+                continue
+            latency = endpoints[name]['latency_ms']
+            logger.info(f"{name:16} {endpoints[name]['throughput_rps']:>9} req/s  "
+                        f"p50 {latency['p50']:>8} ms  p95 {latency['p95']:>8} ms  p99 {latency['p99']:>8} ms")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    return {
+        'meta': {
+            'app': args.app,
+            'mode': args.mode,
+            'database': os.path.basename(args.database),
+            'words': workload.total_words,
+            'requests_per_endpoint': args.requests,
+            'concurrency': args.concurrency,
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'endpoints': endpoints
+    }
+
+
+def compare(baseline: Dict, candidate: Dict, metric: str) -> List[Dict]:
+    """Relative change of each shared endpoint's latency metric and throughput"""
+    rows = []
+    for name, result in candidate['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+        old, new = before['latency_ms'][metric], result['latency_ms'][metric]
+        rows.append({
+            'endpoint': name,
+            f'{metric}_before_ms': old,
+            f'{metric}_after_ms': new,
+            'latency_change_pct': round((new - old) / old * 100, 1) if old else 0.0,
+            'throughput_change_pct': round(
+                (result['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'] * 100, 1
+            ) if before['throughput_rps'] else 0.0
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dictionary API endpoint benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Benchmark every route of an API module')
+    run_parser.add_argument('--database', required=True, help='Benchmark database (see synthetic_dictionary.py)')
+    run_parser.add_argument('--app', choices=['enhanced_api', 'app'], default='enhanced_api')
+    run_parser.add_argument('--mode', choices=['test-client', 'http'], default='test-client')
+    run_parser.add_argument('--requests', type=int, default=500, help='Measured requests per endpoint')
+    run_parser.add_argument('--warmup', type=int, default=50, help='Unmeasured requests per endpoint')
+    run_parser.add_argument('--concurrency', type=int, default=1)
+    run_parser.add_argument('--port', type=int, default=5099, help='Server port in http mode')
+    run_parser.add_argument('--endpoints', nargs='+', help='Only run these endpoints')
+    run_parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two JSON reports')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--metric', choices=['mean', 'p50', 'p95', 'p99', 'max'], default='p95')
+    compare_parser.add_argument('--fail-above', type=float,
+                                help='Exit with status 1 if any endpoint slows down by more than this percent')
+
+    serve_parser = subparsers.add_parser('serve', help=argparse.SUPPRESS)
+    serve_parser.add_argument('--app', required=True)
+    serve_parser.add_argument('--port', type=int, required=True)
+    serve_parser.add_argument('--routes-file', required=True)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'serve':
+        serve(args.app, args.port, args.routes_file)
+        return 0
+
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.candidate) as f:
+            candidate = json.load(f)
+        rows = compare(baseline, candidate, args.metric)
+        print(json.dumps(rows, indent=2))
+        if args.fail_above is not None:
+            return 1 if any(row['latency_change_pct'] > args.fail_above for row in rows) else 0
+        return 0
+
+    if args.output:
+        # load_app changes directory, so resolve the path first
+        args.output = os.path.abspath(args.output)
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        logger.info(f"Report written to {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dictionary Generator
+Builds benchmark databases of any size with the comprehensive_setup.py schema,
+filled with deterministic pseudo-words instead of downloaded word lists
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import sqlite3
+from typing import Iterator, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comprehensive_setup import ComprehensiveDictionaryBuilder
+from word_payload import encode_payload
+from word_signatures import letter_pattern, letters_sorted
+
+logger = logging.getLogger(__name__)
+
+PARTS_OF_SPEECH = ['noun', 'verb', 'adjective', 'adverb', 'pronoun', 'preposition', 'conjunction']
+SYLLABLES = ['ba', 'ce', 'di', 'fo', 'gu', 'ha', 'ke', 'li', 'mo', 'nu', 'pa', 're', 'si', 'to',
+             'va', 'we', 'xi', 'yo', 'za', 'str', 'an', 'en', 'in', 'on', 'un', 'ght', 'ck', 'sh']
+# Rough English word length distribution for lengths 3..14
+LENGTH_WEIGHTS = [4, 9, 12, 14, 14, 13, 11, 8, 6, 4, 3, 2]
+
+INSERT_BATCH = 50000
+
+Row = Tuple
+
+
+def generate_words(count: int, seed: int = 42) -> Iterator[str]:
+    """Yield ``count`` distinct pronounceable pseudo-words"""
+    rng = random.Random(seed)
+    lengths = list(range(3, 3 + len(LENGTH_WEIGHTS)))
+    seen = set()
+    while len(seen) < count:
+        target = rng.choices(lengths, LENGTH_WEIGHTS)[0]
+        word = ''
+        while len(word) < target:
+            word += rng.choice(SYLLABLES)
+        word = word[:target]
+        if word not in seen:
+            seen.add(word)
+            yield word
+
+
+def generate_rows(count: int, seed: int = 42,
+                  definition_rate: float = 0.85, common_rate: float = 0.1) -> Iterator[Row]:
+    """Yield full dictionary rows for ``count`` synthetic words"""
+    rng = random.Random(seed + 1)
+    vocabulary = []
+
+    for rank, word in enumerate(generate_words(count, seed)):
+        vocabulary.append(word)
+        is_common = rng.random() < common_rate
+        if rng.random() < definition_rate:
+            definitions = [
+                f"The {rng.choice(vocabulary)} of a {rng.choice(vocabulary)} or {rng.choice(vocabulary)}."
+                for _ in range(rng.randint(1, 3))
+            ]
+            example = f"She used {word} near the {rng.choice(vocabulary)}."
+        else:
+            definitions, example = [], ''
+
+        part_of_speech = rng.choice(PARTS_OF_SPEECH)
+        difficulty_level = min(max(1, len(word) // 2), 10)
+        payload = encode_payload({
+            'word': word, 'definitions': definitions, 'phonetic': f'/{word}/',
+            'part_of_speech': part_of_speech, 'example': example, 'etymology': '',
+            'difficulty_level': difficulty_level, 'is_common': is_common
+        })
+        yield (
+            word, word, json.dumps(definitions), f'/{word}/',
+            part_of_speech, example, '',
+            difficulty_level, len(word), is_common,
+            rng.randint(0, 10000) if is_common else rng.randint(0, 100),
+            rank + 1 if is_common else 999999,
+            max(1, len(word) // 3), 'synthetic', payload,
+            letters_sorted(word), letter_pattern(word)
+        )
+
+
+def build_database(path: str, words: int, seed: int = 42) -> dict:
+    """Create ``path`` from scratch with ``words`` synthetic entries"""
+    start = time.perf_counter()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    builder = ComprehensiveDictionaryBuilder(path)
+
+    conn = builder.connect_for_build()
+    cursor = conn.cursor()
+    batch = []
+    for row in generate_rows(words, seed):
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH:
+            _insert(cursor, batch)
+            batch = []
+    if batch:
+        _insert(cursor, batch)
+    conn.commit()
+    conn.close()
+
+    # Same post-load steps as a real build
+    builder.create_indexes()
+    builder.create_fts_table()
+
+    conn = sqlite3.connect(path)
+    conn.execute('VACUUM')
+    conn.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Built {path}: {words} words in {elapsed:.1f}s")
+    return {'path': path, 'words': words, 'seed': seed, 'build_seconds': round(elapsed, 2)}
+
+
+def _insert(cursor: sqlite3.Cursor, rows):
+    cursor.executemany('''
+        INSERT INTO dictionary
+        (word, word_lowercase, definitions, phonetic, part_of_speech, example, etymology,
+         difficulty_level, word_length, is_common, usage_frequency, frequency_rank,
+         syllable_count, source, payload, letters_sorted, letter_pattern)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic benchmark dictionaries')
+    parser.add_argument('--words', type=int, nargs='+', default=[10000],
+                        help='Dictionary sizes to build (e.g. 10000 100000 500000)')
+    parser.add_argument('--output-dir', default='benchmarks/data',
+                        help='Directory for the generated databases (default: benchmarks/data)')
+    parser.add_argument('--seed', type=int, default=42)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for words in args.words:
+        build_database(os.path.join(args.output_dir, f'dictionary_{words}.db'), words, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Dictionary Change Feed
+Polls the trigger-maintained dictionary_changes log so in-memory structures
+(caches, indexes) can react to writes made by any process
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from collections import namedtuple
+from typing import Callable, List, Optional
+
+from dictionary_schema import FULL_RELOAD_WORD_ID
+
+logger = logging.getLogger(__name__)
+
+Change = namedtuple('Change', ['word_id', 'word'])
+
+
+class ChangeFeed:
+    """
+    Incremental reader over ``dictionary_changes``.
+
+    Subscribers receive a list of ``Change`` tuples for every batch of new
+    log rows, or ``None`` when too many rows changed at once or a full
+    rebuild was logged, and they should reload from scratch instead.
+    """
+
+    def __init__(self, pool, poll_interval: float = 1.0,
+                 max_batch: int = 10000, retention_hours: int = 24):
+        self.pool = pool
+        self.poll_interval = poll_interval
+        self.max_batch = max_batch
+        self.retention_hours = retention_hours
+
+        self._subscribers: List[Callable[[Optional[List[Change]]], None]] = []
+        self._lock = threading.Lock()
+        self._next_poll = 0.0
+        self._next_prune = time.monotonic() + 3600
+        self._enabled = True
+
+        self.last_id = self._current_max_id()
+        self.changes_seen = 0
+        self.resets = 0
+
+    def _current_max_id(self) -> int:
+        try:
+            cursor = self.pool.reader().cursor()
+            cursor.execute('SELECT MAX(id) FROM dictionary_changes')
+            return cursor.fetchone()[0] or 0
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Change log unavailable, change feed disabled: {e}")
+            self._enabled = False
+            return 0
+
+    def subscribe(self, callback: Callable[[Optional[List[Change]]], None]):
+        """Register a callback for new changes"""
+        self._subscribers.append(callback)
+
+    def _notify(self, changes: Optional[List[Change]]):
+        for callback in self._subscribers:
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.error(f"Change feed subscriber {callback!r} failed: {e}")
+
+    def poll(self, force: bool = False) -> int:
+        """
+        Deliver any changes logged since the last poll.
+
+        Cheap to call on every request: unless ``force`` is set it returns
+        immediately until ``poll_interval`` seconds have passed. Returns the
+        number of change rows consumed.
+        """
+        if not self._enabled:
+            return 0
+
+        now = time.monotonic()
+        if not force and now < self._next_poll:
+            return 0
+
+        # Only one thread needs to poll; the others keep serving
+        if not self._lock.acquire(blocking=force):
+            return 0
+
+        try:
+            self._next_poll = now + self.poll_interval
+
+            cursor = self.pool.reader().cursor()
+            cursor.execute('''
+                SELECT id, word_id, word FROM dictionary_changes
+                WHERE id > ? ORDER BY id LIMIT ?
+            ''', (self.last_id, self.max_batch + 1))
+            rows = cursor.fetchall()
+
+            if len(rows) > self.max_batch:
+                self.last_id = self._current_max_id()
+                self.resets += 1
+                self._notify(None)
+            elif any(row[1] == FULL_RELOAD_WORD_ID for row in rows):
+                self.last_id = rows[-1][0]
+                self.resets += 1
+                self._notify(None)
+            elif rows:
+                self.last_id = rows[-1][0]
+                self._notify([Change(row[1], row[2]) for row in rows])
+
+            self.changes_seen += len(rows)
+
+            if now >= self._next_prune:
+                self._next_prune = now + 3600
+                self.prune()
+
+            return len(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error polling change feed: {e}")
+            return 0
+        finally:
+            self._lock.release()
+
+    def prune(self):
+        """Delete change log rows older than the retention period"""
+        with self.pool.writer() as conn:
+            conn.execute(
+                "DELETE FROM dictionary_changes WHERE changed_at < datetime('now', ?)",
+                (f'-{int(self.retention_hours)} hours',)
+            )
+
+    def stats(self) -> dict:
+        """Get change feed counters"""
+        return {
+            'enabled': self._enabled,
+            'last_change_id': self.last_id,
+            'changes_seen': self.changes_seen,
+            'resets': self.resets
+        }
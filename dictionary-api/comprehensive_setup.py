@@ -14,10 +14,18 @@ import csv
 from pathlib import Path
 import time
 import logging
-from typing import Dict, List, Set, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Set, Optional, Tuple
+from itertools import islice
 import argparse
 
+from dictionary_schema import (
+    create_change_log, create_fts_index, create_trigram_index, create_stats_table, rebuild_stats,
+    rebuild_fts_index, create_payload_column, create_criteria_index, record_full_reload, table_exists
+)
+from definition_fetcher import AsyncDefinitionFetcher, WordDefinition
+from word_payload import encode_payload, rebuild_payloads
+from word_signatures import create_signature_columns, letter_pattern, letters_sorted
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,13 +33,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bulk load tuning
+BULK_INSERT_BATCH = 50000
+BUILD_CACHE_SIZE_KB = 256 * 1024
+
 class ComprehensiveDictionaryBuilder:
     """
     Builds a comprehensive English dictionary from multiple sources
     """
     
-    def __init__(self, database_path: str = "dictionary.db"):
+    def __init__(self, database_path: str = "dictionary.db", compress_payloads: bool = False):
         self.database_path = database_path
+        self.compress_payloads = compress_payloads
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Educational Dictionary Builder/1.0'
@@ -57,7 +70,6 @@ class ComprehensiveDictionaryBuilder:
             }
         }
         
-        self.processed_words = set()
         self.init_database()
     
     def init_database(self):
@@ -70,6 +82,14 @@ class ComprehensiveDictionaryBuilder:
         # Drop existing table if exists (for fresh start)
         cursor.execute('DROP TABLE IF EXISTS dictionary')
         cursor.execute('DROP TABLE IF EXISTS dictionary_fts')
+        cursor.execute('DROP TABLE IF EXISTS dictionary_trigram')
+        cursor.execute('DROP TABLE IF EXISTS dictionary_stats')
+        
+        # The old log describes rows that no longer exist; create_indexes logs
+        # one full-reload marker instead. Deleting (not dropping) keeps the
+        # id sequence, so running servers still see the marker as new
+        if table_exists(cursor, 'dictionary_changes'):
+            cursor.execute('DELETE FROM dictionary_changes')
         
         # Create enhanced dictionary table
         cursor.execute('''
@@ -85,14 +105,47 @@ class ComprehensiveDictionaryBuilder:
                 difficulty_level INTEGER DEFAULT 1,
                 word_length INTEGER NOT NULL,
                 is_common BOOLEAN DEFAULT 0,
+                usage_frequency INTEGER DEFAULT 0,
                 frequency_rank INTEGER DEFAULT 999999,
                 syllable_count INTEGER DEFAULT 1,
                 source TEXT DEFAULT 'unknown',
+                payload BLOB,
+                letters_sorted TEXT,
+                letter_pattern TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
+        conn.commit()
+        conn.close()
+        logger.info("Database initialized successfully")
+    
+    def connect_for_build(self) -> sqlite3.Connection:
+        """
+        Open a connection tuned for bulk loading: no fsyncs, an in-memory
+        rollback journal and a large page cache. A crash mid-build can leave
+        a corrupt file, which is acceptable because builds start from scratch.
+        """
+        conn = sqlite3.connect(self.database_path)
+        conn.execute('PRAGMA synchronous=OFF')
+        try:
+            conn.execute('PRAGMA journal_mode=MEMORY')
+        except sqlite3.OperationalError:
+            # A running API server holds the database open in WAL mode, which
+            # cannot be left while it is connected; build through the WAL
+            logger.info("Database in use, keeping its journal mode for the build")
+        conn.execute(f'PRAGMA cache_size=-{BUILD_CACHE_SIZE_KB}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
+    def create_indexes(self):
+        """Create secondary indexes and trigger-maintained tables after loading"""
+        logger.info("Creating indexes...")
+        
+        conn = self.connect_for_build()
+        cursor = conn.cursor()
+        
         # Create indexes for performance
         indexes = [
             'CREATE INDEX idx_word_lowercase ON dictionary(word_lowercase)',
@@ -106,16 +159,47 @@ class ComprehensiveDictionaryBuilder:
         for index in indexes:
             cursor.execute(index)
         
-        # Create FTS virtual table
-        cursor.execute('''
-            CREATE VIRTUAL TABLE dictionary_fts USING fts5(
-                word, definitions, example, content='dictionary', content_rowid='id'
-            )
-        ''')
+        # Sort order of /api/words/criteria, so its cursor pages are index seeks
+        create_criteria_index(cursor)
+        
+        # Change log lets running API servers invalidate their caches; the
+        # bulk load ran before its triggers, so tell them to reload everything
+        create_change_log(cursor)
+        record_full_reload(cursor)
+        
+        # Clears a stored /api/word body if a later write forgets to refresh it
+        create_payload_column(cursor)
+        
+        # Signature indexes behind /api/anagrams and /api/cryptogram/candidates
+        create_signature_columns(cursor)
         
+        # Trigram index for substring search, maintained by triggers
+        create_trigram_index(cursor, 'word_lowercase')
+        
+        # Summary counts behind the API's /api/stats, maintained by triggers
+        if create_stats_table(cursor):
+            rebuild_stats(cursor)
+        
+        cursor.execute('ANALYZE')
         conn.commit()
         conn.close()
-        logger.info("Database initialized successfully")
+        logger.info("Indexes created")
+    
+    def create_fts_table(self):
+        """Create the full-text search table once definitions are loaded"""
+        logger.info("Building full-text search table...")
+        
+        conn = self.connect_for_build()
+        cursor = conn.cursor()
+        # Indexed in one pass here; triggers keep it current afterwards
+        create_fts_index(cursor)
+        conn.commit()
+        
+        # The API servers read with WAL; journal_mode is stored in the file
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.close()
+        
+        logger.info("Full-text search table built")
     
     def download_file(self, url: str, filename: str) -> bool:
         """Download a file from URL"""
@@ -198,135 +282,116 @@ class ComprehensiveDictionaryBuilder:
         return common_words
     
     def process_wordlist_file(self, filename: str, source_name: str) -> int:
-        """Process a simple wordlist file"""
-        added_count = 0
+        """Stream a simple wordlist file into the dictionary table"""
+        common_words = self.get_common_words_list()
         
-        try:
+        def rows():
             with open(filename, 'r', encoding='utf-8') as f:
-                words = [line.strip().lower() for line in f if line.strip()]
-            
-            logger.info(f"Processing {len(words)} words from {source_name}")
-            
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            
-            common_words = self.get_common_words_list()
-            
-            for i, word in enumerate(words):
-                if (len(word) >= 2 and word.isalpha() and 
-                    word not in self.processed_words):
-                    
-                    is_common = word in common_words
-                    frequency_rank = i + 1 if source_name == 'common_words' else 999999
-                    difficulty = min(max(1, len(word) // 2), 10)
-                    
-                    try:
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO dictionary 
-                            (word, word_lowercase, word_length, is_common, 
-                             frequency_rank, difficulty_level, source)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            word, word.lower(), len(word), 
-                            1 if is_common else 0, frequency_rank, 
-                            difficulty, source_name
-                        ))
-                        
-                        if cursor.rowcount > 0:
-                            added_count += 1
-                            self.processed_words.add(word)
-                        
-                    except sqlite3.Error as e:
-                        logger.warning(f"Error inserting word {word}: {e}")
-                
-                if i % 1000 == 0:
-                    conn.commit()
-                    logger.info(f"Processed {i} words from {source_name}")
-            
-            conn.commit()
-            conn.close()
-            
+                for i, word in enumerate(line.strip().lower() for line in f if line.strip()):
+                    if len(word) >= 2 and word.isalpha():
+                        yield (
+                            word, word, len(word),
+                            1 if word in common_words else 0,
+                            i + 1 if source_name == 'common_words' else 999999,
+                            min(max(1, len(word) // 2), 10), source_name
+                        )
+        
+        try:
+            added_count = self.bulk_insert_words(rows(), source_name)
         except Exception as e:
             logger.error(f"Error processing {filename}: {e}")
+            return 0
         
         return added_count
     
-    def fetch_definitions_from_api(self, words: List[str], max_workers: int = 5) -> int:
+    def bulk_insert_words(self, rows: Iterable[Tuple], source_name: str) -> int:
+        """
+        Insert (word, word_lowercase, word_length, is_common, frequency_rank,
+        difficulty_level, source) rows in one transaction, BULK_INSERT_BATCH
+        rows per executemany, each with its pre-serialized /api/word payload
+        and word signatures.
+        Duplicates are skipped by the UNIQUE constraint on word. Returns the
+        number of rows added.
+        """
+        rows = (row + (self.word_payload(row), letters_sorted(row[0]), letter_pattern(row[0]))
+                for row in rows)
+        conn = self.connect_for_build()
+        cursor = conn.cursor()
+        changes_before = conn.total_changes
+        processed = 0
+        
+        try:
+            for batch in iter(lambda: list(islice(rows, BULK_INSERT_BATCH)), []):
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO dictionary 
+                    (word, word_lowercase, word_length, is_common, 
+                     frequency_rank, difficulty_level, source, payload, letters_sorted,
+                     letter_pattern)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', batch)
+                processed += len(batch)
+                logger.info(f"Processed {processed} words from {source_name}")
+            
+            conn.commit()
+            return conn.total_changes - changes_before
+        finally:
+            conn.close()
+    
+    def word_payload(self, row: Tuple) -> bytes:
+        """Payload for a freshly listed word, which has no definition yet"""
+        word, _, _, is_common, _, difficulty_level, _ = row
+        return encode_payload({
+            'word': word, 'definitions': [], 'phonetic': '', 'part_of_speech': '',
+            'example': '', 'etymology': '', 'difficulty_level': difficulty_level,
+            'is_common': bool(is_common)
+        }, self.compress_payloads)
+    
+    def fetch_definitions_from_api(self, words: List[str], max_workers: int = 5,
+                                   requests_per_second: float = 10) -> int:
         """Fetch definitions for words from dictionary API"""
         added_definitions = 0
         
         logger.info(f"Fetching definitions for {len(words)} words...")
         
-        def fetch_single_definition(word: str) -> bool:
+        def store_batch(results):
+            nonlocal added_definitions
+            rows = [
+                (json.dumps(word_def.definitions), word_def.phonetic,
+                 word_def.part_of_speech, word_def.example, word.lower())
+                for word, word_def in results if isinstance(word_def, WordDefinition)
+            ]
+            if not rows:
+                return
+            
+            conn = sqlite3.connect(self.database_path)
             try:
-                url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-                response = self.session.get(url, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data and len(data) > 0:
-                        entry = data[0]
-                        
-                        definitions = []
-                        part_of_speech = ""
-                        example = ""
-                        phonetic = entry.get('phonetic', '')
-                        
-                        if 'meanings' in entry:
-                            for meaning in entry['meanings']:
-                                if not part_of_speech and 'partOfSpeech' in meaning:
-                                    part_of_speech = meaning['partOfSpeech']
-                                
-                                if 'definitions' in meaning:
-                                    for defn in meaning['definitions']:
-                                        if 'definition' in defn:
-                                            definitions.append(defn['definition'])
-                                        if not example and 'example' in defn:
-                                            example = defn['example']
-                        
-                        # Update database
-                        conn = sqlite3.connect(self.database_path)
-                        cursor = conn.cursor()
-                        
-                        cursor.execute('''
-                            UPDATE dictionary 
-                            SET definitions = ?, phonetic = ?, part_of_speech = ?, 
-                                example = ?, updated_at = CURRENT_TIMESTAMP
-                            WHERE word_lowercase = ?
-                        ''', (
-                            json.dumps(definitions), phonetic, 
-                            part_of_speech, example, word.lower()
-                        ))
-                        
-                        conn.commit()
-                        conn.close()
-                        
-                        return True
-                
-                time.sleep(0.1)  # Rate limiting
-                return False
-                
-            except Exception as e:
-                logger.warning(f"Error fetching definition for {word}: {e}")
-                return False
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_word = {
-                executor.submit(fetch_single_definition, word): word 
-                for word in words
-            }
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    UPDATE dictionary 
+                    SET definitions = ?, phonetic = ?, part_of_speech = ?, 
+                        example = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE word_lowercase = ?
+                ''', rows)
+                rebuild_payloads(cursor, self.compress_payloads, words=[row[-1] for row in rows])
+                conn.commit()
+            except sqlite3.Error as e:
+                # Skip this batch; its words still lack definitions and are retried next run
+                conn.rollback()
+                logger.error(f"Error storing {len(rows)} definitions: {e}")
+                return
+            finally:
+                conn.close()
             
-            for future in as_completed(future_to_word):
-                word = future_to_word[future]
-                try:
-                    if future.result():
-                        added_definitions += 1
-                    
-                    if added_definitions % 50 == 0:
-                        logger.info(f"Added definitions for {added_definitions} words")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing {word}: {e}")
+            added_definitions += len(rows)
+            logger.info(f"Added definitions for {added_definitions} words")
+        
+        fetcher = AsyncDefinitionFetcher(
+            concurrency=max_workers,
+            requests_per_second=requests_per_second,
+            user_agent=self.session.headers['User-Agent']
+        )
+        fetch_stats = fetcher.run(words, store_batch)
+        logger.info(f"Fetch stats: {fetch_stats}")
         
         return added_definitions
     
@@ -348,17 +413,16 @@ class ComprehensiveDictionaryBuilder:
         return words
     
     def update_fts_table(self):
-        """Update the full-text search table"""
+        """Rebuild the full-text search table (triggers normally keep it current)"""
         logger.info("Updating full-text search table...")
         
         conn = sqlite3.connect(self.database_path)
         cursor = conn.cursor()
         
-        cursor.execute('DELETE FROM dictionary_fts')
-        cursor.execute('''
-            INSERT INTO dictionary_fts(rowid, word, definitions, example)
-            SELECT id, word, definitions, example FROM dictionary
-        ''')
+        # External-content tables are re-indexed in place; deleting from them
+        # directly would try to remove terms that were never indexed
+        create_fts_index(cursor)
+        rebuild_fts_index(cursor)
         
         conn.commit()
         conn.close()
@@ -429,28 +493,15 @@ class ComprehensiveDictionaryBuilder:
                 logger.error(f"Error processing source {source_name}: {e}")
         
         # Add built-in common words if not already added
-        common_words = self.get_common_words_list()
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        self.bulk_insert_words(
+            ((word, word, len(word), 1, 1, min(max(1, len(word) // 2), 10), 'builtin')
+             for word in self.get_common_words_list()),
+            'builtin'
+        )
         
-        for word in common_words:
-            if word not in self.processed_words:
-                try:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO dictionary 
-                        (word, word_lowercase, word_length, is_common, 
-                         frequency_rank, difficulty_level, source)
-                        VALUES (?, ?, ?, 1, 1, ?, 'builtin')
-                    ''', (word, word.lower(), len(word), min(max(1, len(word) // 2), 10)))
-                    
-                    if cursor.rowcount > 0:
-                        self.processed_words.add(word)
-                
-                except sqlite3.Error:
-                    pass
-        
-        conn.commit()
-        conn.close()
+        # Indexes are built once over the loaded table instead of row by row;
+        # the definition updates below need idx_word_lowercase
+        self.create_indexes()
         
         # Fetch definitions from API
         if fetch_definitions:
@@ -459,8 +510,8 @@ class ComprehensiveDictionaryBuilder:
                 added_defs = self.fetch_definitions_from_api(words_without_defs)
                 logger.info(f"Added definitions for {added_defs} words")
         
-        # Update FTS table
-        self.update_fts_table()
+        # Full-text search table
+        self.create_fts_table()
         
         # Print final statistics
         stats = self.get_statistics()
@@ -475,10 +526,12 @@ def main():
                        help='Skip fetching definitions from API')
     parser.add_argument('--max-definitions', type=int, default=1000,
                        help='Maximum number of definitions to fetch (default: 1000)')
+    parser.add_argument('--compress-payloads', action='store_true',
+                       help='Store pre-serialized /api/word responses gzip-compressed')
     
     args = parser.parse_args()
     
-    builder = ComprehensiveDictionaryBuilder(args.database)
+    builder = ComprehensiveDictionaryBuilder(args.database, args.compress_payloads)
     builder.build_dictionary(
         fetch_definitions=not args.no_definitions,
         max_definition_requests=args.max_definitions
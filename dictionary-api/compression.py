@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Response Compression
+Content-Encoding negotiation (brotli when installed, otherwise gzip) for
+large JSON responses, with an LRU cache of compressed bodies
+"""
+
+import gzip
+import hashlib
+import logging
+from typing import Dict, Optional
+
+from word_cache import WordCache, MISSING
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'application/x-ndjson')
+
+
+class ResponseCompressor:
+    """
+    Compresses response bodies of at least ``min_size`` bytes.
+
+    Compressed bodies are cached by encoding and content digest, so a hot
+    response (the same criteria page requested by many clients) is
+    compressed once and then served from memory.
+    """
+
+    def __init__(self, min_size: int = 1024, cache_size: int = 256,
+                 gzip_level: int = 6, brotli_quality: int = 5):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        # Keys are content digests, so entries never go stale; the TTL only
+        # ages out bodies nobody asks for
+        self.cache = WordCache(cache_size, ttl=3600)
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def choose_encoding(self, accept_encodings) -> Optional[str]:
+        """Best supported encoding for a request's Accept-Encoding header"""
+        return accept_encodings.best_match(self.encodings)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress ``body``, reusing a cached result for identical content"""
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is MISSING:
+            if encoding == 'br':
+                compressed = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+            self.cache.set(key, compressed)
+
+        self.compressed += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    def process_response(self, request, response):
+        """Compress an eligible response in place for the requesting client"""
+        if response.status_code == 304:
+            response.vary.add('Accept-Encoding')
+            return response
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(self.compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        # Strong validators name exact bytes; the encoded variant only keeps
+        # the weak form, which If-None-Match still matches
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def stats(self) -> Dict:
+        """Get compression counters and cache state"""
+        return {
+            'encodings': list(self.encodings),
+            'min_size': self.min_size,
+            'compressed_responses': self.compressed,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+            'cache': self.cache.stats()
+        }
+
+
+def compress_app(app, compressor: ResponseCompressor) -> ResponseCompressor:
+    """Negotiate compression for every response a Flask app sends"""
+    from flask import request
+
+    @app.after_request
+    def _compress_response(response):
+        return compressor.process_response(request, response)
+
+    return compressor
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Pool
+Keeps long-lived, thread-local read connections and a single shared writer
+connection so request handlers never pay connection setup costs
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tuning defaults (overridable per pool)
+DEFAULT_CACHE_SIZE_KB = 64 * 1024       # 64MB page cache per connection
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024   # 256MB memory-mapped I/O
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+
+class ConnectionPool:
+    """
+    Per-thread SQLite read connections plus one serialized writer connection.
+
+    Readers are opened lazily the first time a worker thread asks for one and
+    are reused for every later request on that thread. Readers of threads
+    that have finished are closed the next time a reader is opened, so a
+    thread-per-request server does not leak connections. All writes go through
+    the writer connection, which is guarded by a lock because SQLite only
+    allows one writer at a time anyway.
+    """
+
+    def __init__(self, database_path: str,
+                 cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+                 mmap_size: int = DEFAULT_MMAP_SIZE,
+                 busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+                 wal: bool = True):
+        self.database_path = database_path
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.wal = wal
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._connections: List[sqlite3.Connection] = []
+        self._readers: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._closed = False
+
+        self._stats = {
+            'readers_opened': 0,
+            'readers_closed': 0,
+            'writers_opened': 0,
+            'read_checkouts': 0,
+            'write_checkouts': 0,
+            'write_wait_seconds': 0.0,
+        }
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        """Open and tune a new connection"""
+        conn = sqlite3.connect(
+            self.database_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        if self.wal and not read_only:
+            # journal_mode is persistent, so setting it once from the writer
+            # is enough for every reader that opens afterwards
+            mode = cursor.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+            if mode.lower() != 'wal':
+                logger.warning(f"Could not enable WAL mode, using {mode}")
+            cursor.execute('PRAGMA synchronous=NORMAL')
+
+        cursor.execute(f'PRAGMA cache_size=-{int(self.cache_size_kb)}')
+        cursor.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        cursor.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+
+        if read_only:
+            cursor.execute('PRAGMA query_only=ON')
+
+        cursor.close()
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read connection, opening it on first use"""
+        if self._closed:
+            raise sqlite3.ProgrammingError('Connection pool is closed')
+
+        conn = getattr(self._local, 'reader', None)
+        if conn is None:
+            # Make sure WAL is switched on before the first reader attaches
+            if self.wal and self._writer is None:
+                with self._write_lock:
+                    if self._writer is None:
+                        self._writer = self._connect(read_only=False)
+                        self._stats['writers_opened'] += 1
+
+            conn = self._connect(read_only=True)
+            self._local.reader = conn
+            with self._lock:
+                self._close_dead_readers()
+                self._readers.append((threading.current_thread(), conn))
+                self._stats['readers_opened'] += 1
+
+        self._stats['read_checkouts'] += 1
+        return conn
+
+    def _close_dead_readers(self):
+        """Close the read connections of threads that have finished (lock held)"""
+        alive = []
+        for thread, conn in self._readers:
+            if thread.is_alive():
+                alive.append((thread, conn))
+                continue
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing connection: {e}")
+            self._connections.remove(conn)
+            self._stats['readers_closed'] += 1
+        self._readers = alive
+
+    @contextmanager
+    def writer(self):
+        """
+        Borrow the writer connection for the duration of a transaction.
+
+        Commits on success and rolls back on error, mirroring the behaviour
+        of ``with sqlite3.connect(...) as conn``.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError('Connection pool is closed')
+
+        wait_start = time.perf_counter()
+        with self._write_lock:
+            self._stats['write_wait_seconds'] += time.perf_counter() - wait_start
+            self._stats['write_checkouts'] += 1
+
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+                self._stats['writers_opened'] += 1
+
+            conn = self._writer
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def stats(self) -> Dict:
+        """Get pool usage statistics"""
+        with self._lock:
+            self._close_dead_readers()
+            open_connections = len(self._connections)
+        stats = dict(self._stats)
+        stats['write_wait_seconds'] = round(stats['write_wait_seconds'], 6)
+        stats['open_connections'] = open_connections
+        stats['journal_mode'] = 'wal' if self.wal else 'default'
+        stats['cache_size_kb'] = self.cache_size_kb
+        stats['mmap_size'] = self.mmap_size
+        return stats
+
+    def close(self):
+        """Close every connection opened by this pool"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._readers = []
+            self._closed = True
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing connection: {e}")
+        self._writer = None
+        self._local = threading.local()
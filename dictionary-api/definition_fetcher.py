@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Async Definition Fetcher
+High-concurrency client for the Free Dictionary API used by the population
+scripts, with a token-bucket rate limiter and batched result delivery
+"""
+
+import os
+import sys
+import time
+import zlib
+import random
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DICTIONARY_API_URL = os.getenv('DICTIONARY_API_URL', 'https://api.dictionaryapi.dev/api/v2/entries/en/')
+DICTIONARY_API_TIMEOUT = float(os.getenv('DICTIONARY_API_TIMEOUT', 10))
+
+
+@dataclass
+class WordDefinition:
+    word: str
+    definitions: List[str]
+    phonetic: str = ""
+    part_of_speech: str = ""
+    example: str = ""
+    etymology: str = ""
+    difficulty_level: int = 1
+    is_common: bool = False
+
+
+@dataclass
+class FetchError:
+    """A lookup that failed (network error, timeout, 5xx, unexpected status) after its retries"""
+    reason: str
+
+
+# (word, parsed definition, None when the API has no entry (404), or the
+# FetchError of a lookup that should be retried later)
+FetchResult = Tuple[str, Union[WordDefinition, FetchError, None]]
+
+
+def parse_api_entry(word: str, data) -> Optional[WordDefinition]:
+    """Build a WordDefinition from a Free Dictionary API response body"""
+    if not data or not isinstance(data, list):
+        return None
+
+    entry = data[0]
+    definitions = []
+    part_of_speech = ""
+    example = ""
+
+    for meaning in entry.get('meanings', []):
+        if not part_of_speech and 'partOfSpeech' in meaning:
+            part_of_speech = meaning['partOfSpeech']
+
+        for defn in meaning.get('definitions', []):
+            if 'definition' in defn:
+                definitions.append(defn['definition'])
+            if not example and 'example' in defn:
+                example = defn['example']
+
+    return WordDefinition(
+        word=word.lower(),
+        definitions=definitions,
+        phonetic=entry.get('phonetic', '') or '',
+        part_of_speech=part_of_speech,
+        example=example,
+        etymology='',
+        difficulty_level=min(max(1, len(word) // 2), 10)
+    )
+
+
+class TokenBucket:
+    """
+    Async token bucket: allows bursts of up to ``capacity`` requests and a
+    sustained ``rate`` requests per second across all workers.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncDefinitionFetcher:
+    """
+    Fetches definitions for many words concurrently over one pooled
+    aiohttp session.
+
+    ``concurrency`` bounds in-flight requests and ``requests_per_second``
+    bounds the request rate. Results are handed to ``on_batch`` in lists of
+    up to ``batch_size`` from a single writer task (run in a worker thread),
+    so the callback can write them to SQLite in one transaction without any
+    locking of its own.
+    """
+
+    def __init__(self, base_url: str = DICTIONARY_API_URL,
+                 concurrency: int = 10,
+                 requests_per_second: float = 10,
+                 timeout: float = DICTIONARY_API_TIMEOUT,
+                 batch_size: int = 200,
+                 max_retries: int = 3,
+                 user_agent: str = 'DictionaryAPI/1.0 Educational Use'):
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.user_agent = user_agent
+
+        self.stats = {}
+
+    def _reset_stats(self):
+        self.stats = {
+            'words': 0,
+            'requests': 0,
+            'found': 0,
+            'not_found': 0,
+            'errors': 0,
+            'retries': 0,
+            'batches': 0,
+            'elapsed_seconds': 0.0,
+            'words_per_second': 0.0
+        }
+
+    async def _fetch_one(self, session: aiohttp.ClientSession, bucket: TokenBucket,
+                         word: str) -> Union[WordDefinition, FetchError, None]:
+        url = self.base_url + word.lower()
+        reason = 'no attempts'
+
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            self.stats['requests'] += 1
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return parse_api_entry(word, await response.json(content_type=None))
+                    if response.status == 404:
+                        return None
+                    reason = f'HTTP {response.status}'
+                    if response.status != 429 and response.status < 500:
+                        logger.warning(f"Unexpected status {response.status} for {word}")
+                        self.stats['errors'] += 1
+                        return FetchError(reason)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.debug(f"Error fetching definition for {word}: {e}")
+                reason = f'{type(e).__name__}: {e}' if str(e) else type(e).__name__
+
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(min(30, 0.5 * 2 ** attempt) * (0.5 + random.random()))
+
+        self.stats['errors'] += 1
+        return FetchError(reason)
+
+    async def _worker(self, session, bucket, words: asyncio.Queue, results: asyncio.Queue):
+        while True:
+            word = await words.get()
+            if word is None:
+                return
+            await results.put((word, await self._fetch_one(session, bucket, word)))
+
+    async def _writer(self, results: asyncio.Queue,
+                      on_batch: Callable[[List[FetchResult]], None]):
+        batch = []
+        while True:
+            item = await results.get()
+            if item is not None:
+                batch.append(item)
+                if item[1] is None:
+                    self.stats['not_found'] += 1
+                elif not isinstance(item[1], FetchError):
+                    self.stats['found'] += 1
+
+            if batch and (item is None or len(batch) >= self.batch_size):
+                self.stats['batches'] += 1
+                await asyncio.to_thread(on_batch, batch)
+                batch = []
+
+            if item is None:
+                return
+
+    async def fetch_all(self, words: Iterable[str],
+                        on_batch: Callable[[List[FetchResult]], None]) -> Dict:
+        """Fetch every word and deliver results in batches; returns stats"""
+        self._reset_stats()
+        start = time.perf_counter()
+
+        bucket = TokenBucket(self.requests_per_second)
+        word_queue = asyncio.Queue(maxsize=self.concurrency * 4)
+        results = asyncio.Queue(maxsize=self.batch_size * 2)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {'User-Agent': self.user_agent}
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=headers) as session:
+            writer = asyncio.create_task(self._writer(results, on_batch))
+            workers = [
+                asyncio.create_task(self._worker(session, bucket, word_queue, results))
+                for _ in range(self.concurrency)
+            ]
+
+            async def produce():
+                for word in words:
+                    self.stats['words'] += 1
+                    await word_queue.put(word)
+                for _ in workers:
+                    await word_queue.put(None)
+                await asyncio.gather(*workers)
+                await results.put(None)
+
+            # If the writer (on_batch) fails, nothing drains the results queue
+            # and the workers would block on it forever, so cancel everything
+            # and let the error propagate
+            producer = asyncio.create_task(produce())
+            tasks = [producer, writer] + workers
+            try:
+                await asyncio.gather(producer, writer)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        elapsed = time.perf_counter() - start
+        self.stats['elapsed_seconds'] = round(elapsed, 3)
+        self.stats['words_per_second'] = round(self.stats['words'] / elapsed, 1) if elapsed else 0.0
+        return self.stats
+
+    def run(self, words: Iterable[str],
+            on_batch: Callable[[List[FetchResult]], None]) -> Dict:
+        """Synchronous wrapper around fetch_all for the population scripts"""
+        return asyncio.run(self.fetch_all(words, on_batch))
+
+
+def create_stub_app(latency: float = 0.0, miss_rate: float = 0.1):
+    """
+    Local stand-in for the Free Dictionary API, for measuring fetch
+    throughput offline. Words whose hash falls under ``miss_rate`` get 404.
+    """
+    from aiohttp import web
+
+    async def entry(request):
+        word = request.match_info['word']
+        if latency:
+            await asyncio.sleep(latency)
+        if (zlib.crc32(word.encode()) % 1000) / 1000 < miss_rate:
+            return web.json_response({'title': 'No Definitions Found'}, status=404)
+        return web.json_response([{
+            'word': word,
+            'phonetic': f'/{word}/',
+            'meanings': [{
+                'partOfSpeech': 'noun',
+                'definitions': [{
+                    'definition': f'A stub definition of {word}.',
+                    'example': f'This sentence uses {word}.'
+                }]
+            }]
+        }])
+
+    app = web.Application()
+    app.router.add_get('/api/v2/entries/en/{word}', entry)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Async definition fetcher tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stub = subparsers.add_parser('stub', help='Run a local stub of the dictionary API')
+    stub.add_argument('--host', default='127.0.0.1')
+    stub.add_argument('--port', type=int, default=8765)
+    stub.add_argument('--latency', type=float, default=0.02,
+                      help='Simulated response latency in seconds (default: 0.02)')
+    stub.add_argument('--miss-rate', type=float, default=0.1,
+                      help='Fraction of words answered with 404 (default: 0.1)')
+
+    bench = subparsers.add_parser('bench', help='Measure fetch throughput')
+    bench.add_argument('--base-url', default='http://127.0.0.1:8765/api/v2/entries/en/')
+    bench.add_argument('--words', type=int, default=2000)
+    bench.add_argument('--concurrency', type=int, default=50)
+    bench.add_argument('--rps', type=float, default=0,
+                       help='Requests per second limit, 0 for unlimited (default: 0)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'stub':
+        from aiohttp import web
+        web.run_app(create_stub_app(args.latency, args.miss_rate), host=args.host, port=args.port)
+        return
+
+    fetcher = AsyncDefinitionFetcher(args.base_url, concurrency=args.concurrency,
+                                     requests_per_second=args.rps)
+    words = (f'word{i}' for i in range(args.words))
+    stats = fetcher.run(words, lambda batch: None)
+    logger.info(f"Fetch benchmark: {stats}")
+    return 0 if stats['errors'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Shared Dictionary Schema Helpers
+DDL shared by the API services and the population scripts, so every process
+that writes to the dictionary table keeps the derived structures in sync
+"""
+
+import uuid
+import sqlite3
+from typing import Set, Tuple
+
+
+def table_exists(cursor: sqlite3.Cursor, name: str) -> bool:
+    """Check whether a table (or virtual table) exists"""
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    )
+    return cursor.fetchone() is not None
+
+
+def table_columns(cursor: sqlite3.Cursor, table: str = 'dictionary') -> Set[str]:
+    """Get the column names of a table"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+
+def create_change_log(cursor: sqlite3.Cursor):
+    """
+    Create the dictionary change log and the triggers that feed it.
+
+    Every insert, update and delete on ``dictionary`` appends the affected
+    row id and lowercase word to ``dictionary_changes``. Long-running readers
+    (the API caches) poll this table to learn about writes made by other
+    processes such as the population scripts.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dictionary_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER NOT NULL,
+            word TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS dictionary_changes_ai AFTER INSERT ON dictionary
+        BEGIN
+            INSERT INTO dictionary_changes(word_id, word) VALUES (new.id, lower(new.word));
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS dictionary_changes_au AFTER UPDATE ON dictionary
+        BEGIN
+            INSERT INTO dictionary_changes(word_id, word) VALUES (old.id, lower(old.word));
+            INSERT INTO dictionary_changes(word_id, word)
+            SELECT new.id, lower(new.word) WHERE lower(new.word) != lower(old.word);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS dictionary_changes_ad AFTER DELETE ON dictionary
+        BEGIN
+            INSERT INTO dictionary_changes(word_id, word) VALUES (old.id, lower(old.word));
+        END
+    ''')
+
+
+# word_id of the change log row a full rebuild leaves behind; real row ids start at 1
+FULL_RELOAD_WORD_ID = 0
+
+
+def record_full_reload(cursor: sqlite3.Cursor):
+    """
+    Log that the whole dictionary was replaced without per-row triggers (a
+    bulk load), so change feeds tell their subscribers to reload everything,
+    and start a new dataset generation.
+    """
+    cursor.execute("INSERT INTO dictionary_changes(word_id, word) VALUES (?, '')", (FULL_RELOAD_WORD_ID,))
+    create_generation(cursor, renew=True)
+
+
+def create_generation(cursor: sqlite3.Cursor, renew: bool = False):
+    """
+    Create the ``dictionary_meta`` table and its generation token, a random
+    id for one lineage of dictionary contents, so two databases never share
+    a ``dataset_fingerprint``. ``renew`` replaces the token.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dictionary_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute(f"INSERT OR {'REPLACE' if renew else 'IGNORE'} INTO dictionary_meta(key, value) "
+                   f"VALUES ('generation', ?)", (uuid.uuid4().hex,))
+
+
+def dataset_fingerprint(cursor: sqlite3.Cursor) -> Tuple:
+    """
+    Values that together change whenever the dictionary's contents do: the
+    generation token, the change log's id sequence (which survives pruning),
+    the highest row id and the row count. A file restored from a backup
+    brings its own values with it. Every lookup is a single index seek.
+    """
+    cursor.execute('''
+        SELECT (SELECT value FROM dictionary_meta WHERE key = 'generation'),
+               (SELECT seq FROM sqlite_sequence WHERE name = 'dictionary_changes'),
+               (SELECT MAX(id) FROM dictionary),
+               (SELECT count FROM dictionary_stats WHERE metric = 'total' AND bucket = '')
+    ''')
+    return tuple(cursor.fetchone())
+
+
+def _create_content_index(cursor: sqlite3.Cursor, name: str, columns, options: str = '') -> bool:
+    """
+    Create an external-content FTS5 table over ``dictionary`` plus the
+    insert, delete and update triggers that keep it in sync, and rebuild it
+    from the current rows if it is new or was not trigger-maintained before.
+
+    Returns False when this SQLite build lacks FTS5 or the requested tokenizer.
+    """
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f'{name}_ai',)
+    )
+    needs_rebuild = not table_exists(cursor, name) or cursor.fetchone() is None
+
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+
+    try:
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+                {column_list}, content='dictionary', content_rowid='id'{options}
+            )
+        ''')
+    except sqlite3.OperationalError:
+        return False
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON dictionary
+        BEGIN
+            INSERT INTO {name}(rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON dictionary
+        BEGIN
+            INSERT INTO {name}({name}, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {column_list} ON dictionary
+        BEGIN
+            INSERT INTO {name}({name}, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO {name}(rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+    ''')
+
+    if needs_rebuild:
+        rebuild_fts_index(cursor, name)
+
+    return True
+
+
+def create_fts_index(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the ``dictionary_fts`` full-text index over word, definitions and
+    example, maintained by triggers on every insert, update and delete so
+    full-text search never needs a full rebuild after writes.
+    """
+    return _create_content_index(cursor, 'dictionary_fts', ('word', 'definitions', 'example'))
+
+
+def create_trigram_index(cursor: sqlite3.Cursor, word_column: str = 'word_lowercase') -> bool:
+    """
+    Create the trigram substring index over ``dictionary.<word_column>``.
+
+    ``dictionary_trigram`` is an external-content FTS5 table using the
+    trigram tokenizer, so ``MATCH '"abc"'`` finds every word containing
+    "abc" without scanning the dictionary. Triggers keep it in sync with
+    inserts, deletes and renames.
+
+    Returns False when this SQLite build has no trigram tokenizer
+    (added in SQLite 3.34), in which case callers fall back to LIKE.
+    """
+    return _create_content_index(cursor, 'dictionary_trigram', (word_column,), ", tokenize='trigram'")
+
+
+def rebuild_fts_index(cursor: sqlite3.Cursor, name: str = 'dictionary_fts'):
+    """Slow path: re-index every dictionary row into an FTS5 table"""
+    cursor.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+
+def optimize_fts_index(cursor: sqlite3.Cursor, name: str = 'dictionary_fts'):
+    """Merge an FTS5 table's incremental segments into one b-tree"""
+    cursor.execute(f"INSERT INTO {name}({name}) VALUES ('optimize')")
+
+
+def trigram_match_query(pattern: str) -> str:
+    """Quote a search pattern as a literal FTS5 phrase for the trigram index"""
+    return '"' + pattern.replace('"', '""') + '"'
+
+
+def add_missing_columns(cursor: sqlite3.Cursor, columns: dict):
+    """Add columns (name -> SQL type/default) that older schemas lack"""
+    existing = table_columns(cursor)
+    for name, definition in columns.items():
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE dictionary ADD COLUMN {name} {definition}')
+
+
+def create_criteria_index(cursor: sqlite3.Cursor):
+    """
+    Index the /api/words/criteria sort order, so its cursor pages are index
+    seeks. The keys are indexed as the query compares them, with NULL as 0.
+    """
+    # Older databases have this order indexed on the raw, nullable columns
+    cursor.execute('DROP INDEX IF EXISTS idx_criteria_order')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_criteria_rank
+        ON dictionary(COALESCE(is_common, 0) DESC, COALESCE(usage_frequency, 0) DESC, word)
+    ''')
+
+
+# Columns the pre-serialized /api/word payload is built from
+PAYLOAD_SOURCE_COLUMNS = ('word', 'definitions', 'phonetic', 'part_of_speech', 'example',
+                          'etymology', 'difficulty_level', 'is_common')
+
+
+def create_payload_column(cursor: sqlite3.Cursor):
+    """
+    Add the ``payload`` column and a trigger that clears it whenever an
+    update changes the word's content without writing a new payload, so a
+    stale body is never served (readers fall back to the row columns).
+    """
+    add_missing_columns(cursor, {'payload': 'BLOB'})
+
+    columns = [column for column in PAYLOAD_SOURCE_COLUMNS if column in table_columns(cursor)]
+    changed = ' OR '.join(f'new.{column} IS NOT old.{column}' for column in columns)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS dictionary_payload_stale
+        AFTER UPDATE OF {', '.join(columns)} ON dictionary
+        WHEN new.payload IS NOT NULL AND new.payload IS old.payload AND ({changed})
+        BEGIN
+            UPDATE dictionary SET payload = NULL WHERE id = new.id;
+        END
+    ''')
+
+
+# Histogram metrics kept in dictionary_stats: metric -> (bucket expression, condition),
+# with {row} standing for NEW or OLD inside triggers and for the table in rebuilds
+STATS_METRICS = {
+    'total': ("''", '1'),
+    'with_definitions': ("''", "{row}definitions != '[]' AND {row}definitions != ''"),
+    'common': ("''", '{row}is_common = 1'),
+    'part_of_speech': ('{row}part_of_speech', "{row}part_of_speech != ''"),
+    'difficulty': ('{row}difficulty_level', '{row}difficulty_level IS NOT NULL'),
+    'length': ('{row}word_length', '{row}word_length IS NOT NULL'),
+    'added_day': ('date({row}created_at)', '{row}created_at IS NOT NULL'),
+}
+
+
+def _stats_trigger_body(row: str, delta: int) -> str:
+    statements = []
+    for metric, (bucket, condition) in STATS_METRICS.items():
+        statements.append(f'''
+            INSERT INTO dictionary_stats(metric, bucket, count)
+            SELECT '{metric}', {bucket.format(row=row + '.')}, {delta}
+            WHERE {condition.format(row=row + '.')}
+            ON CONFLICT(metric, bucket) DO UPDATE SET count = count + excluded.count;''')
+    return ''.join(statements)
+
+
+def create_stats_table(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the ``dictionary_stats`` summary table and its triggers.
+
+    Each row holds a running count for one (metric, bucket) pair, e.g.
+    ('difficulty', '3') or ('added_day', '2024-01-31'), adjusted by triggers
+    on every insert, update and delete, so statistics are read with one
+    small SELECT instead of aggregates over the whole dictionary.
+
+    Returns True if the table was created and needs ``rebuild_stats``.
+    """
+    created = not table_exists(cursor, 'dictionary_stats')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dictionary_stats (
+            metric TEXT NOT NULL,
+            bucket TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, bucket)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS dictionary_stats_ai AFTER INSERT ON dictionary
+        BEGIN {_stats_trigger_body('new', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS dictionary_stats_ad AFTER DELETE ON dictionary
+        BEGIN {_stats_trigger_body('old', -1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS dictionary_stats_au AFTER UPDATE OF
+            definitions, is_common, part_of_speech, difficulty_level, word_length, created_at
+        ON dictionary
+        BEGIN {_stats_trigger_body('old', -1)} {_stats_trigger_body('new', 1)}
+        END
+    ''')
+
+    return created
+
+
+def rebuild_stats(cursor: sqlite3.Cursor):
+    """Recompute ``dictionary_stats`` from scratch with full-table aggregates"""
+    cursor.execute('DELETE FROM dictionary_stats')
+    for metric, (bucket, condition) in STATS_METRICS.items():
+        bucket = bucket.format(row='')
+        cursor.execute(f'''
+            INSERT INTO dictionary_stats(metric, bucket, count)
+            SELECT '{metric}', {bucket}, COUNT(*) FROM dictionary
+            WHERE {condition.format(row='')}
+            GROUP BY {bucket}
+        ''')
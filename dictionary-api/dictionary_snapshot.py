@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Dictionary Snapshots
+An immutable, memory-mapped binary image of the dictionary for read-heavy
+serving: word lookups by binary search and zero-copy slicing, with no SQL
+"""
+
+import os
+import gzip
+import mmap
+import struct
+import sys
+import sqlite3
+import logging
+from array import array
+from typing import Dict, Optional
+
+from dictionary_schema import PAYLOAD_SOURCE_COLUMNS, table_columns, table_exists
+from word_payload import GZIP_MAGIC, encode_payload, word_data
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'DICTSNAP'
+VERSION = 1
+
+# magic, version, word count, change log id at compile time, then the byte
+# offsets of the payload, key, two offset index and directory regions
+HEADER = struct.Struct('<8sIIQQQQQQ')
+
+# The directory maps each two-byte key prefix to its first index position,
+# narrowing every binary search to the words sharing that prefix
+DIRECTORY_SIZE = 65536 + 1
+
+
+class DictionarySnapshot:
+    """
+    Read-only view over a compiled snapshot file.
+
+    The file is mapped with ``mmap``, so every worker process that opens it
+    shares the same pages through the OS page cache. Lookups binary-search
+    the fixed-size index records and return payloads as ``memoryview``
+    slices of the mapping, without copying them.
+
+    Layout: header | payloads (``/api/word`` response bodies) | keys
+    (lowercase UTF-8 words, concatenated in byte order) | key offsets
+    (uint32, word count + 1) | payload offsets (uint64, word count + 1) |
+    directory (uint32, 65537). Word ``i`` spans ``offsets[i]:offsets[i + 1]``
+    in each region. The arrays are little-endian and 8-byte aligned, so they
+    are read in place through ``memoryview.cast``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty, not a dictionary snapshot")
+        self._view = memoryview(self._mmap)
+
+        (magic, version, self.word_count, self.change_id, payloads_offset, keys_offset,
+         key_index_offset, payload_index_offset, directory_offset) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} dictionary snapshot")
+
+        if sys.byteorder != 'little':
+            self.close()
+            raise ValueError("Dictionary snapshots are read in place and need a little-endian host")
+
+        count = self.word_count + 1
+        self._payloads = self._view[payloads_offset:keys_offset]
+        self._keys = self._mmap  # sliced to bytes for comparisons
+        self._keys_offset = keys_offset
+        self._key_offsets = self._view[key_index_offset:key_index_offset + 4 * count].cast('I')
+        self._payload_offsets = self._view[payload_index_offset:payload_index_offset + 8 * count].cast('Q')
+        self._directory = self._view[directory_offset:directory_offset + 4 * DIRECTORY_SIZE].cast('I')
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(word.lower().encode('utf-8')) is not None
+
+    def _key(self, position: int) -> bytes:
+        offsets = self._key_offsets
+        base = self._keys_offset
+        return self._keys[base + offsets[position]:base + offsets[position + 1]]
+
+    def _lower_bound(self, key: bytes) -> int:
+        """First index position whose key is >= ``key``"""
+        offsets, keys, base = self._key_offsets, self._keys, self._keys_offset
+        if len(key) >= 2:
+            bucket = key[0] << 8 | key[1]
+            low, high = self._directory[bucket], self._directory[bucket + 1]
+        else:
+            low, high = 0, self.word_count
+        while low < high:
+            middle = (low + high) >> 1
+            if keys[base + offsets[middle]:base + offsets[middle + 1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, key: bytes) -> Optional[int]:
+        position = self._lower_bound(key)
+        if position < self.word_count and self._key(position) == key:
+            return position
+        return None
+
+    def get(self, word: str) -> Optional[memoryview]:
+        """The stored ``/api/word`` response body for a word, or None"""
+        position = self._find(word.lower().encode('utf-8'))
+        if position is None:
+            return None
+        offsets = self._payload_offsets
+        return self._payloads[offsets[position]:offsets[position + 1]]
+
+    def close(self):
+        """Unmap the file"""
+        for view in ('_key_offsets', '_payload_offsets', '_directory', '_payloads'):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def stats(self) -> Dict:
+        """Get snapshot metadata"""
+        return {
+            'path': self.path,
+            'words': self.word_count,
+            'size_bytes': len(self._mmap),
+            'change_id': self.change_id
+        }
+
+
+def compile_snapshot(conn: sqlite3.Connection, output_path: str) -> Dict:
+    """
+    Write a snapshot of the dictionary in ``conn`` to ``output_path``.
+
+    Rows are read in one transaction, so the recorded change log id matches
+    the contents. The file is built under a temporary name and renamed into
+    place, so running servers keep their old mapping until they reopen.
+    """
+    cursor = conn.cursor()
+    columns = table_columns(cursor)
+    key_column = 'word_lowercase' if 'word_lowercase' in columns else 'word'
+    selected = ['payload'] if 'payload' in columns else []
+    selected += [column for column in PAYLOAD_SOURCE_COLUMNS if column in columns]
+
+    temp_path = output_path + '.tmp'
+    cursor.execute('BEGIN')
+    try:
+        change_id = 0
+        if table_exists(cursor, 'dictionary_changes'):
+            cursor.execute('SELECT MAX(id) FROM dictionary_changes')
+            change_id = cursor.fetchone()[0] or 0
+
+        # BINARY collation orders TEXT by its UTF-8 bytes, the order the
+        # reader's binary search expects
+        cursor.execute(f'''
+            SELECT {key_column}, {', '.join(selected)} FROM dictionary
+            ORDER BY {key_column}, id
+        ''')
+
+        keys = bytearray()
+        key_offsets = array('I', [0])
+        payload_offsets = array('Q', [0])
+        previous = None
+        with open(temp_path, 'wb') as f:
+            f.write(b'\0' * HEADER.size)
+
+            for row in iter(cursor.fetchone, None):
+                key = row[0].encode('utf-8')
+                if key == previous:
+                    continue  # case variants share a lowercase key; the API serves the first
+                previous = key
+
+                values = dict(zip(selected, row[1:]))
+                payload = values.pop('payload', None)
+                if payload is None:
+                    payload = encode_payload(word_data(values))
+                elif bytes(payload[:2]) == GZIP_MAGIC:
+                    payload = gzip.decompress(payload)
+
+                keys += key
+                key_offsets.append(len(keys))
+                f.write(payload)
+                payload_offsets.append(payload_offsets[-1] + len(payload))
+
+            keys_offset = HEADER.size + payload_offsets[-1]
+            directory = _build_directory(keys, key_offsets)
+            if sys.byteorder != 'little':
+                key_offsets.byteswap()
+                payload_offsets.byteswap()
+                directory.byteswap()
+
+            f.write(keys)
+            key_index_offset = _write_aligned(f, key_offsets, keys_offset + len(keys))
+            payload_index_offset = _write_aligned(f, payload_offsets,
+                                                  key_index_offset + len(key_offsets) * 4)
+            directory_offset = _write_aligned(f, directory, payload_index_offset + len(payload_offsets) * 8)
+
+            word_count = len(key_offsets) - 1
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, word_count, change_id, HEADER.size,
+                                keys_offset, key_index_offset, payload_index_offset, directory_offset))
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        conn.rollback()
+
+    os.replace(temp_path, output_path)
+    size = os.path.getsize(output_path)
+    logger.info(f"Compiled {word_count} words into {output_path} ({size} bytes)")
+    return {'path': output_path, 'words': word_count, 'size_bytes': size, 'change_id': change_id}
+
+
+def _write_aligned(f, values: array, position: int) -> int:
+    """Pad to an 8-byte boundary, write ``values`` and return where they start"""
+    padding = -position % 8
+    f.write(b'\0' * padding)
+    f.write(values.tobytes())
+    return position + padding
+
+
+def _build_directory(keys: bytearray, key_offsets: array) -> array:
+    """First position of every two-byte prefix, plus the word count at the end"""
+    directory = array('I', bytes(4 * DIRECTORY_SIZE))
+    bucket = 0
+    for position in range(len(key_offsets) - 1):
+        key = keys[key_offsets[position]:key_offsets[position + 1]]
+        # Keys shorter than two bytes sort before every longer key sharing their first byte
+        value = key[0] << 8 | key[1] if len(key) >= 2 else (key[0] << 8 if key else 0)
+        while bucket <= value:
+            directory[bucket] = position
+            bucket += 1
+    while bucket < DIRECTORY_SIZE:
+        directory[bucket] = len(key_offsets) - 1
+        bucket += 1
+    return directory
@@ -4,24 +4,46 @@ Enhanced Dictionary API Service
 Provides comprehensive English dictionary functionality for static sites
 """
 
-from flask import Flask, jsonify, request, render_template_string
+from flask import Flask, Response, jsonify, make_response, request, render_template_string
 from flask_cors import CORS
 import sqlite3
 import json
 import requests
 import time
 import os
+import hashlib
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from functools import wraps
 import re
 
+from connection_pool import ConnectionPool
+from change_feed import ChangeFeed
+from dictionary_schema import (
+    create_change_log, create_fts_index, create_trigram_index, trigram_match_query, add_missing_columns,
+    create_stats_table, rebuild_stats, create_payload_column, create_criteria_index,
+    create_generation, dataset_fingerprint, FULL_RELOAD_WORD_ID
+)
+from word_payload import WordEntry, word_data
+from dictionary_snapshot import DictionarySnapshot
+from pagination import InvalidCursor, decode_cursor, next_cursor, query_scope
+from word_signatures import create_signature_columns, backfill_signatures, letter_pattern, letters_sorted
+from word_cache import WordCache, MISSING
+from autocomplete import AutocompleteIndex
+from random_sampler import RandomSampler
+from pattern_index import PatternIndex, WILDCARD
+from spelling_suggestions import SpellingIndex
+from rate_limiter import create_rate_limiter
+from metrics import metrics, instrument_app, PROMETHEUS_CONTENT_TYPE
+from compression import ResponseCompressor, compress_app
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
+instrument_app(app)  # Per-route request counts and latency for /metrics
 
 # Configuration
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'dictionary.db')
@@ -29,12 +51,122 @@ API_PORT = int(os.getenv('API_PORT', 5000))
 API_HOST = os.getenv('API_HOST', '0.0.0.0')
 RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', 100))
 RATE_LIMIT_WINDOW = int(os.getenv('RATE_LIMIT_WINDOW', 60))
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')  # 'memory' or 'sqlite'
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', 'rate_limits.db')
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', 64 * 1024))
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', 256 * 1024 * 1024))
+WORD_CACHE_SIZE = int(os.getenv('WORD_CACHE_SIZE', 10000))
+WORD_CACHE_TTL = int(os.getenv('WORD_CACHE_TTL', 300))
+BATCH_MAX_WORDS = int(os.getenv('BATCH_MAX_WORDS', 100))
+AUTOCOMPLETE_TOP_K = int(os.getenv('AUTOCOMPLETE_TOP_K', 10))
+
+# "Did you mean" suggestions for misses and /api/suggest
+SUGGEST_MAX_DISTANCE = int(os.getenv('SUGGEST_MAX_DISTANCE', 2))  # edits
+SUGGEST_PREFIX_LENGTH = int(os.getenv('SUGGEST_PREFIX_LENGTH', 7))  # characters indexed per word
+SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', 5))
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))  # rows per /api/export chunk
+# Optional snapshot compiled with `maintenance.py compile-snapshot`
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH')
+
+# Cache-Control max-age (seconds) for clients and shared caches; responses
+# carry ETags, so stale copies are revalidated cheaply with If-None-Match
+CACHE_MAX_AGE_WORD = int(os.getenv('CACHE_MAX_AGE_WORD', 3600))
+CACHE_MAX_AGE_LIST = int(os.getenv('CACHE_MAX_AGE_LIST', 300))
+CACHE_MAX_AGE_STATS = int(os.getenv('CACHE_MAX_AGE_STATS', 60))
+
+# Response compression: gzip, or brotli when the brotli package is installed
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # bytes
+COMPRESSION_CACHE_SIZE = int(os.getenv('COMPRESSION_CACHE_SIZE', 256))  # compressed bodies
+
+compressor = compress_app(app, ResponseCompressor(COMPRESSION_MIN_SIZE, COMPRESSION_CACHE_SIZE))
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds)
+SQL_IN_CHUNK_SIZE = 500
+
+def content_etag(data) -> str:
+    """Strong ETag for a JSON-serialisable value"""
+    body = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
 
 class EnhancedDictionaryAPI:
     def __init__(self):
         self.init_database()
-        self.request_cache = {}
-        self.rate_limit_cache = {}
+        self.pool = ConnectionPool(
+            DATABASE_PATH,
+            cache_size_kb=DB_CACHE_SIZE_KB,
+            mmap_size=DB_MMAP_SIZE
+        )
+        self.migrate_database()
+        self.request_cache = WordCache(WORD_CACHE_SIZE, WORD_CACHE_TTL)
+        self.rate_limiter = create_rate_limiter(RATE_LIMIT_BACKEND, RATE_LIMIT_DB)
+        
+        # Keep caches and in-memory indexes in step with writes from any
+        # process; the feed starts before loading so no write falls in between
+        self.change_feed = ChangeFeed(self.pool)
+        self.change_feed.subscribe(self._on_dictionary_changes)
+        self.snapshot = None
+        self.snapshot_overrides = set()
+        if SNAPSHOT_PATH:
+            self.open_snapshot(SNAPSHOT_PATH)
+        
+        self.autocomplete = AutocompleteIndex(AUTOCOMPLETE_TOP_K)
+        self.autocomplete.load(self.pool.reader())
+        
+        # Random draws only consider words that have definitions
+        self.random_sampler = RandomSampler(
+            bucket_columns=('difficulty_level', 'is_common'),
+            where="definitions != '[]' AND definitions != ''"
+        )
+        self.random_sampler.load(self.pool.reader())
+        
+        self.pattern_index = PatternIndex()
+        self.pattern_index.load(self.pool.reader())
+        
+        self.spelling = SpellingIndex(SUGGEST_MAX_DISTANCE, SUGGEST_PREFIX_LENGTH)
+        self.spelling.load(self.pool.reader())
+        
+        self._register_metrics()
+    
+    def _register_metrics(self):
+        """Expose cache, limiter and index state as scrape-time metrics"""
+        cache = lambda key: lambda: self.request_cache.stats()[key]
+        metrics.register_callback('word_cache_entries', 'gauge', 'Words held in the definition cache',
+                                  cache('size'))
+        metrics.register_callback('word_cache_hits_total', 'counter', 'Definition cache hits', cache('hits'))
+        metrics.register_callback('word_cache_misses_total', 'counter', 'Definition cache misses',
+                                  cache('misses'))
+        metrics.register_callback('word_cache_evictions_total', 'counter', 'Definition cache LRU evictions',
+                                  cache('evictions'))
+        
+        limiter = lambda: self.rate_limiter.stats()
+        metrics.register_callback('rate_limit_clients', 'gauge', 'Clients tracked by the rate limiter',
+                                  lambda: limiter()['clients'])
+        metrics.register_callback('rate_limit_decisions_total', 'counter', 'Rate limiter decisions by result',
+                                  lambda: {(('result', result),): limiter()[result]
+                                           for result in ('allowed', 'rejected')})
+        
+        compression = lambda: compressor.stats()
+        metrics.register_callback('compression_bytes_total', 'counter',
+                                  'Response bytes before and after compression',
+                                  lambda: {(('stage', 'in'),): compression()['bytes_in'],
+                                           (('stage', 'out'),): compression()['bytes_out']})
+        metrics.register_callback('compression_cache_hits_total', 'counter',
+                                  'Compressed bodies served from the cache',
+                                  lambda: compression()['cache']['hits'])
+        
+        metrics.register_callback('db_pool_open_connections', 'gauge', 'Open SQLite connections',
+                                  lambda: self.pool.stats()['open_connections'])
+        metrics.register_callback('change_feed_last_id', 'gauge', 'Last dictionary change log id applied',
+                                  lambda: self.change_feed.last_id)
+        metrics.register_callback('autocomplete_index_words', 'gauge', 'Words in the autocomplete index',
+                                  lambda: len(self.autocomplete))
+        metrics.register_callback('random_sampler_ids', 'gauge', 'Word ids available to /api/random',
+                                  self.random_sampler.size)
+        metrics.register_callback('pattern_index_words', 'gauge', 'Words in the /api/pattern index',
+                                  lambda: len(self.pattern_index))
+        metrics.register_callback('spelling_index_words', 'gauge', 'Words in the spelling suggestion index',
+                                  lambda: len(self.spelling))
     
     def init_database(self):
         """Initialize database if it doesn't exist"""
@@ -69,22 +201,96 @@ class EnhancedDictionaryAPI:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_difficulty ON dictionary(difficulty_level)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_length ON dictionary(word_length)')
             
-            # Create FTS virtual table
-            cursor.execute('''
-                CREATE VIRTUAL TABLE IF NOT EXISTS dictionary_fts USING fts5(
-                    word, definitions, example, content='dictionary', content_rowid='id'
-                )
-            ''')
-            
             conn.commit()
             conn.close()
             logger.info("Database created successfully")
     
+    def migrate_database(self):
+        """Add derived tables and triggers missing from older databases"""
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            # Schemas differ between the populators; add the ranking columns
+            add_missing_columns(cursor, {
+                'usage_frequency': 'INTEGER DEFAULT 0',
+                'frequency_rank': 'INTEGER DEFAULT 999999'
+            })
+            create_criteria_index(cursor)
+            create_change_log(cursor)
+            create_payload_column(cursor)
+            # Rows stored by older populators have no signatures yet
+            create_signature_columns(cursor)
+            backfill_signatures(cursor)
+            create_fts_index(cursor)
+            self.has_trigram_index = create_trigram_index(cursor, 'word_lowercase')
+            if create_stats_table(cursor):
+                rebuild_stats(cursor)
+            create_generation(cursor)
+        
+        if not self.has_trigram_index:
+            logger.warning("SQLite trigram tokenizer unavailable, substring search will scan")
+    
+    def open_snapshot(self, path: str):
+        """
+        Serve word lookups from a compiled snapshot.
+        
+        Words written since the snapshot was compiled are read from the
+        database instead: those logged so far are collected here, later ones
+        arrive through the change feed.
+        """
+        try:
+            snapshot = DictionarySnapshot(path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot open snapshot {path}, serving from the database: {e}")
+            return
+        
+        cursor = self.pool.reader().cursor()
+        # Oldest change id still logged; with an empty log, the next id to be used
+        cursor.execute('''
+            SELECT COALESCE((SELECT MIN(id) FROM dictionary_changes),
+                            (SELECT seq + 1 FROM sqlite_sequence WHERE name = 'dictionary_changes'), 1)
+        ''')
+        if cursor.fetchone()[0] > snapshot.change_id + 1:
+            # The log was pruned past the snapshot, so some changes are unknown
+            logger.warning(f"Snapshot {path} is older than the change log retention, ignoring it")
+            snapshot.close()
+            return
+        
+        cursor.execute('SELECT word_id, word FROM dictionary_changes WHERE id > ? AND id <= ?',
+                       (snapshot.change_id, self.change_feed.last_id))
+        changes = cursor.fetchall()
+        if any(row[0] == FULL_RELOAD_WORD_ID for row in changes):
+            logger.warning(f"Dictionary was rebuilt after snapshot {path} was compiled, ignoring it")
+            snapshot.close()
+            return
+        self.snapshot_overrides = {row[1] for row in changes}
+        self.snapshot = snapshot
+        logger.info(f"Serving {len(snapshot)} words from snapshot {path} "
+                    f"({len(self.snapshot_overrides)} changed since)")
+    
+    def _on_dictionary_changes(self, changes):
+        """Update caches and indexes for words changed in the database"""
+        if changes is None:
+            if self.snapshot is not None:
+                # Changed words are unknown after a reset; stop trusting the snapshot
+                logger.warning("Change feed reset, word lookups fall back to the database")
+                self.snapshot = None
+            self.request_cache.clear()
+            self.autocomplete.load(self.pool.reader())
+            self.random_sampler.load(self.pool.reader())
+            self.pattern_index.load(self.pool.reader())
+            self.spelling.load(self.pool.reader())
+        else:
+            if self.snapshot is not None:
+                self.snapshot_overrides.update(change.word for change in changes)
+            self.request_cache.invalidate_many(change.word for change in changes)
+            self.autocomplete.refresh(self.pool.reader(), changes)
+            self.random_sampler.refresh(self.pool.reader(), (change.word_id for change in changes))
+            self.pattern_index.refresh(self.pool.reader(), changes)
+            self.spelling.refresh(self.pool.reader(), changes)
+    
     def get_database_connection(self):
-        """Get database connection with row factory"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled read connection (rows use sqlite3.Row)"""
+        return self.pool.reader()
     
     def get_word_count(self) -> int:
         """Get total number of words in database"""
@@ -94,85 +300,254 @@ class EnhancedDictionaryAPI:
             return cursor.fetchone()[0]
     
     def get_word_definition(self, word: str) -> Optional[Dict]:
-        """Get word definition from database"""
+        """Get word definition, served from the LRU cache when possible"""
+        entry = self.get_word_entry(word)
+        return entry.data() if entry else None
+    
+    def get_word_entry(self, word: str) -> Optional[WordEntry]:
+        """Get a word's ready-to-send response body, served from the LRU cache when possible"""
+        self.change_feed.poll()
+        
+        key = word.lower()
+        cached = self.request_cache.get(key)
+        if cached is not MISSING:
+            return cached
+        
+        # Misses are cached too; inserts invalidate them via the change feed.
+        # Skip caching if a change arrived mid-load, the row may be stale.
+        version = self.change_feed.last_id
+        entry = self._load_word_entry(key)
+        if self.change_feed.last_id == version:
+            self.request_cache.set(key, entry)
+        return entry
+    
+    def dataset_etag(self, *parts) -> str:
+        """
+        ETag for a response computed purely from dictionary contents.
+        
+        The dataset fingerprint moves with every write, logged or not, so
+        it plus the request parameters identifies the response without
+        building it.
+        """
+        self.change_feed.poll()
+        return content_etag([dataset_fingerprint(self.pool.reader().cursor()), parts])
+    
+    def _load_word_entry(self, word: str) -> Optional[WordEntry]:
+        """Get a word's stored payload, or build one from the row if it has none"""
+        snapshot = self.snapshot
+        if snapshot is not None and word not in self.snapshot_overrides:
+            payload = snapshot.get(word)
+            return WordEntry.from_payload(payload) if payload is not None else None
+        
         with self.get_database_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT word, definitions, phonetic, part_of_speech, example, 
-                       etymology, difficulty_level, is_common
-                FROM dictionary 
-                WHERE word_lowercase = ? LIMIT 1
-            ''', (word.lower(),))
+            with metrics.time_query('word_lookup'):
+                cursor.execute('''
+                    SELECT payload, word, definitions, phonetic, part_of_speech, example, 
+                           etymology, difficulty_level, is_common
+                    FROM dictionary 
+                    WHERE word_lowercase = ? LIMIT 1
+                ''', (word.lower(),))
+                row = cursor.fetchone()
             
-            row = cursor.fetchone()
             if row:
-                return {
-                    'word': row['word'],
-                    'definitions': json.loads(row['definitions']) if row['definitions'] else [],
-                    'phonetic': row['phonetic'] or '',
-                    'part_of_speech': row['part_of_speech'] or '',
-                    'example': row['example'] or '',
-                    'etymology': row['etymology'] or '',
-                    'difficulty_level': row['difficulty_level'],
-                    'is_common': bool(row['is_common'])
-                }
+                if row['payload']:
+                    return WordEntry.from_payload(row['payload'])
+                return WordEntry.from_data(word_data(row))
         return None
     
-    def search_words(self, pattern: str, limit: int = 50, exact_match: bool = False) -> List[str]:
-        """Search for words matching pattern"""
+    def get_word_definitions(self, words: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Get definitions for many words at once, keyed by lowercase word.
+        
+        Cached words are served from memory; the rest are resolved with
+        chunked ``IN (...)`` queries instead of one SELECT per word.
+        """
+        self.change_feed.poll()
+        
+        results = {}
+        to_load = []
+        for word in words:
+            key = word.lower()
+            if key in results:
+                continue
+            cached = self.request_cache.get(key)
+            if cached is MISSING:
+                results[key] = None
+                to_load.append(key)
+            else:
+                results[key] = cached.data() if cached else None
+        
+        if not to_load:
+            return results
+        
+        version = self.change_feed.last_id
         with self.get_database_connection() as conn:
             cursor = conn.cursor()
-            
-            if exact_match:
-                cursor.execute('''
-                    SELECT word FROM dictionary 
-                    WHERE word_lowercase = ?
-                    LIMIT ?
-                ''', (pattern.lower(), limit))
-            else:
+            for start in range(0, len(to_load), SQL_IN_CHUNK_SIZE):
+                chunk = to_load[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                with metrics.time_query('word_batch_lookup'):
+                    cursor.execute(f'''
+                        SELECT word, word_lowercase, definitions, phonetic, part_of_speech, 
+                               example, etymology, difficulty_level, is_common
+                        FROM dictionary 
+                        WHERE word_lowercase IN ({placeholders})
+                    ''', chunk)
+                    rows = cursor.fetchall()
+                
+                for row in rows:
+                    results[row['word_lowercase']] = word_data(row)
+        
+        if self.change_feed.last_id == version:
+            for key in to_load:
+                self.request_cache.set(key, WordEntry.from_data(results[key]) if results[key] else None)
+        
+        return results
+    
+    def autocomplete_words(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get the top-ranked completions for a prefix from memory"""
+        self.change_feed.poll()
+        return self.autocomplete.complete(prefix, limit)
+    
+    def suggest_words(self, word: str, limit: int = SUGGEST_LIMIT) -> List[Dict]:
+        """Get the closest known spellings of a word from memory"""
+        self.change_feed.poll()
+        return [{'word': suggestion, 'distance': distance}
+                for suggestion, distance in self.spelling.suggest(word, limit)]
+    
+    def match_pattern(self, mask: str, exclude: str = '', limit: int = 100,
+                      hangman: bool = True) -> Tuple[List[str], int]:
+        """Get words fitting a positional mask and letter exclusions from memory"""
+        self.change_feed.poll()
+        return self.pattern_index.match(mask, exclude, limit, hangman)
+    
+    def find_anagrams(self, letters: str, limit: int = 100) -> List[str]:
+        """
+        Get every word spelled with exactly these letters, most frequent
+        first. One seek into idx_letters_sorted, which already stores equal
+        signatures in frequency_rank order.
+        """
+        with self.get_database_connection() as conn:
+            cursor = conn.cursor()
+            with metrics.time_query('anagrams'):
                 cursor.execute('''
-                    SELECT word FROM dictionary 
-                    WHERE word_lowercase LIKE ? 
-                    ORDER BY 
-                        CASE WHEN word_lowercase = ? THEN 1 
-                             WHEN word_lowercase LIKE ? THEN 2 
-                             ELSE 3 END,
-                        is_common DESC,
-                        usage_frequency DESC,
-                        word_length
+                    SELECT word FROM dictionary
+                    WHERE letters_sorted = ?
+                    ORDER BY frequency_rank, word
                     LIMIT ?
-                ''', (f'%{pattern.lower()}%', pattern.lower(), f'{pattern.lower()}%', limit))
-            
-            return [row['word'] for row in cursor.fetchall()]
+                ''', (letters_sorted(letters), limit))
+                return [row['word'] for row in cursor.fetchall()]
+    
+    def cryptogram_candidates(self, pattern: str, common_only: bool = False,
+                              limit: int = 500) -> List[str]:
+        """
+        Get the words with the same letter-repetition pattern as ``pattern``
+        (a signature like ``ABCCBD`` or an enciphered word), common words
+        first. One seek into idx_letter_pattern.
+        """
+        query = 'SELECT word FROM dictionary WHERE letter_pattern = ?'
+        if common_only:
+            query += ' AND is_common = 1'
+        query += ' ORDER BY is_common DESC, frequency_rank, word LIMIT ?'
+        
+        with self.get_database_connection() as conn:
+            cursor = conn.cursor()
+            with metrics.time_query('cryptogram_candidates'):
+                cursor.execute(query, (letter_pattern(pattern), limit))
+                return [row['word'] for row in cursor.fetchall()]
+    
+    def search_words(self, pattern: str, limit: int = 50, exact_match: bool = False,
+                     cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        Search for words matching pattern, best matches first.
+        
+        Returns a page of words and the cursor for the next page. The cursor
+        holds the last word's full sort key, so later pages filter on it
+        instead of re-reading and discarding the earlier ones.
+        """
+        pattern = pattern.lower()
+        scope = query_scope('search', pattern, exact_match)
+        
+        if exact_match:
+            query_name = 'search_exact'
+            candidates = ('FROM dictionary d WHERE d.word_lowercase = ?', [pattern])
+        elif self.has_trigram_index and len(pattern) >= 3:
+            # Candidates come from the trigram index instead of a full scan
+            query_name = 'search_trigram'
+            candidates = ('''
+                FROM dictionary_trigram t
+                JOIN dictionary d ON d.id = t.rowid
+                WHERE dictionary_trigram MATCH ?
+            ''', [trigram_match_query(pattern)])
+        else:
+            # Trigrams need at least 3 characters; shorter patterns scan
+            query_name = 'search_like'
+            candidates = ('FROM dictionary d WHERE d.word_lowercase LIKE ?', [f'%{pattern}%'])
+        
+        # Exact match, then prefix, then substring; commonness and frequency
+        # descend (negated so the whole key sorts ascending); word breaks ties
+        query = f'''
+            SELECT word, match_rank, common_key, frequency_key, length_key FROM (
+                SELECT d.word AS word,
+                       CASE WHEN d.word_lowercase = ? THEN 1 
+                            WHEN substr(d.word_lowercase, 1, ?) = ? THEN 2 
+                            ELSE 3 END AS match_rank,
+                       -COALESCE(d.is_common, 0) AS common_key,
+                       -COALESCE(d.usage_frequency, 0) AS frequency_key,
+                       COALESCE(d.word_length, 0) AS length_key
+                {candidates[0]}
+            )
+        '''
+        params = [pattern, len(pattern), pattern] + candidates[1]
+        if cursor:
+            query += ' WHERE (match_rank, common_key, frequency_key, length_key, word) > (?, ?, ?, ?, ?)'
+            params.extend(decode_cursor(cursor, scope, (int, int, int, int, str)))
+        query += ' ORDER BY match_rank, common_key, frequency_key, length_key, word LIMIT ?'
+        params.append(limit + 1)
+        
+        with self.get_database_connection() as conn:
+            db_cursor = conn.cursor()
+            with metrics.time_query(query_name):
+                db_cursor.execute(query, params)
+                rows = db_cursor.fetchall()
+        
+        next_page = next_cursor(
+            rows, limit,
+            lambda row: (row['match_rank'], row['common_key'], row['frequency_key'],
+                         row['length_key'], row['word']),
+            scope
+        )
+        return [row['word'] for row in rows], next_page
     
     def get_random_words(self, count: int = 10, difficulty: Optional[int] = None, 
                         common_only: bool = False) -> List[Dict]:
-        """Get random words from database"""
+        """Get random words, drawn from the in-memory sampler by primary key"""
+        self.change_feed.poll()
+        
+        word_ids = self.random_sampler.sample(
+            count, difficulty or None, 1 if common_only else None
+        )
+        if not word_ids:
+            return []
+        
         with self.get_database_connection() as conn:
             cursor = conn.cursor()
             
-            base_query = '''
-                SELECT word, definitions, phonetic, part_of_speech, example, 
-                       difficulty_level, is_common
-                FROM dictionary 
-                WHERE definitions != '[]' AND definitions != ''
-            '''
-            params = []
-            
-            if difficulty:
-                base_query += ' AND difficulty_level = ?'
-                params.append(difficulty)
-            
-            if common_only:
-                base_query += ' AND is_common = 1'
-            
-            base_query += ' ORDER BY RANDOM() LIMIT ?'
-            params.append(count)
-            
-            cursor.execute(base_query, params)
+            placeholders = ','.join('?' * len(word_ids))
+            with metrics.time_query('random_by_id'):
+                cursor.execute(f'''
+                    SELECT id, word, definitions, phonetic, part_of_speech, example, 
+                           difficulty_level, is_common
+                    FROM dictionary 
+                    WHERE id IN ({placeholders})
+                ''', word_ids)
+                
+                # Keep the sampled order; IN (...) returns rows by id
+                rows = {row['id']: row for row in cursor.fetchall()}
             
             results = []
-            for row in cursor.fetchall():
+            for row in (rows[word_id] for word_id in word_ids if word_id in rows):
                 results.append({
                     'word': row['word'],
                     'definitions': json.loads(row['definitions']) if row['definitions'] else [],
@@ -185,22 +560,36 @@ class EnhancedDictionaryAPI:
             
             return results
     
-    def full_text_search(self, query: str, limit: int = 50) -> List[Dict]:
-        """Perform full-text search on words and definitions"""
+    def full_text_search(self, query: str, limit: int = 50,
+                         cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Perform full-text search on words and definitions, best rank first"""
+        scope = query_scope('full_text', query)
+        sql = '''
+            SELECT d.word, d.definitions, d.phonetic, d.part_of_speech, 
+                   d.example, d.difficulty_level, d.is_common,
+                   fts.rank AS score, fts.rowid AS fts_rowid
+            FROM dictionary_fts fts
+            JOIN dictionary d ON d.id = fts.rowid
+            WHERE dictionary_fts MATCH ?
+        '''
+        params = [query]
+        if cursor:
+            # rowid breaks ties between equally ranked matches
+            sql += ' AND (fts.rank, fts.rowid) > (?, ?)'
+            params.extend(decode_cursor(cursor, scope, (float, int)))
+        sql += ' ORDER BY fts.rank, fts.rowid LIMIT ?'
+        params.append(limit + 1)
+        
         with self.get_database_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT d.word, d.definitions, d.phonetic, d.part_of_speech, 
-                       d.example, d.difficulty_level, d.is_common
-                FROM dictionary_fts fts
-                JOIN dictionary d ON d.id = fts.rowid
-                WHERE dictionary_fts MATCH ?
-                ORDER BY rank
-                LIMIT ?
-            ''', (query, limit))
+            db_cursor = conn.cursor()
+            with metrics.time_query('full_text_search'):
+                db_cursor.execute(sql, params)
+                rows = db_cursor.fetchall()
+            
+            next_page = next_cursor(rows, limit, lambda row: (row['score'], row['fts_rowid']), scope)
             
             results = []
-            for row in cursor.fetchall():
+            for row in rows:
                 results.append({
                     'word': row['word'],
                     'definitions': json.loads(row['definitions']) if row['definitions'] else [],
@@ -211,21 +600,31 @@ class EnhancedDictionaryAPI:
                     'is_common': bool(row['is_common'])
                 })
             
-            return results
+            return results, next_page
     
     def get_words_by_criteria(self, part_of_speech: Optional[str] = None, 
                              difficulty: Optional[int] = None,
                              min_length: Optional[int] = None,
                              max_length: Optional[int] = None,
                              common_only: bool = False,
-                             limit: int = 100) -> List[Dict]:
-        """Get words by specific criteria"""
+                             limit: int = 100,
+                             cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get words by specific criteria.
+        
+        Pages are keyed on (is_common, usage_frequency, word) with NULLs as 0,
+        the sort order of idx_criteria_rank, so each page is one seek into
+        the index no matter how deep it is.
+        """
+        scope = query_scope('criteria', part_of_speech, difficulty, min_length, max_length, common_only)
         with self.get_database_connection() as conn:
-            cursor = conn.cursor()
+            db_cursor = conn.cursor()
             
             base_query = '''
                 SELECT word, definitions, phonetic, part_of_speech, example, 
-                       difficulty_level, is_common, word_length
+                       difficulty_level, is_common, usage_frequency, word_length,
+                       COALESCE(is_common, 0) AS common_key,
+                       COALESCE(usage_frequency, 0) AS frequency_key
                 FROM dictionary 
                 WHERE definitions != '[]' AND definitions != ''
             '''
@@ -250,13 +649,44 @@ class EnhancedDictionaryAPI:
             if common_only:
                 base_query += ' AND is_common = 1'
             
-            base_query += ' ORDER BY is_common DESC, usage_frequency DESC, word LIMIT ?'
-            params.append(limit)
+            order = 'COALESCE(is_common, 0) DESC, COALESCE(usage_frequency, 0) DESC, word'
+            if cursor:
+                # Row values over expressions cannot seek the index, so the
+                # rows after the cursor are read as three seeks: the rest of
+                # its (is_common, usage_frequency) group, the rest of its
+                # is_common group, then every lower is_common value. Each
+                # orders by only its free key columns, which the planner
+                # needs to read them straight from the index
+                is_common, usage_frequency, word = decode_cursor(cursor, scope, (int, int, str))
+                seeks = [
+                    ('COALESCE(is_common, 0) = ? AND COALESCE(usage_frequency, 0) = ? AND word > ?',
+                     [is_common, usage_frequency, word], 'word'),
+                    ('COALESCE(is_common, 0) = ? AND COALESCE(usage_frequency, 0) < ?',
+                     [is_common, usage_frequency], 'COALESCE(usage_frequency, 0) DESC, word'),
+                    ('COALESCE(is_common, 0) < ?', [is_common], order)
+                ]
+                query = ' UNION ALL '.join(
+                    f'SELECT * FROM ({base_query} AND {condition} ORDER BY {seek_order} LIMIT ?)'
+                    for condition, _, seek_order in seeks
+                )
+                query = f'SELECT * FROM ({query}) ORDER BY common_key DESC, frequency_key DESC, word LIMIT ?'
+                params = [value for _, seek_params, _ in seeks for value in params + seek_params + [limit + 1]]
+            else:
+                query = f'{base_query} ORDER BY {order} LIMIT ?'
+            params.append(limit + 1)
+            
+            with metrics.time_query('words_by_criteria'):
+                db_cursor.execute(query, params)
+                rows = db_cursor.fetchall()
             
-            cursor.execute(base_query, params)
+            next_page = next_cursor(
+                rows, limit,
+                lambda row: (row['common_key'], row['frequency_key'], row['word']),
+                scope
+            )
             
             results = []
-            for row in cursor.fetchall():
+            for row in rows:
                 results.append({
                     'word': row['word'],
                     'definitions': json.loads(row['definitions']) if row['definitions'] else [],
@@ -268,61 +698,79 @@ class EnhancedDictionaryAPI:
                     'word_length': row['word_length']
                 })
             
-            return results
+            return results, next_page
+    
+    def export_words(self, difficulty: Optional[int] = None, part_of_speech: Optional[str] = None,
+                     is_common: Optional[bool] = None) -> Iterator[bytes]:
+        """
+        Yield every matching word as newline-delimited JSON.
+        
+        Rows are read from one open cursor EXPORT_BATCH_SIZE at a time and
+        each batch is sent as one chunk, so memory stays constant however
+        large the table is.
+        """
+        query = '''
+            SELECT word, definitions, phonetic, part_of_speech, example,
+                   etymology, difficulty_level, is_common
+            FROM dictionary
+            WHERE 1=1
+        '''
+        params = []
+        if difficulty is not None:
+            query += ' AND difficulty_level = ?'
+            params.append(difficulty)
+        if part_of_speech:
+            query += ' AND part_of_speech = ?'
+            params.append(part_of_speech)
+        if is_common is not None:
+            query += ' AND is_common = ?'
+            params.append(1 if is_common else 0)
+        # Rowid order walks the table without a sort
+        query += ' ORDER BY id'
+        
+        cursor = self.get_database_connection().cursor()
+        with metrics.time_query('export'):
+            cursor.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                yield b''.join(json.dumps(word_data(row), separators=(',', ':')).encode('utf-8') + b'\n'
+                               for row in rows)
+        finally:
+            cursor.close()
     
     def get_statistics(self) -> Dict:
-        """Get comprehensive database statistics"""
+        """Get comprehensive database statistics from the trigger-maintained summary"""
         with self.get_database_connection() as conn:
             cursor = conn.cursor()
+            with metrics.time_query('statistics'):
+                cursor.execute('SELECT metric, bucket, count FROM dictionary_stats WHERE count > 0')
+                rows = cursor.fetchall()
             
-            stats = {}
-            
-            # Total words
-            cursor.execute('SELECT COUNT(*) FROM dictionary')
-            stats['total_words'] = cursor.fetchone()[0]
-            
-            # Words with definitions
-            cursor.execute('SELECT COUNT(*) FROM dictionary WHERE definitions != "[]" AND definitions != ""')
-            stats['words_with_definitions'] = cursor.fetchone()[0]
-            
-            # Words by part of speech
-            cursor.execute('''
-                SELECT part_of_speech, COUNT(*) 
-                FROM dictionary 
-                WHERE part_of_speech != '' 
-                GROUP BY part_of_speech 
-                ORDER BY COUNT(*) DESC
-            ''')
-            stats['by_part_of_speech'] = dict(cursor.fetchall())
-            
-            # Words by difficulty
-            cursor.execute('''
-                SELECT difficulty_level, COUNT(*) 
-                FROM dictionary 
-                GROUP BY difficulty_level 
-                ORDER BY difficulty_level
-            ''')
-            stats['by_difficulty'] = dict(cursor.fetchall())
-            
-            # Word length distribution
-            cursor.execute('''
-                SELECT word_length, COUNT(*) 
-                FROM dictionary 
-                WHERE word_length IS NOT NULL
-                GROUP BY word_length 
-                ORDER BY word_length
-            ''')
-            stats['by_length'] = dict(cursor.fetchall())
-            
-            # Common words
-            cursor.execute('SELECT COUNT(*) FROM dictionary WHERE is_common = 1')
-            stats['common_words'] = cursor.fetchone()[0]
-            
-            # Recent additions
-            cursor.execute('SELECT COUNT(*) FROM dictionary WHERE date(created_at) = date("now")')
-            stats['added_today'] = cursor.fetchone()[0]
-            
-            return stats
+            counts = {}
+            for metric, bucket, count in rows:
+                counts.setdefault(metric, {})[bucket] = count
+        
+        by_part_of_speech = counts.get('part_of_speech', {})
+        
+        return {
+            'total_words': counts.get('total', {}).get('', 0),
+            'words_with_definitions': counts.get('with_definitions', {}).get('', 0),
+            'by_part_of_speech': dict(sorted(by_part_of_speech.items(), key=lambda item: -item[1])),
+            'by_difficulty': {int(level): count for level, count in
+                              sorted(counts.get('difficulty', {}).items(), key=lambda item: int(item[0]))},
+            'by_length': {int(length): count for length, count in
+                          sorted(counts.get('length', {}).items(), key=lambda item: int(item[0]))},
+            'common_words': counts.get('common', {}).get('', 0),
+            'added_today': counts.get('added_day', {}).get(time.strftime('%Y-%m-%d', time.gmtime()), 0)
+        }
+    
+    def rebuild_statistics(self):
+        """Slow path: recompute the statistics summary with full-table scans"""
+        with self.pool.writer() as conn:
+            rebuild_stats(conn.cursor())
 
 # Initialize API instance
 dictionary_api = EnhancedDictionaryAPI()
@@ -332,36 +780,55 @@ def rate_limit(max_requests: int = RATE_LIMIT_REQUESTS, window: int = RATE_LIMIT
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
-            client_ip = request.environ.get('HTTP_X_FORWARDED_FOR') or request.environ.get('REMOTE_ADDR')
-            current_time = time.time()
-            
-            if client_ip not in dictionary_api.rate_limit_cache:
-                dictionary_api.rate_limit_cache[client_ip] = []
+            forwarded = request.environ.get('HTTP_X_FORWARDED_FOR')
+            client_ip = forwarded.split(',')[0].strip() if forwarded else request.environ.get('REMOTE_ADDR')
             
-            # Clean old requests
-            dictionary_api.rate_limit_cache[client_ip] = [
-                req_time for req_time in dictionary_api.rate_limit_cache[client_ip]
-                if current_time - req_time < window
-            ]
-            
-            # Check rate limit
-            if len(dictionary_api.rate_limit_cache[client_ip]) >= max_requests:
-                return jsonify({
+            result = dictionary_api.rate_limiter.hit(client_ip or 'unknown', max_requests, window)
+            if not result.allowed:
+                response = jsonify({
                     'success': False,
                     'error': 'Rate limit exceeded. Please try again later.',
                     'rate_limit': {
                         'max_requests': max_requests,
                         'window_seconds': window
                     }
-                }), 429
-            
-            # Add current request
-            dictionary_api.rate_limit_cache[client_ip].append(current_time)
+                })
+                response.headers['Retry-After'] = str(result.retry_after)
+                # Set here: cache_control sits below this decorator and never sees a 429
+                response.headers['Cache-Control'] = 'no-store'
+                return response, 429
             
             return f(*args, **kwargs)
         return wrapper
     return decorator
 
+def cache_control(max_age: int = 0):
+    """Set Cache-Control on a route's responses: public for 200s, no-store otherwise"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if 'Cache-Control' not in response.headers:
+                if max_age and response.status_code in (200, 304):
+                    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+                else:
+                    response.headers['Cache-Control'] = 'no-store'
+            return response
+        return wrapper
+    return decorator
+
+def conditional(etag: str, build, weak: bool = False):
+    """
+    Answer 304 if the request's If-None-Match already names ``etag``,
+    otherwise build the response and tag it.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+    response.set_etag(etag, weak=weak)
+    return response
+
 # API Routes
 @app.route('/')
 def api_documentation():
@@ -417,13 +884,55 @@ def api_documentation():
             <pre>GET /api/word/beautiful</pre>
         </div>
         
+        <div class="endpoint">
+            <h3><span class="method">POST</span> /api/words/batch</h3>
+            <p>Get definitions for up to {{ batch_max_words }} words in one request (counts as one request for rate limiting)</p>
+            <pre>POST /api/words/batch
+{"words": ["beautiful", "happy", "xyzzy"]}</pre>
+        </div>
+        
         <div class="endpoint">
             <h3><span class="method">GET</span> /api/search</h3>
             <p>Search for words matching a pattern</p>
-            <p><strong>Parameters:</strong> q (query), limit (max results), exact (boolean)</p>
+            <p><strong>Parameters:</strong> q (query), limit (max results), exact (boolean), cursor (next_cursor of the previous page)</p>
             <pre>GET /api/search?q=beau&limit=10&exact=false</pre>
         </div>
         
+        <div class="endpoint">
+            <h3><span class="method">GET</span> /api/autocomplete</h3>
+            <p>Type-ahead completions for a prefix, ranked by commonness and frequency</p>
+            <p><strong>Parameters:</strong> q (prefix), limit (max 50)</p>
+            <pre>GET /api/autocomplete?q=beau&limit=10</pre>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method">GET</span> /api/suggest</h3>
+            <p>"Did you mean" spellings within a few edits, closest and most common first (also sent with word 404s)</p>
+            <p><strong>Parameters:</strong> q (word), limit (max 50)</p>
+            <pre>GET /api/suggest?q=recieve</pre>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method">GET</span> /api/anagrams</h3>
+            <p>Every word spelled with exactly the given letters, most frequent first</p>
+            <p><strong>Parameters:</strong> letters, limit (max 500)</p>
+            <pre>GET /api/anagrams?letters=listen</pre>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method">GET</span> /api/pattern</h3>
+            <p>Words fitting a positional mask (<code>_</code> for an unknown letter) that contain none of the excluded letters</p>
+            <p><strong>Parameters:</strong> mask, exclude, hangman (default true: <code>_</code> cannot be a revealed letter), limit (max 500)</p>
+            <pre>GET /api/pattern?mask=c_t__&exclude=eas</pre>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method">GET</span> /api/cryptogram/candidates</h3>
+            <p>Words with the same letter-repetition pattern, given as a signature or an enciphered word</p>
+            <p><strong>Parameters:</strong> pattern, common_only (boolean), limit (max 2000)</p>
+            <pre>GET /api/cryptogram/candidates?pattern=ABCCBD&common_only=true</pre>
+        </div>
+        
         <div class="endpoint">
             <h3><span class="method">GET</span> /api/random</h3>
             <p>Get random words from the dictionary</p>
@@ -434,23 +943,36 @@ def api_documentation():
         <div class="endpoint">
             <h3><span class="method">GET</span> /api/search/full-text</h3>
             <p>Full-text search across words and definitions</p>
-            <p><strong>Parameters:</strong> q (query), limit (max results)</p>
+            <p><strong>Parameters:</strong> q (query), limit (max results), cursor</p>
             <pre>GET /api/search/full-text?q=happiness&limit=20</pre>
         </div>
         
         <div class="endpoint">
             <h3><span class="method">GET</span> /api/words/criteria</h3>
             <p>Get words by specific criteria</p>
-            <p><strong>Parameters:</strong> part_of_speech, difficulty, min_length, max_length, common_only, limit</p>
+            <p><strong>Parameters:</strong> part_of_speech, difficulty, min_length, max_length, common_only, limit, cursor</p>
             <pre>GET /api/words/criteria?part_of_speech=noun&difficulty=2&min_length=5</pre>
         </div>
         
+        <div class="endpoint">
+            <h3><span class="method">GET</span> /api/export</h3>
+            <p>Stream every entry as newline-delimited JSON, for full-dictionary sync</p>
+            <p><strong>Parameters:</strong> difficulty, part_of_speech, is_common (all optional)</p>
+            <pre>GET /api/export?is_common=true</pre>
+        </div>
+        
         <div class="endpoint">
             <h3><span class="method">GET</span> /api/stats</h3>
             <p>Get comprehensive database statistics</p>
             <pre>GET /api/stats</pre>
         </div>
         
+        <div class="endpoint">
+            <h3><span class="method">GET</span> /metrics</h3>
+            <p>Per-route request counts and latency histograms, per-query timings, cache and rate limiter gauges (Prometheus text format)</p>
+            <pre>GET /metrics</pre>
+        </div>
+        
         <h2>🔧 Setup Instructions</h2>
         <ol>
             <li>Install dependencies: <code>pip install -r requirements.txt</code></li>
@@ -467,10 +989,11 @@ def api_documentation():
     
     from jinja2 import Template
     template = Template(docs_html)
-    return template.render(stats=stats)
+    return template.render(stats=stats, batch_max_words=BATCH_MAX_WORDS)
 
 @app.route('/api/word/<word>')
 @rate_limit()
+@cache_control(CACHE_MAX_AGE_WORD)
 def get_word_definition(word):
     """Get definition for a specific word"""
     if not word or len(word.strip()) < 1:
@@ -479,26 +1002,86 @@ def get_word_definition(word):
             'error': 'Word parameter is required'
         }), 400
     
-    word_data = dictionary_api.get_word_definition(word.strip())
+    entry = dictionary_api.get_word_entry(word.strip())
     
-    if word_data:
-        return jsonify({
-            'success': True,
-            'data': word_data
-        })
+    if entry:
+        # Pre-compressed payloads go out as stored to clients that take gzip
+        use_gzip = entry.gzip_body is not None and request.accept_encodings['gzip'] > 0
+        response = conditional(entry.etag, lambda: word_response(entry, use_gzip), weak=use_gzip)
+        if entry.gzip_body is not None:
+            response.vary.add('Accept-Encoding')
+        return response
     else:
         return jsonify({
             'success': False,
-            'error': f'Word "{word}" not found'
+            'error': f'Word "{word}" not found',
+            'suggestions': dictionary_api.suggest_words(word.strip())
         }), 404
 
+def word_response(entry: WordEntry, use_gzip: bool = False) -> Response:
+    """Send a word's stored response body without re-serializing it"""
+    # WSGI servers only write bytes; snapshot bodies are copied out of the mapping here
+    body = entry.gzip_body if use_gzip else entry.body
+    response = Response(bytes(body), mimetype='application/json')
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@app.route('/api/words/batch', methods=['POST'])
+@rate_limit()
+@cache_control()
+def get_word_definitions_batch():
+    """Get definitions for a list of words in one request"""
+    data = request.get_json(silent=True) or {}
+    words = data.get('words')
+    
+    if not isinstance(words, list) or not words:
+        return jsonify({
+            'success': False,
+            'error': 'Request body must contain a non-empty "words" list'
+        }), 400
+    
+    if len(words) > BATCH_MAX_WORDS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {BATCH_MAX_WORDS} words can be looked up per request'
+        }), 400
+    
+    words = [str(word).strip() for word in words if str(word).strip()]
+    results = dictionary_api.get_word_definitions(words)
+    
+    found = []
+    missing = []
+    seen = set()
+    for word in words:
+        key = word.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        if results.get(key):
+            found.append(results[key])
+        else:
+            missing.append(word)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'requested': len(seen),
+            'found_count': len(found),
+            'words': found,
+            'missing': missing
+        }
+    })
+
 @app.route('/api/search')
 @rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
 def search_words():
     """Search for words matching a pattern"""
     query = request.args.get('q', '').strip()
     limit = min(int(request.args.get('limit', 50)), 100)
     exact = request.args.get('exact', 'false').lower() == 'true'
+    cursor = request.args.get('cursor')
     
     if len(query) < 2:
         return jsonify({
@@ -506,7 +1089,7 @@ def search_words():
             'error': 'Query must be at least 2 characters long'
         }), 400
     
-    words = dictionary_api.search_words(query, limit, exact)
+    words, next_page = dictionary_api.search_words(query, limit, exact, cursor)
     
     return jsonify({
         'success': True,
@@ -514,12 +1097,151 @@ def search_words():
             'query': query,
             'count': len(words),
             'exact_match': exact,
+            'words': words,
+            'next_cursor': next_page
+        }
+    })
+
+@app.route('/api/autocomplete')
+@rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
+def autocomplete_words():
+    """Get type-ahead completions for a prefix"""
+    query = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', AUTOCOMPLETE_TOP_K, type=int), 50)
+    
+    if len(query) < 1:
+        return jsonify({
+            'success': False,
+            'error': 'Query parameter q is required'
+        }), 400
+    
+    words = dictionary_api.autocomplete_words(query, limit)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'query': query,
+            'count': len(words),
+            'words': words
+        }
+    })
+
+@app.route('/api/suggest')
+@rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
+def suggest_words():
+    """Get "did you mean" spellings for a possibly misspelled word"""
+    query = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', SUGGEST_LIMIT, type=int), 50)
+    
+    if len(query) < 1:
+        return jsonify({
+            'success': False,
+            'error': 'Query parameter q is required'
+        }), 400
+    
+    suggestions = dictionary_api.suggest_words(query, limit)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'query': query,
+            'count': len(suggestions),
+            'suggestions': suggestions
+        }
+    })
+
+@app.route('/api/anagrams')
+@rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
+def find_anagrams():
+    """Get the exact anagrams of a set of letters"""
+    letters = request.args.get('letters', '').strip()
+    limit = min(request.args.get('limit', 100, type=int), 500)
+    
+    if not letters_sorted(letters):
+        return jsonify({
+            'success': False,
+            'error': 'Parameter letters must contain at least one letter'
+        }), 400
+    
+    words = dictionary_api.find_anagrams(letters, limit)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'letters': letters,
+            'count': len(words),
+            'words': words
+        }
+    })
+
+@app.route('/api/pattern')
+@rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
+def match_pattern():
+    """Get words fitting a hangman-style mask"""
+    mask = request.args.get('mask', '').strip().lower()
+    exclude = request.args.get('exclude', '').strip().lower()
+    limit = min(request.args.get('limit', 100, type=int), 500)
+    hangman = request.args.get('hangman', 'true').lower() == 'true'
+    
+    if not re.fullmatch(f'[a-z{WILDCARD}]+', mask):
+        return jsonify({
+            'success': False,
+            'error': f'Parameter mask must be letters a-z and {WILDCARD} for unknown positions'
+        }), 400
+    if not re.fullmatch('[a-z]*', exclude):
+        return jsonify({
+            'success': False,
+            'error': 'Parameter exclude must be letters a-z'
+        }), 400
+    
+    words, total = dictionary_api.match_pattern(mask, exclude, limit, hangman)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'mask': mask,
+            'exclude': exclude,
+            'hangman': hangman,
+            'count': len(words),
+            'total_matches': total,
+            'words': words
+        }
+    })
+
+@app.route('/api/cryptogram/candidates')
+@rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
+def cryptogram_candidates():
+    """Get the words that could decipher a cryptogram word"""
+    pattern = request.args.get('pattern', '').strip()
+    common_only = request.args.get('common_only', 'false').lower() == 'true'
+    limit = min(request.args.get('limit', 500, type=int), 2000)
+    
+    if not any(c.isalpha() for c in pattern):
+        return jsonify({
+            'success': False,
+            'error': 'Parameter pattern must contain at least one letter'
+        }), 400
+    
+    words = dictionary_api.cryptogram_candidates(pattern, common_only, limit)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'pattern': letter_pattern(pattern),
+            'common_only': common_only,
+            'count': len(words),
             'words': words
         }
     })
 
 @app.route('/api/random')
 @rate_limit()
+@cache_control()
 def get_random_words():
     """Get random words from the database"""
     count = min(int(request.args.get('count', 10)), 50)
@@ -540,10 +1262,12 @@ def get_random_words():
 
 @app.route('/api/search/full-text')
 @rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
 def full_text_search():
     """Full-text search across words and definitions"""
     query = request.args.get('q', '').strip()
     limit = min(int(request.args.get('limit', 50)), 100)
+    cursor = request.args.get('cursor')
     
     if len(query) < 2:
         return jsonify({
@@ -551,19 +1275,21 @@ def full_text_search():
             'error': 'Query must be at least 2 characters long'
         }), 400
     
-    results = dictionary_api.full_text_search(query, limit)
+    results, next_page = dictionary_api.full_text_search(query, limit, cursor)
     
     return jsonify({
         'success': True,
         'data': {
             'query': query,
             'count': len(results),
-            'results': results
+            'results': results,
+            'next_cursor': next_page
         }
     })
 
 @app.route('/api/words/criteria')
 @rate_limit()
+@cache_control(CACHE_MAX_AGE_LIST)
 def get_words_by_criteria():
     """Get words by specific criteria"""
     part_of_speech = request.args.get('part_of_speech')
@@ -572,9 +1298,16 @@ def get_words_by_criteria():
     max_length = request.args.get('max_length', type=int)
     common_only = request.args.get('common_only', 'false').lower() == 'true'
     limit = min(int(request.args.get('limit', 100)), 200)
+    cursor = request.args.get('cursor')
     
-    words = dictionary_api.get_words_by_criteria(
-        part_of_speech, difficulty, min_length, max_length, common_only, limit
+    criteria = (part_of_speech, difficulty, min_length, max_length, common_only, limit, cursor)
+    return conditional(dictionary_api.dataset_etag('criteria', *criteria),
+                       lambda: criteria_response(*criteria))
+
+def criteria_response(part_of_speech, difficulty, min_length, max_length, common_only, limit, cursor):
+    """Build the /api/words/criteria body"""
+    words, next_page = dictionary_api.get_words_by_criteria(
+        part_of_speech, difficulty, min_length, max_length, common_only, limit, cursor
     )
     
     return jsonify({
@@ -588,21 +1321,60 @@ def get_words_by_criteria():
                 'common_only': common_only
             },
             'count': len(words),
-            'words': words
+            'words': words,
+            'next_cursor': next_page
         }
     })
 
+@app.route('/api/export')
+@rate_limit()
+@cache_control()
+def export_words():
+    """Stream every entry (optionally filtered) as newline-delimited JSON"""
+    difficulty = request.args.get('difficulty', type=int)
+    part_of_speech = request.args.get('part_of_speech')
+    is_common = request.args.get('is_common')
+    if is_common is not None:
+        is_common = is_common.lower() == 'true'
+    
+    return Response(dictionary_api.export_words(difficulty, part_of_speech, is_common),
+                    mimetype='application/x-ndjson')
+
 @app.route('/api/stats')
 @rate_limit()
+@cache_control(CACHE_MAX_AGE_STATS)
 def get_statistics():
     """Get comprehensive database statistics"""
+    # Weak: the dictionary figures are fixed per version, the operational
+    # counters alongside them are a snapshot that may drift in between
+    return conditional(dictionary_api.dataset_etag('stats'), statistics_response, weak=True)
+
+def statistics_response():
+    """Build the /api/stats body"""
     stats = dictionary_api.get_statistics()
+    stats['connection_pool'] = dictionary_api.pool.stats()
+    stats['word_cache'] = dictionary_api.request_cache.stats()
+    stats['autocomplete'] = dictionary_api.autocomplete.stats()
+    stats['random_sampler'] = dictionary_api.random_sampler.stats()
+    stats['pattern_index'] = dictionary_api.pattern_index.stats()
+    stats['spelling'] = dictionary_api.spelling.stats()
+    stats['rate_limiter'] = dictionary_api.rate_limiter.stats()
+    stats['compression'] = compressor.stats()
+    if dictionary_api.snapshot is not None:
+        stats['snapshot'] = dict(dictionary_api.snapshot.stats(),
+                                 overridden_words=len(dictionary_api.snapshot_overrides))
     
     return jsonify({
         'success': True,
         'data': stats
     })
 
+@app.route('/metrics')
+@cache_control()
+def get_metrics():
+    """Request, query, cache and rate limiter metrics in Prometheus text format"""
+    return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({
@@ -610,14 +1382,29 @@ def not_found(error):
         'error': 'Endpoint not found',
         'available_endpoints': [
             '/api/word/{word}',
+            '/api/words/batch',
             '/api/search',
+            '/api/autocomplete',
+            '/api/suggest',
+            '/api/anagrams',
+            '/api/pattern',
+            '/api/cryptogram/candidates',
             '/api/random',
             '/api/search/full-text',
             '/api/words/criteria',
-            '/api/stats'
+            '/api/export',
+            '/api/stats',
+            '/metrics'
         ]
     }), 404
 
+@app.errorhandler(InvalidCursor)
+def invalid_cursor(error):
+    return jsonify({
+        'success': False,
+        'error': str(error)
+    }), 400
+
 @app.errorhandler(500)
 def internal_error(error):
     return jsonify({
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Dictionary Maintenance Commands
+Slow-path rebuilds and migrations for the derived tables and indexes that the
+API normally keeps up to date incrementally
+"""
+
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+
+from dictionary_schema import (
+    table_exists, create_stats_table, rebuild_stats, create_fts_index, rebuild_fts_index,
+    optimize_fts_index, create_payload_column
+)
+from word_payload import rebuild_payloads
+from dictionary_snapshot import compile_snapshot
+from word_signatures import create_signature_columns, backfill_signatures
+
+# Trigger-maintained FTS5 tables over the dictionary
+FTS_TABLES = ('dictionary_fts', 'dictionary_trigram')
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def rebuild_statistics(conn: sqlite3.Connection, args):
+    """Recompute dictionary_stats from the dictionary table"""
+    cursor = conn.cursor()
+    create_stats_table(cursor)
+    rebuild_stats(cursor)
+    cursor.execute("SELECT count FROM dictionary_stats WHERE metric = 'total'")
+    row = cursor.fetchone()
+    logger.info(f"Statistics rebuilt for {row[0] if row else 0} words")
+
+
+def rebuild_full_text(conn: sqlite3.Connection, args):
+    """Install the full-text triggers if missing and re-index every FTS table"""
+    cursor = conn.cursor()
+    create_fts_index(cursor)
+    for name in FTS_TABLES:
+        if table_exists(cursor, name):
+            rebuild_fts_index(cursor, name)
+            logger.info(f"Rebuilt {name}")
+
+
+def optimize_full_text(conn: sqlite3.Connection, args):
+    """Merge the segments that incremental FTS maintenance accumulates"""
+    cursor = conn.cursor()
+    for name in FTS_TABLES:
+        if table_exists(cursor, name):
+            optimize_fts_index(cursor, name)
+            logger.info(f"Optimized {name}")
+
+
+def rebuild_word_payloads(conn: sqlite3.Connection, args):
+    """Re-serialize every word's pre-built /api/word response body"""
+    cursor = conn.cursor()
+    create_payload_column(cursor)
+    written = rebuild_payloads(cursor, compress=args.compress)
+    logger.info(f"Rebuilt {written} payloads{' (gzip)' if args.compress else ''}")
+
+
+def backfill_word_signatures(conn: sqlite3.Connection, args):
+    """Add the word signature columns and compute them for existing rows"""
+    cursor = conn.cursor()
+    create_signature_columns(cursor)
+    written = backfill_signatures(cursor, only_missing=not args.all)
+    logger.info(f"Backfilled signatures for {written} words")
+
+
+def compile_dictionary_snapshot(conn: sqlite3.Connection, args):
+    """Write the memory-mapped read-only snapshot served with SNAPSHOT_PATH"""
+    compile_snapshot(conn, args.output)
+
+
+COMMANDS = {
+    'rebuild-stats': (rebuild_statistics, 'Recompute the /api/stats summary table'),
+    'rebuild-fts': (rebuild_full_text, 'Re-index the full-text and trigram search tables'),
+    'optimize-fts': (optimize_full_text, 'Merge full-text index segments after many writes'),
+    'rebuild-payloads': (rebuild_word_payloads, 'Re-serialize the stored /api/word response bodies'),
+    'backfill-signatures': (backfill_word_signatures, 'Compute the anagram and cryptogram signatures of existing words'),
+    'compile-snapshot': (compile_dictionary_snapshot, 'Compile a memory-mapped read-only dictionary snapshot'),
+}
+
+# Extra options per command: name -> [(flags, argparse keyword arguments)]
+COMMAND_ARGUMENTS = {
+    'rebuild-payloads': [
+        (('--compress',), {'action': 'store_true', 'help': 'Store the payloads gzip-compressed'}),
+    ],
+    'backfill-signatures': [
+        (('--all',), {'action': 'store_true', 'help': 'Recompute every row, not only rows missing a signature'}),
+    ],
+    'compile-snapshot': [
+        (('--output',), {'default': 'dictionary.snapshot',
+                         'help': 'Snapshot file to write (default: dictionary.snapshot)'}),
+    ],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dictionary database maintenance')
+    parser.add_argument('--database', default='dictionary.db',
+                        help='Database file path (default: dictionary.db)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, (_, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        for flags, options in COMMAND_ARGUMENTS.get(name, []):
+            subparser.add_argument(*flags, **options)
+
+    args = parser.parse_args()
+    command, _ = COMMANDS[args.command]
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(args.database)
+    try:
+        command(conn, args)
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"{args.command} failed: {e}")
+        return 1
+    finally:
+        conn.close()
+
+    logger.info(f"{args.command} finished in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
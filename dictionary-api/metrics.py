@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+API Metrics
+Low-overhead counters and latency histograms with Prometheus text exposition,
+plus Flask hooks for per-route request metrics
+"""
+
+import bisect
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow scans
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+Labels = Tuple[Tuple[str, str], ...]
+GaugeValue = Union[float, Dict[Labels, float]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms aggregated per thread.
+
+    Each thread records into its own dict, so the hot path is a dict lookup
+    and a few list increments with no locking. Scrapes merge every thread's
+    dict; the dicts of threads that have exited are folded into one retired
+    total, so thread-per-request servers do not accumulate them. Gauges are
+    callbacks evaluated at scrape time.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stores: List[Tuple[threading.Thread, Dict]] = []
+        self._retired: Dict = {}
+        self._registered = 0
+
+        # name -> (type, help)
+        self._metadata: Dict[str, Tuple[str, str]] = {}
+        self._callbacks: List[Tuple[str, Callable[[], GaugeValue]]] = []
+
+    def _store(self) -> Dict:
+        store = getattr(self._local, 'store', None)
+        if store is None:
+            store = self._local.store = {}
+            with self._lock:
+                self._stores.append((threading.current_thread(), store))
+                self._registered += 1
+                if self._registered % 256 == 0:
+                    self._retire_dead_threads()
+        return store
+
+    def describe(self, name: str, metric_type: str, help_text: str):
+        """Set the TYPE and HELP lines for a metric"""
+        self._metadata[name] = (metric_type, help_text)
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1):
+        """Add to a counter"""
+        store = self._store()
+        key = (name, labels)
+        store[key] = store.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Labels = ()):
+        """Record one histogram observation"""
+        store = self._store()
+        key = (name, labels)
+        counts = store.get(key)
+        if counts is None:
+            # One slot per bucket plus +Inf, then sum and count
+            counts = store[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    @contextmanager
+    def timer(self, name: str, labels: Labels = ()):
+        """Observe the duration of a block; also usable as a decorator"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def time_query(self, query: str):
+        """Time one SQL statement (including fetching its rows) under a name"""
+        return self.timer('db_query_duration_seconds', (('query', query),))
+
+    def register_callback(self, name: str, metric_type: str, help_text: str,
+                          callback: Callable[[], GaugeValue]):
+        """Expose a value computed at scrape time (a number or labels -> number)"""
+        self.describe(name, metric_type, help_text)
+        self._callbacks.append((name, callback))
+
+    @staticmethod
+    def _merge(into: Dict, store: Dict):
+        for key, value in list(store.items()):
+            if isinstance(value, list):
+                merged = into.get(key)
+                if merged is None:
+                    into[key] = list(value)
+                else:
+                    for index, item in enumerate(value):
+                        merged[index] += item
+            else:
+                into[key] = into.get(key, 0) + value
+
+    def _retire_dead_threads(self):
+        """Fold the stores of finished threads into the retired totals (lock held)"""
+        alive = []
+        for thread, store in self._stores:
+            if thread.is_alive():
+                alive.append((thread, store))
+            else:
+                self._merge(self._retired, store)
+        self._stores = alive
+
+    def collect(self) -> Dict:
+        """Merged counter and histogram values keyed by (name, labels)"""
+        with self._lock:
+            self._retire_dead_threads()
+            merged = {}
+            self._merge(merged, self._retired)
+            for _, store in self._stores:
+                self._merge(merged, store)
+        return merged
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        by_name: Dict[str, List] = {}
+        for (name, labels), value in self.collect().items():
+            by_name.setdefault(name, []).append((labels, value))
+
+        for name, callback in self._callbacks:
+            try:
+                value = callback()
+            except Exception as e:
+                logger.warning(f"Metric callback {name} failed: {e}")
+                continue
+            samples = value.items() if isinstance(value, dict) else [((), value)]
+            by_name.setdefault(name, []).extend(samples)
+
+        lines = []
+        for name in sorted(by_name):
+            metric_type, help_text = self._metadata.get(name, ('untyped', ''))
+            if help_text:
+                lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+
+            for labels, value in sorted(by_name[name], key=lambda sample: sample[0]):
+                if isinstance(value, list):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float('inf'),), value):
+                        cumulative += count
+                        le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                        lines.append(f'{name}_bucket{_format_labels(labels, le)} {cumulative}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {value[-2]}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+                else:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Shared registry for the API process
+metrics = MetricsRegistry()
+metrics.describe('http_requests_total', 'counter', 'HTTP requests by route, method and status')
+metrics.describe('http_request_duration_seconds', 'histogram', 'HTTP request latency by route')
+metrics.describe('db_query_duration_seconds', 'histogram', 'SQL statement latency by query')
+
+
+def instrument_app(app, registry: MetricsRegistry = metrics):
+    """Record per-route request counts, status codes and latency for a Flask app"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = getattr(g, '_metrics_start', None)
+        if start is not None:
+            # Route templates, not raw paths, keep label cardinality bounded
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            registry.observe('http_request_duration_seconds', time.perf_counter() - start,
+                             (('route', route), ('method', request.method)))
+            registry.inc('http_requests_total',
+                         (('route', route), ('method', request.method), ('status', str(response.status_code))))
+        return response
+
+    return app
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Missing Word Cache
+Negative cache of words the upstream dictionary API reported as unknown,
+so repeated misses are answered locally instead of with a network request
+"""
+
+import time
+import sqlite3
+import logging
+from typing import Dict, Optional
+
+from word_cache import WordCache
+
+logger = logging.getLogger(__name__)
+
+
+def create_missing_words_table(cursor: sqlite3.Cursor):
+    """Create the table that persists upstream misses across restarts and processes"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS missing_words (
+            word TEXT PRIMARY KEY,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_missing_words_expires ON missing_words(expires_at)')
+
+
+class MissingWordCache:
+    """
+    Bounded, expiring set of words with no upstream definition.
+
+    Lookups hit an in-memory LRU first. With a connection pool, misses are
+    also written to (and on a memory miss read back from) the
+    ``missing_words`` table, so other worker processes and restarts share
+    them. Entries carry a wall-clock expiry, so a word is retried upstream
+    once its ``ttl`` runs out. Each write also drops expired rows and, past
+    ``max_size`` rows, the ones closest to expiring, so the table stays as
+    bounded as the LRU.
+    """
+
+    def __init__(self, pool=None, max_size: int = 10000, ttl: float = 86400):
+        self.pool = pool
+        self.max_size = max_size
+        self.ttl = ttl
+        # Values are wall-clock expiry times; the LRU's own TTL only bounds staleness
+        self._cache = WordCache(max_size, ttl)
+
+        self.hits = 0
+        self.recorded = 0
+
+    def __contains__(self, word: str) -> bool:
+        key = word.lower()
+        expires_at = self._cache.get(key, None)
+        if expires_at is None and self.pool is not None:
+            expires_at = self._load(key)
+            if expires_at is not None:
+                self._cache.set(key, expires_at)
+
+        if expires_at is not None and expires_at > time.time():
+            self.hits += 1
+            return True
+        return False
+
+    def _load(self, word: str) -> Optional[float]:
+        cursor = self.pool.reader().cursor()
+        cursor.execute('SELECT expires_at FROM missing_words WHERE word = ?', (word,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def add(self, word: str):
+        """Record that the upstream API has no entry for ``word``"""
+        key = word.lower()
+        expires_at = time.time() + self.ttl
+        self._cache.set(key, expires_at)
+        self.recorded += 1
+
+        if self.pool is not None:
+            try:
+                with self.pool.writer() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('INSERT OR REPLACE INTO missing_words(word, expires_at) VALUES (?, ?)',
+                                   (key, expires_at))
+                    self.prune(cursor)
+            except sqlite3.Error as e:
+                # The in-memory entry still spares this process the next request
+                logger.warning(f"Could not persist missing word {key}: {e}")
+
+    def discard(self, word: str):
+        """Forget a word, e.g. once a definition for it has been stored"""
+        key = word.lower()
+        self._cache.invalidate(key)
+        if self.pool is not None:
+            try:
+                with self.pool.writer() as conn:
+                    conn.execute('DELETE FROM missing_words WHERE word = ?', (key,))
+            except sqlite3.Error as e:
+                logger.warning(f"Could not forget missing word {key}: {e}")
+
+    def prune(self, cursor: sqlite3.Cursor) -> int:
+        """
+        Delete expired rows from the missing_words table, then the rows
+        closest to expiring beyond ``max_size``. Returns the rows deleted.
+        """
+        cursor.execute('DELETE FROM missing_words WHERE expires_at <= ?', (time.time(),))
+        deleted = cursor.rowcount
+        cursor.execute('SELECT COUNT(*) FROM missing_words')
+        excess = cursor.fetchone()[0] - self.max_size
+        if excess > 0:
+            cursor.execute('''
+                DELETE FROM missing_words WHERE word IN (
+                    SELECT word FROM missing_words ORDER BY expires_at LIMIT ?
+                )
+            ''', (excess,))
+            deleted += cursor.rowcount
+        return deleted
+
+    def stats(self) -> Dict:
+        """Get negative cache counters"""
+        return {
+            'hits': self.hits,
+            'recorded': self.recorded,
+            'ttl_seconds': self.ttl,
+            'persistent': self.pool is not None,
+            'cache': self._cache.stats()
+        }
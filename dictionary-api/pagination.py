@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Keyset Pagination Cursors
+Opaque tokens carrying the ORDER BY key of a page's last row, so the next
+page starts with an index seek instead of skipping rows with OFFSET
+"""
+
+import json
+import base64
+import hashlib
+from typing import Optional, Sequence, Tuple
+
+
+class InvalidCursor(ValueError):
+    """A cursor token that is malformed or belongs to a different query"""
+
+
+def query_scope(*parts) -> str:
+    """Fingerprint of the query parameters a cursor is valid for"""
+    return hashlib.blake2b(json.dumps(parts).encode('utf-8'), digest_size=6).hexdigest()
+
+
+def encode_cursor(values: Sequence, scope: str) -> str:
+    """Token for resuming after a row whose sort key is ``values``"""
+    raw = json.dumps([scope, *values], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, scope: str, types: Tuple[type, ...]) -> Tuple:
+    """
+    Sort key stored in ``token``, checked against the query scope and the
+    expected value types. Raises InvalidCursor on any mismatch.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        token_scope, *values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Malformed cursor')
+
+    if token_scope != scope:
+        raise InvalidCursor('Cursor does not belong to this query')
+    if len(values) != len(types):
+        raise InvalidCursor('Malformed cursor')
+
+    key = []
+    for value, expected in zip(values, types):
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise InvalidCursor('Malformed cursor')
+        key.append(value)
+    return tuple(key)
+
+
+def next_cursor(rows: list, limit: int, key, scope: str) -> Optional[str]:
+    """
+    Trim a result fetched with ``limit + 1`` rows to ``limit`` and return
+    the cursor for the following page, or None on the last page.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(key(rows[-1]), scope)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+In-Memory Pattern Index
+Hangman-style positional queries ("c_t__", excluding e, a and s) answered
+with vectorized NumPy masks over per-length letter matrices
+"""
+
+import threading
+import time
+import logging
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from dictionary_schema import table_columns
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = '_'
+
+# Rank tuples sort ascending: common words first, then by frequency rank
+Rank = Tuple[int, int]
+
+# One group per word length: words in rank order, their letters as an
+# (n, length) uint8 matrix and a bitmask of the letters each word contains
+LengthGroup = namedtuple('LengthGroup', ['words', 'letters', 'presence'])
+
+
+def letter_bits(letters: str) -> int:
+    """Bitmask with bit 0 for 'a' through bit 25 for 'z'"""
+    bits = 0
+    for letter in letters:
+        bits |= 1 << (ord(letter) - ord('a'))
+    return bits
+
+
+class PatternIndex:
+    """
+    Positional pattern matching over every plain a-z word in the dictionary.
+
+    Words are grouped by length. Each group holds one row of letter codes
+    per word, so "letter c at position 0" is a single vectorized comparison
+    down one column, and a per-word letter bitmask turns "none of e, a, s
+    anywhere" into one AND over the group. Rows are kept in rank order, so
+    the first matches are the best ones without sorting.
+
+    Writes mark their word length dirty; a dirty group is rebuilt from its
+    own word set on the next query that needs it.
+    """
+
+    def __init__(self):
+        self._ranks: Dict[str, Rank] = {}
+        self._by_length: Dict[int, Set[str]] = {}
+        self._groups: Dict[int, LengthGroup] = {}
+        self._dirty: Set[int] = set()
+        self._lock = threading.Lock()
+
+        self.build_seconds = 0.0
+        self.updates = 0
+
+    @staticmethod
+    def _select(cursor) -> str:
+        """SELECT list for (word, rank fields), tolerant of older schemas"""
+        columns = table_columns(cursor)
+        is_common = 'COALESCE(is_common, 0)' if 'is_common' in columns else '0'
+        frequency_rank = 'COALESCE(frequency_rank, 999999)' if 'frequency_rank' in columns else '999999'
+        return f'SELECT lower(word), {is_common}, {frequency_rank} FROM dictionary'
+
+    @staticmethod
+    def _indexable(word: str) -> bool:
+        return word.isascii() and word.isalpha()
+
+    def load(self, conn):
+        """(Re)build every length group from the dictionary table"""
+        start = time.perf_counter()
+        cursor = conn.cursor()
+        cursor.execute(self._select(cursor))
+
+        ranks = {}
+        for word, is_common, frequency_rank in cursor:
+            if self._indexable(word):
+                ranks[word] = (0 if is_common else 1, frequency_rank)
+
+        by_length = {}
+        for word in ranks:
+            by_length.setdefault(len(word), set()).add(word)
+        groups = {length: self._build_group(length, words, ranks) for length, words in by_length.items()}
+
+        with self._lock:
+            self._ranks, self._by_length, self._groups, self._dirty = ranks, by_length, groups, set()
+
+        self.build_seconds = time.perf_counter() - start
+        logger.info(f"Pattern index built: {len(ranks)} words in {len(groups)} length groups "
+                    f"in {self.build_seconds:.2f}s")
+
+    @staticmethod
+    def _build_group(length: int, words: Iterable[str], ranks: Dict[str, Rank]) -> LengthGroup:
+        words = sorted(words, key=lambda word: (ranks[word], word))
+        letters = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8).reshape(len(words), length)
+        presence = np.bitwise_or.reduce(
+            np.left_shift(np.uint32(1), (letters - ord('a')).astype(np.uint32)), axis=1
+        )
+        return LengthGroup(words, letters, presence)
+
+    def refresh(self, conn, changes: Iterable):
+        """Re-read changed rows (``Change`` tuples) and mark their groups for rebuild"""
+        changes = list(changes)
+        if not changes:
+            return
+
+        words = {change.word for change in changes}
+        word_ids = list({change.word_id for change in changes})
+
+        cursor = conn.cursor()
+        select = self._select(cursor)
+        current = {}
+        for start in range(0, len(word_ids), 500):
+            chunk = word_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'{select} WHERE id IN ({placeholders})', chunk)
+            for word, is_common, frequency_rank in cursor.fetchall():
+                current[word] = (0 if is_common else 1, frequency_rank)
+        words.update(current)
+
+        with self._lock:
+            for word in words:
+                if not self._indexable(word):
+                    continue
+                if word in current:
+                    self._ranks[word] = current[word]
+                    self._by_length.setdefault(len(word), set()).add(word)
+                elif self._ranks.pop(word, None) is not None:
+                    self._by_length[len(word)].discard(word)
+                self._dirty.add(len(word))
+            self.updates += len(words)
+
+    def _group(self, length: int) -> Optional[LengthGroup]:
+        """The current group for a word length, rebuilt first if dirty (lock held)"""
+        if length in self._dirty:
+            words = self._by_length.get(length)
+            if words:
+                self._groups[length] = self._build_group(length, words, self._ranks)
+            else:
+                self._by_length.pop(length, None)
+                self._groups.pop(length, None)
+            self._dirty.discard(length)
+        return self._groups.get(length)
+
+    def match(self, mask: str, exclude: str = '', limit: int = 100,
+              hangman: bool = True) -> Tuple[List[str], int]:
+        """
+        Get the best-ranked words fitting ``mask`` (letters fixed by position,
+        ``_`` for any letter) that contain none of the ``exclude`` letters.
+        With ``hangman``, a revealed letter shows at every position it
+        occurs, so ``_`` positions cannot hold any letter in the mask.
+        Returns up to ``limit`` words and the total number of matches.
+        """
+        mask = mask.lower()
+        with self._lock:
+            group = self._group(len(mask))
+        if group is None:
+            return [], 0
+
+        selected = np.ones(len(group.words), dtype=bool)
+        for position, letter in enumerate(mask):
+            if letter != WILDCARD:
+                selected &= group.letters[:, position] == ord(letter)
+
+        excluded = letter_bits(exclude.lower())
+        if excluded:
+            selected &= (group.presence & np.uint32(excluded)) == 0
+
+        matches = np.flatnonzero(selected)
+
+        # Checked on the survivors only, which fixed letters have already narrowed
+        wildcards = [position for position, letter in enumerate(mask) if letter == WILDCARD]
+        revealed = set(mask) - {WILDCARD}
+        if hangman and wildcards and revealed and len(matches):
+            blocked = np.zeros(256, dtype=bool)
+            blocked[[ord(letter) for letter in revealed]] = True
+            matches = matches[~blocked[group.letters[matches][:, wildcards]].any(axis=1)]
+
+        return [group.words[index] for index in matches[:limit]], len(matches)
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def stats(self) -> Dict:
+        """Get index size and build information"""
+        return {
+            'words': len(self._ranks),
+            'length_groups': len(self._groups),
+            'matrix_bytes': sum(group.letters.nbytes + group.presence.nbytes
+                                for group in self._groups.values()),
+            'build_seconds': round(self.build_seconds, 3),
+            'updates': self.updates
+        }
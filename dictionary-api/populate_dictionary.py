@@ -4,42 +4,34 @@ Advanced Dictionary Population Service
 Fetches words from multiple sources to create a comprehensive English dictionary
 """
 
-import requests
 import sqlite3
 import json
-import time
 import logging
 from typing import Dict, List, Optional, Set
-import concurrent.futures
-from dataclasses import dataclass
 import re
 import nltk
 from nltk.corpus import words, wordnet
 import threading
 
+from dictionary_schema import (
+    create_change_log, create_fts_index, create_trigram_index, create_stats_table, rebuild_stats,
+    create_payload_column, create_criteria_index, create_generation
+)
+from word_payload import encode_payload
+from word_signatures import create_signature_columns, backfill_signatures, letter_pattern, letters_sorted
+from definition_fetcher import AsyncDefinitionFetcher, FetchError, WordDefinition
+from population_jobs import PopulationJobs
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
-class WordDefinition:
-    word: str
-    definitions: List[str]
-    phonetic: str = ""
-    part_of_speech: str = ""
-    example: str = ""
-    etymology: str = ""
-    difficulty_level: int = 1
-    is_common: bool = False
-
 class DictionaryPopulator:
-    def __init__(self, database_path: str = 'dictionary.db'):
+    def __init__(self, database_path: str = 'dictionary.db', compress_payloads: bool = False):
         self.database_path = database_path
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'DictionaryAPI/1.0 Educational Use'
-        })
-        self.rate_limit_delay = 0.1  # 100ms between requests
+        self.compress_payloads = compress_payloads
+        self.user_agent = 'DictionaryAPI/1.0 Educational Use'
+        self.rate_limit_delay = 0.1  # 100ms between requests (10 requests/second)
         self.lock = threading.Lock()
         
         # Download required NLTK data
@@ -47,6 +39,7 @@ class DictionaryPopulator:
         
         # Initialize database
         self.init_database()
+        self.jobs = PopulationJobs(database_path)
     
     def _setup_nltk(self):
         """Download required NLTK datasets"""
@@ -89,13 +82,31 @@ class DictionaryPopulator:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_difficulty ON dictionary(difficulty_level)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_length ON dictionary(word_length)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_is_common ON dictionary(is_common)')
+        create_criteria_index(cursor)
         
-        # Create full-text search virtual table
-        cursor.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS dictionary_fts USING fts5(
-                word, definitions, example, content='dictionary', content_rowid='id'
-            )
-        ''')
+        # Full-text search over definitions, maintained by triggers
+        create_fts_index(cursor)
+        
+        # Change log lets running API servers invalidate their caches
+        create_change_log(cursor)
+        
+        # Pre-serialized /api/word bodies, written by store_words
+        create_payload_column(cursor)
+        
+        # Anagram and cryptogram signatures, written by store_words; rows from older
+        # versions of this script are filled in here
+        create_signature_columns(cursor)
+        backfill_signatures(cursor)
+        
+        # Trigram index for substring search, maintained by triggers
+        create_trigram_index(cursor, 'word_lowercase')
+        
+        # Summary counts behind the API's /api/stats, maintained by triggers
+        if create_stats_table(cursor):
+            rebuild_stats(cursor)
+        
+        # Part of the API's ETags, so two databases never look alike to caches
+        create_generation(cursor)
         
         conn.commit()
         conn.close()
@@ -151,54 +162,6 @@ class DictionaryPopulator:
             "common", "turn", "simple", "set"
         ]
     
-    def fetch_definition_from_api(self, word: str) -> Optional[WordDefinition]:
-        """Fetch word definition from Free Dictionary API"""
-        try:
-            url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word.lower()}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    entry = data[0]
-                    
-                    # Extract definitions
-                    definitions = []
-                    part_of_speech = ""
-                    example = ""
-                    
-                    if 'meanings' in entry:
-                        for meaning in entry['meanings']:
-                            if not part_of_speech and 'partOfSpeech' in meaning:
-                                part_of_speech = meaning['partOfSpeech']
-                            
-                            if 'definitions' in meaning:
-                                for defn in meaning['definitions']:
-                                    if 'definition' in defn:
-                                        definitions.append(defn['definition'])
-                                    if not example and 'example' in defn:
-                                        example = defn['example']
-                    
-                    # Calculate difficulty based on word length and definition complexity
-                    difficulty = min(max(1, len(word) // 2), 10)
-                    
-                    return WordDefinition(
-                        word=word.lower(),
-                        definitions=definitions,
-                        phonetic=entry.get('phonetic', ''),
-                        part_of_speech=part_of_speech,
-                        example=example,
-                        etymology='',
-                        difficulty_level=difficulty,
-                        is_common=word.lower() in self.get_common_words()
-                    )
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error fetching definition for {word}: {e}")
-            return None
-    
     def get_wordnet_definition(self, word: str) -> Optional[WordDefinition]:
         """Get definition from WordNet if API fails"""
         try:
@@ -248,17 +211,55 @@ class DictionaryPopulator:
     
     def store_word(self, word_def: WordDefinition):
         """Store word definition in database"""
+        self.store_words([word_def])
+    
+    def word_payload(self, word_def: WordDefinition) -> bytes:
+        """Pre-serialized /api/word response body for a definition"""
+        return encode_payload({
+            'word': word_def.word,
+            'definitions': word_def.definitions,
+            'phonetic': word_def.phonetic or '',
+            'part_of_speech': word_def.part_of_speech or '',
+            'example': word_def.example or '',
+            'etymology': word_def.etymology or '',
+            'difficulty_level': word_def.difficulty_level,
+            'is_common': bool(word_def.is_common)
+        }, self.compress_payloads)
+    
+    def store_words(self, word_defs: List[WordDefinition]) -> int:
+        """Store a batch of word definitions in one transaction"""
+        if not word_defs:
+            return 0
+        
         with self.lock:
             conn = sqlite3.connect(self.database_path)
             cursor = conn.cursor()
             
             try:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO dictionary 
+                # Upsert rather than REPLACE so the row keeps its id and the
+                # change log sees an update instead of a silent delete
+                cursor.executemany('''
+                    INSERT INTO dictionary 
                     (word, word_lowercase, definitions, phonetic, part_of_speech, example, 
-                     etymology, difficulty_level, word_length, is_common, usage_frequency)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                     etymology, difficulty_level, word_length, is_common, usage_frequency, payload,
+                     letters_sorted, letter_pattern)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(word) DO UPDATE SET
+                        word_lowercase = excluded.word_lowercase,
+                        definitions = excluded.definitions,
+                        phonetic = excluded.phonetic,
+                        part_of_speech = excluded.part_of_speech,
+                        example = excluded.example,
+                        etymology = excluded.etymology,
+                        difficulty_level = excluded.difficulty_level,
+                        word_length = excluded.word_length,
+                        is_common = excluded.is_common,
+                        usage_frequency = excluded.usage_frequency,
+                        payload = excluded.payload,
+                        letters_sorted = excluded.letters_sorted,
+                        letter_pattern = excluded.letter_pattern,
+                        updated_at = CURRENT_TIMESTAMP
+                ''', [(
                     word_def.word,
                     word_def.word.lower(),
                     json.dumps(word_def.definitions),
@@ -269,67 +270,107 @@ class DictionaryPopulator:
                     word_def.difficulty_level,
                     len(word_def.word),
                     1 if word_def.is_common else 0,
-                    1 if word_def.is_common else 0
-                ))
-                
-                # Update FTS table
-                cursor.execute('''
-                    INSERT OR REPLACE INTO dictionary_fts(rowid, word, definitions, example)
-                    SELECT id, word, definitions, example FROM dictionary WHERE word = ?
-                ''', (word_def.word,))
+                    1 if word_def.is_common else 0,
+                    self.word_payload(word_def),
+                    letters_sorted(word_def.word),
+                    letter_pattern(word_def.word)
+                ) for word_def in word_defs])
                 
                 conn.commit()
+                return len(word_defs)
                 
             except Exception as e:
-                logger.error(f"Error storing word {word_def.word}: {e}")
+                conn.rollback()
+                logger.error(f"Error storing {len(word_defs)} words: {e}")
+                return 0
             finally:
                 conn.close()
     
-    def word_exists(self, word: str) -> bool:
-        """Check if word already exists in database"""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT 1 FROM dictionary WHERE word = ? LIMIT 1', (word.lower(),))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
-    
-    def process_word(self, word: str) -> bool:
-        """Process a single word - fetch definition and store"""
-        if self.word_exists(word):
-            return True
+    def populate_database(self, max_words: int = 10000, max_workers: int = 10,
+                          requests_per_second: Optional[float] = None,
+                          resume: bool = False, max_attempts: int = 3):
+        """
+        Populate database with comprehensive word list.
         
-        # Try API first
-        word_def = self.fetch_definition_from_api(word)
+        Each run is checkpointed as a population job. With ``resume`` the
+        latest unfinished job continues without rebuilding the word lists.
+        """
+        logger.info("Starting database population...")
+        common_words = set(self.get_common_words())
         
-        # Fall back to WordNet if API fails
-        if not word_def:
-            word_def = self.get_wordnet_definition(word)
+        job_id = self.jobs.latest_unfinished_job() if resume else None
+        if job_id is not None:
+            logger.info(f"Resuming population job {job_id}: {self.jobs.progress(job_id)}")
+        else:
+            job_id = self.jobs.create_job(self.get_candidate_words(max_words, common_words))
+            logger.info(f"Created population job {job_id}")
         
-        # Store basic entry if no definition found
-        if not word_def:
-            word_def = WordDefinition(
-                word=word.lower(),
-                definitions=[f"English word: {word}"],
-                part_of_speech="unknown",
-                difficulty_level=min(max(1, len(word) // 2), 10),
-                is_common=word.lower() in self.get_common_words()
-            )
+        # Remaining work is the job's words minus those already stored
+        pending = self.jobs.remaining_words(job_id, max_attempts)
+        progress = self.jobs.progress(job_id)
+        logger.info(f"Processing {len(pending)} of {progress['total_words']} words "
+                    f"({progress['fetched']} already stored)...")
         
-        if word_def:
-            self.store_word(word_def)
-            return True
+        counts = {'processed': progress['fetched'], 'failed': 0}
         
-        return False
-    
-    def populate_database(self, max_words: int = 10000, max_workers: int = 10):
-        """Populate database with comprehensive word list"""
-        logger.info("Starting database population...")
+        def store_batch(results):
+            # Failed lookups are retried by a later --resume, not stored as placeholders
+            fetch_failed = [(word, result.reason) for word, result in results if isinstance(result, FetchError)]
+            results = [(word, result) for word, result in results if not isinstance(result, FetchError)]
+            
+            word_defs = []
+            for word, word_def in results:
+                # Fall back to WordNet, then to a basic entry, if the API has no entry
+                if not word_def:
+                    word_def = self.get_wordnet_definition(word)
+                if not word_def:
+                    word_def = WordDefinition(
+                        word=word.lower(),
+                        definitions=[f"English word: {word}"],
+                        part_of_speech="unknown",
+                        difficulty_level=min(max(1, len(word) // 2), 10)
+                    )
+                word_def.is_common = word.lower() in common_words
+                word_defs.append(word_def)
+            
+            words = [word for word, _ in results]
+            if not word_defs or self.store_words(word_defs):
+                self.jobs.record_results(job_id, words, fetch_failed)
+                counts['processed'] += len(words)
+            else:
+                self.jobs.record_results(job_id, (), [(word, 'store failed') for word in words] + fetch_failed)
+                counts['failed'] += len(words)
+            counts['failed'] += len(fetch_failed)
+            logger.info(f"Processed {counts['processed']} words...")
+        
+        if requests_per_second is None:
+            requests_per_second = 1 / self.rate_limit_delay
+        
+        fetcher = AsyncDefinitionFetcher(
+            concurrency=max_workers,
+            requests_per_second=requests_per_second,
+            user_agent=self.user_agent
+        )
+        try:
+            fetch_stats = fetcher.run(pending, store_batch)
+        except BaseException:
+            self.jobs.finish_job(job_id, 'interrupted')
+            logger.info(f"Population job {job_id} interrupted; continue it with --resume")
+            raise
+        
+        progress = self.jobs.progress(job_id)
+        if progress['pending'] == 0 and progress['failed'] == 0:
+            self.jobs.finish_job(job_id)
         
-        # Get word lists from multiple sources
+        logger.info(f"Fetch stats: {fetch_stats}")
+        logger.info(f"Job progress: {self.jobs.progress(job_id)}")
+        logger.info(f"Database population complete! Processed: {counts['processed']}, "
+                    f"Failed: {counts['failed']}")
+    
+    def get_candidate_words(self, max_words: int, common_words: Set[str]) -> List[str]:
+        """Build the ordered candidate list for a new job (common words first)"""
         nltk_words = self.get_nltk_words()
         wordnet_words = self.get_wordnet_words()
-        common_words = set(self.get_common_words())
         
         # Combine and prioritize words
         all_words = list(common_words) + list(nltk_words.union(wordnet_words))
@@ -343,42 +384,7 @@ class DictionaryPopulator:
                 unique_words.append(word)
         
         # Limit to max_words
-        words_to_process = unique_words[:max_words]
-        
-        logger.info(f"Processing {len(words_to_process)} words...")
-        
-        processed_count = 0
-        failed_count = 0
-        
-        # Use ThreadPoolExecutor for concurrent processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_word = {
-                executor.submit(self.process_word, word): word 
-                for word in words_to_process
-            }
-            
-            # Process completed tasks
-            for future in concurrent.futures.as_completed(future_to_word):
-                word = future_to_word[future]
-                try:
-                    success = future.result()
-                    if success:
-                        processed_count += 1
-                    else:
-                        failed_count += 1
-                    
-                    if processed_count % 100 == 0:
-                        logger.info(f"Processed {processed_count} words...")
-                    
-                    # Rate limiting
-                    time.sleep(self.rate_limit_delay)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing word {word}: {e}")
-                    failed_count += 1
-        
-        logger.info(f"Database population complete! Processed: {processed_count}, Failed: {failed_count}")
+        return unique_words[:max_words]
     
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
@@ -425,21 +431,30 @@ def main():
     parser.add_argument('--max-words', type=int, default=10000, 
                        help='Maximum number of words to process (default: 10000)')
     parser.add_argument('--max-workers', type=int, default=10, 
-                       help='Maximum number of worker threads (default: 10)')
+                       help='Maximum number of concurrent API requests (default: 10)')
+    parser.add_argument('--requests-per-second', type=float, default=10,
+                       help='API request rate limit, 0 for unlimited (default: 10)')
     parser.add_argument('--database', type=str, default='dictionary.db', 
                        help='Database file path (default: dictionary.db)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue the last unfinished population job')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                       help='Give up on a word after this many failed attempts (default: 3)')
+    parser.add_argument('--compress-payloads', action='store_true',
+                       help='Store pre-serialized /api/word responses gzip-compressed')
     
     args = parser.parse_args()
     
     # Create populator and run
-    populator = DictionaryPopulator(args.database)
+    populator = DictionaryPopulator(args.database, args.compress_payloads)
     
     # Show initial stats
     initial_stats = populator.get_database_stats()
     logger.info(f"Initial database stats: {initial_stats}")
     
     # Populate database
-    populator.populate_database(args.max_words, args.max_workers)
+    populator.populate_database(args.max_words, args.max_workers, args.requests_per_second,
+                                resume=args.resume, max_attempts=args.max_attempts)
     
     # Show final stats
     final_stats = populator.get_database_stats()
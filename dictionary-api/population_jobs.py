@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Population Job Checkpoints
+Records the candidate words and per-word progress of each population run in
+the dictionary database, so interrupted runs can resume where they stopped
+"""
+
+import sqlite3
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Word states
+PENDING = 'pending'
+FETCHED = 'fetched'
+FAILED = 'failed'
+
+
+class PopulationJobs:
+    """
+    Job and word state for population runs.
+
+    ``population_jobs`` holds one row per run; ``population_job_words`` holds
+    each candidate word with its position, state and attempt count. The
+    dictionary table stays the source of truth: remaining work is always
+    computed as the job's words minus the words already stored, so a crash
+    between storing words and checkpointing them loses nothing.
+    """
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self.init_tables()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.database_path)
+
+    def init_tables(self):
+        """Create the job tables if they do not exist"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS population_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                status TEXT NOT NULL DEFAULT 'running',
+                total_words INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS population_job_words (
+                job_id INTEGER NOT NULL,
+                word TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                PRIMARY KEY (job_id, word)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_population_job_words_state
+            ON population_job_words(job_id, state, position)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def create_job(self, words: Iterable[str]) -> int:
+        """Record a new run and its candidate words in processing order"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('INSERT INTO population_jobs DEFAULT VALUES')
+        job_id = cursor.lastrowid
+        cursor.executemany(
+            'INSERT OR IGNORE INTO population_job_words(job_id, word, position) VALUES (?, ?, ?)',
+            ((job_id, word, position) for position, word in enumerate(words))
+        )
+        cursor.execute('''
+            UPDATE population_jobs
+            SET total_words = (SELECT COUNT(*) FROM population_job_words WHERE job_id = ?)
+            WHERE id = ?
+        ''', (job_id, job_id))
+
+        conn.commit()
+        conn.close()
+        return job_id
+
+    def latest_unfinished_job(self) -> Optional[int]:
+        """Most recent run that did not complete, if any"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM population_jobs WHERE status != 'completed' ORDER BY id DESC LIMIT 1")
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def remaining_words(self, job_id: int, max_attempts: int = 3) -> List[str]:
+        """
+        Words of a job that still need fetching, in order.
+
+        Words already in the dictionary (stored by this run before it was
+        interrupted, or by anyone else) are checkpointed as fetched first, in
+        one set-based UPDATE rather than a lookup per word.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE population_job_words SET state = 'fetched'
+            WHERE job_id = ? AND state != 'fetched'
+              AND word IN (SELECT word_lowercase FROM dictionary)
+        ''', (job_id,))
+        cursor.execute('''
+            SELECT word FROM population_job_words
+            WHERE job_id = ? AND state != 'fetched' AND attempts < ?
+            ORDER BY position
+        ''', (job_id, max_attempts))
+        words = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("UPDATE population_jobs SET status = 'running', updated_at = CURRENT_TIMESTAMP "
+                       "WHERE id = ?", (job_id,))
+        conn.commit()
+        conn.close()
+        return words
+
+    def record_results(self, job_id: int, fetched: Iterable[str],
+                       failed: Iterable[Tuple[str, str]] = ()):
+        """Checkpoint a batch: stored words and (word, error) failures"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            UPDATE population_job_words
+            SET state = 'fetched', attempts = attempts + 1, last_error = NULL
+            WHERE job_id = ? AND word = ?
+        ''', ((job_id, word) for word in fetched))
+        cursor.executemany('''
+            UPDATE population_job_words
+            SET state = 'failed', attempts = attempts + 1, last_error = ?
+            WHERE job_id = ? AND word = ?
+        ''', ((error, job_id, word) for word, error in failed))
+        cursor.execute('UPDATE population_jobs SET updated_at = CURRENT_TIMESTAMP WHERE id = ?', (job_id,))
+
+        conn.commit()
+        conn.close()
+
+    def finish_job(self, job_id: int, status: str = 'completed'):
+        """Mark a run completed (or interrupted)"""
+        conn = self._connect()
+        conn.execute('UPDATE population_jobs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                     (status, job_id))
+        conn.commit()
+        conn.close()
+
+    def progress(self, job_id: int) -> Dict:
+        """Word counts by state, plus how many retries the run has needed"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT status, total_words FROM population_jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        progress = {'job_id': job_id, 'status': row[0] if row else None,
+                    'total_words': row[1] if row else 0,
+                    PENDING: 0, FETCHED: 0, FAILED: 0}
+
+        cursor.execute('''
+            SELECT state, COUNT(*), SUM(MAX(attempts - 1, 0))
+            FROM population_job_words WHERE job_id = ? GROUP BY state
+        ''', (job_id,))
+        retries = 0
+        for state, count, state_retries in cursor.fetchall():
+            progress[state] = count
+            retries += state_retries or 0
+        progress['retries'] = retries
+
+        conn.close()
+        return progress
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Random Word Sampler
+Draws random dictionary rows from compact per-filter id arrays instead of
+sorting the whole table with ORDER BY RANDOM()
+"""
+
+import bisect
+import random
+import threading
+import time
+import logging
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+BucketKey = Tuple
+
+
+class RandomSampler:
+    """
+    Random sampling over filter buckets of row ids.
+
+    Rows that pass ``where`` are grouped by the values of ``bucket_columns``
+    (for example difficulty level and is_common) into sorted ``array('q')``
+    id lists. A request names the bucket values it wants (``None`` meaning
+    any value); ``sample`` treats the matching buckets as one virtual array
+    and picks distinct positions, so a draw costs O(count) regardless of
+    table size. Callers then fetch just those ids by primary key.
+    """
+
+    def __init__(self, bucket_columns: Iterable[str] = (), where: str = '1'):
+        self.bucket_columns = tuple(bucket_columns)
+        self.where = where
+
+        self._buckets: Dict[BucketKey, array] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+        self.build_seconds = 0.0
+        self.updates = 0
+
+    def _select(self) -> str:
+        columns = ''.join(f', {column}' for column in self.bucket_columns)
+        return f'SELECT id{columns} FROM dictionary WHERE ({self.where})'
+
+    def load(self, conn):
+        """(Re)build every bucket from the dictionary table"""
+        start = time.perf_counter()
+        buckets = {}
+        cursor = conn.cursor()
+        cursor.execute(self._select() + ' ORDER BY id')
+        for row in cursor:
+            key = tuple(row[1:])
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = array('q')
+            bucket.append(row[0])
+
+        with self._lock:
+            self._buckets = buckets
+
+        self.build_seconds = time.perf_counter() - start
+        logger.info(f"Random sampler built: {self.size()} ids in {len(buckets)} buckets "
+                    f"in {self.build_seconds:.2f}s")
+
+    def refresh(self, conn, word_ids: Iterable[int]):
+        """Re-read the given row ids and move them to their current bucket"""
+        word_ids = sorted(set(word_ids))
+        if not word_ids:
+            return
+
+        current = {}
+        cursor = conn.cursor()
+        for start in range(0, len(word_ids), 500):
+            chunk = word_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(self._select() + f' AND id IN ({placeholders})', chunk)
+            for row in cursor.fetchall():
+                current[row[0]] = tuple(row[1:])
+
+        with self._lock:
+            for word_id in word_ids:
+                self._remove(word_id)
+                key = current.get(word_id)
+                if key is not None:
+                    bucket = self._buckets.get(key)
+                    if bucket is None:
+                        bucket = self._buckets[key] = array('q')
+                    bucket.insert(bisect.bisect_left(bucket, word_id), word_id)
+            self.updates += len(word_ids)
+
+    def _remove(self, word_id: int):
+        """Remove an id from whichever bucket holds it (lock held)"""
+        for bucket in self._buckets.values():
+            index = bisect.bisect_left(bucket, word_id)
+            if index < len(bucket) and bucket[index] == word_id:
+                del bucket[index]
+                return
+
+    def _matching(self, filters: Tuple) -> List[array]:
+        return [
+            bucket for key, bucket in self._buckets.items()
+            if bucket and all(want is None or have == want for have, want in zip(key, filters))
+        ]
+
+    def sample(self, count: int, *filters) -> List[int]:
+        """
+        Draw up to ``count`` distinct ids from the buckets matching
+        ``filters`` (one value or None per bucket column, in order).
+        """
+        filters = tuple(filters) + (None,) * (len(self.bucket_columns) - len(filters))
+
+        with self._lock:
+            buckets = self._matching(filters)
+            offsets = []
+            total = 0
+            for bucket in buckets:
+                offsets.append(total)
+                total += len(bucket)
+
+            if total == 0:
+                return []
+
+            positions = self._random.sample(range(total), min(count, total))
+            ids = []
+            for position in positions:
+                index = bisect.bisect_right(offsets, position) - 1
+                ids.append(buckets[index][position - offsets[index]])
+            return ids
+
+    def size(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def stats(self) -> Dict:
+        """Get bucket sizes and build information"""
+        return {
+            'ids': self.size(),
+            'buckets': len(self._buckets),
+            'build_seconds': round(self.build_seconds, 3),
+            'updates': self.updates
+        }
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+API Rate Limiter
+Sliding-window counters with a fixed footprint per client, kept in process
+memory or in a SQLite file shared by every worker process
+"""
+
+import math
+import threading
+import time
+import logging
+from collections import namedtuple
+from typing import Dict, Tuple
+
+from connection_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'remaining', 'retry_after'])
+
+# Per-client state: (window index, requests in that window, requests in the one before)
+WindowState = Tuple[int, int, int]
+
+
+def sliding_window(state: WindowState, now: float, max_requests: int,
+                   window: int) -> Tuple[RateLimitResult, WindowState]:
+    """
+    Apply one request to a sliding-window counter.
+
+    The request rate is estimated as the count of the current fixed window
+    plus the previous window's count weighted by how much of it still
+    overlaps the sliding window. That needs two integers per client instead
+    of one timestamp per request. Rejected requests are not counted.
+    """
+    index = int(now // window)
+    state_index, current, previous = state
+    if state_index != index:
+        previous = current if state_index == index - 1 else 0
+        current = 0
+
+    elapsed = (now % window) / window
+    estimate = previous * (1 - elapsed) + current
+
+    if estimate + 1 > max_requests:
+        if current + 1 > max_requests or not previous:
+            wait = window * (1 - elapsed)
+        else:
+            # Time until the previous window's weight falls far enough
+            wait = window * (1 - (max_requests - 1 - current) / previous) - window * elapsed
+        return RateLimitResult(False, 0, max(1, math.ceil(wait))), (index, current, previous)
+
+    current += 1
+    remaining = max(0, int(max_requests - estimate - 1))
+    return RateLimitResult(True, remaining, 0), (index, current, previous)
+
+
+class MemoryRateLimiter:
+    """
+    Per-process limiter keeping one ``WindowState`` tuple per client.
+
+    Clients idle for two full windows carry no information any more and are
+    dropped by a background sweep every ``evict_interval`` seconds.
+    """
+
+    backend = 'memory'
+
+    def __init__(self, evict_interval: float = 60.0):
+        self.evict_interval = evict_interval
+
+        self._clients: Dict[Tuple[int, str], WindowState] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._stats = {'allowed': 0, 'rejected': 0, 'evicted': 0}
+
+        self._sweeper = threading.Thread(target=self._sweep_loop, name='rate-limit-evict', daemon=True)
+        self._sweeper.start()
+
+    def hit(self, client: str, max_requests: int, window: int) -> RateLimitResult:
+        """Record a request from ``client`` if it is within the limit"""
+        key = (window, client)
+        now = time.time()
+        with self._lock:
+            result, state = sliding_window(self._clients.get(key, (0, 0, 0)), now, max_requests, window)
+            self._clients[key] = state
+            self._stats['allowed' if result.allowed else 'rejected'] += 1
+        return result
+
+    def evict_idle(self) -> int:
+        """Drop clients whose counters have fully expired"""
+        now = time.time()
+        with self._lock:
+            idle = [
+                key for key, (index, _, _) in self._clients.items()
+                if index < int(now // key[0]) - 1
+            ]
+            for key in idle:
+                del self._clients[key]
+            self._stats['evicted'] += len(idle)
+        return len(idle)
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.evict_interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"Rate limiter eviction failed: {e}")
+
+    def close(self):
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        """Get limiter counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['clients'] = len(self._clients)
+        stats['backend'] = self.backend
+        return stats
+
+
+class SQLiteRateLimiter(MemoryRateLimiter):
+    """
+    Limiter whose counters live in a small SQLite database, so every worker
+    process pointed at the same file enforces one shared limit.
+
+    Each request is one short ``BEGIN IMMEDIATE`` transaction on a single
+    WITHOUT ROWID row. The file is kept apart from the dictionary database so
+    these writes never contend with dictionary writers.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, database_path: str, evict_interval: float = 60.0):
+        self.pool = ConnectionPool(database_path, cache_size_kb=2048, mmap_size=0)
+        with self.pool.writer() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    client TEXT NOT NULL,
+                    window INTEGER NOT NULL,
+                    window_index INTEGER NOT NULL,
+                    current INTEGER NOT NULL,
+                    previous INTEGER NOT NULL,
+                    PRIMARY KEY (client, window)
+                ) WITHOUT ROWID
+            ''')
+        super().__init__(evict_interval)
+
+    def hit(self, client: str, max_requests: int, window: int) -> RateLimitResult:
+        """Record a request from ``client`` if it is within the shared limit"""
+        now = time.time()
+        with self.pool.writer() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT window_index, current, previous FROM rate_limits WHERE client = ? AND window = ?',
+                (client, window)
+            ).fetchone()
+            result, state = sliding_window(tuple(row) if row else (0, 0, 0), now, max_requests, window)
+            if result.allowed or row is None or state[0] != row[0]:
+                conn.execute('''
+                    INSERT INTO rate_limits(client, window, window_index, current, previous)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(client, window) DO UPDATE SET
+                        window_index = excluded.window_index,
+                        current = excluded.current,
+                        previous = excluded.previous
+                ''', (client, window) + state)
+
+        with self._lock:
+            self._stats['allowed' if result.allowed else 'rejected'] += 1
+        return result
+
+    def evict_idle(self) -> int:
+        """Delete rows whose counters have fully expired"""
+        now = time.time()
+        with self.pool.writer() as conn:
+            evicted = conn.execute(
+                'DELETE FROM rate_limits WHERE window_index < CAST(? / window AS INTEGER) - 1',
+                (now,)
+            ).rowcount
+        with self._lock:
+            self._stats['evicted'] += evicted
+        return evicted
+
+    def close(self):
+        super().close()
+        self.pool.close()
+
+    def stats(self) -> Dict:
+        """Get limiter counters, including clients tracked by all workers"""
+        stats = super().stats()
+        stats['clients'] = self.pool.reader().execute('SELECT COUNT(*) FROM rate_limits').fetchone()[0]
+        return stats
+
+
+def create_rate_limiter(backend: str = 'memory', database_path: str = 'rate_limits.db',
+                        evict_interval: float = 60.0):
+    """Build the limiter for a backend name ('memory' or 'sqlite')"""
+    if backend == 'sqlite':
+        return SQLiteRateLimiter(database_path, evict_interval)
+    if backend != 'memory':
+        logger.warning(f"Unknown rate limit backend {backend!r}, using memory")
+    return MemoryRateLimiter(evict_interval)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Spelling Suggestions
+SymSpell-style deletion index over the dictionary's words, for "did you
+mean" candidates within a bounded edit distance of a misspelled lookup
+"""
+
+import heapq
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+from dictionary_schema import table_columns
+
+logger = logging.getLogger(__name__)
+
+# Rank tuples sort ascending: common words first, then by frequency rank
+Rank = Tuple[int, int]
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Damerau-Levenshtein (optimal string alignment) distance between ``a``
+    and ``b``, or ``max_distance + 1`` as soon as it is known to exceed
+    ``max_distance``.
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    # Typos rarely touch the ends of a word; only the differing middle needs a table
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        distance = len(a) or len(b)
+        return distance if distance <= max_distance else max_distance + 1
+
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        current = [i] + [0] * len(b)
+        row_best = i
+        for j in range(1, len(b) + 1):
+            char_b = b[j - 1]
+            value = previous[j - 1] + (char_a != char_b)
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                if before_previous[j - 2] + 1 < value:
+                    value = before_previous[j - 2] + 1
+            current[j] = value
+            if value < row_best:
+                row_best = value
+        if row_best > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+class SpellingIndex:
+    """
+    Fuzzy word lookup by symmetric deletion (SymSpell).
+
+    Every word's first ``prefix_length`` characters, and every string made
+    by deleting up to ``max_distance`` characters from them, map back to the
+    word. A misspelling generates its own deletes the same way; any word
+    sharing one is a candidate, and only those candidates have their edit
+    distance computed. Lookups never scan the dictionary, and the prefix
+    bound keeps the index size independent of word length.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        # delete -> word, or a list of words when several share it
+        self._deletes: Dict[str, object] = {}
+        self._ranks: Dict[str, Rank] = {}
+        self._lock = threading.Lock()
+
+        self.build_seconds = 0.0
+        self.updates = 0
+
+    @staticmethod
+    def _select(cursor) -> str:
+        """SELECT list for (word, rank fields), tolerant of older schemas"""
+        columns = table_columns(cursor)
+        is_common = 'COALESCE(is_common, 0)' if 'is_common' in columns else '0'
+        frequency_rank = 'COALESCE(frequency_rank, 999999)' if 'frequency_rank' in columns else '999999'
+        return f'SELECT lower(word), {is_common}, {frequency_rank} FROM dictionary'
+
+    def _edit_levels(self, word: str) -> List[Set[str]]:
+        """The word's prefix, then the strings made by deleting 1, 2... characters from it"""
+        levels = [{word[:self.prefix_length]}]
+        for _ in range(self.max_distance):
+            levels.append({edit[:i] + edit[i + 1:] for edit in levels[-1] for i in range(len(edit))})
+        return levels
+
+    def _edits(self, word: str) -> Set[str]:
+        """Every string the word is indexed under"""
+        return set().union(*self._edit_levels(word))
+
+    def _add(self, word: str):
+        """Index a word's deletes (lock held or index not yet published)"""
+        deletes = self._deletes
+        for edit in self._edits(word):
+            entry = deletes.get(edit)
+            if entry is None:
+                deletes[edit] = word
+            elif type(entry) is str:
+                deletes[edit] = [entry, word]
+            else:
+                entry.append(word)
+
+    def _remove(self, word: str):
+        """Drop a word's deletes (lock held)"""
+        deletes = self._deletes
+        for edit in self._edits(word):
+            entry = deletes.get(edit)
+            if entry == word:
+                del deletes[edit]
+            elif type(entry) is list and word in entry:
+                entry.remove(word)
+                if len(entry) == 1:
+                    deletes[edit] = entry[0]
+
+    def load(self, conn):
+        """(Re)build the whole index from the dictionary table"""
+        start = time.perf_counter()
+        cursor = conn.cursor()
+        cursor.execute(self._select(cursor))
+
+        index = SpellingIndex(self.max_distance, self.prefix_length)
+        for word, is_common, frequency_rank in cursor:
+            if word not in index._ranks:
+                index._add(word)
+            index._ranks[word] = (0 if is_common else 1, frequency_rank)
+
+        with self._lock:
+            self._deletes, self._ranks = index._deletes, index._ranks
+
+        self.build_seconds = time.perf_counter() - start
+        logger.info(f"Spelling index built: {len(self._ranks)} words, {len(self._deletes)} deletes "
+                    f"in {self.build_seconds:.2f}s")
+
+    def refresh(self, conn, changes: Iterable):
+        """Re-read changed rows (``Change`` tuples) and update the index"""
+        changes = list(changes)
+        if not changes:
+            return
+
+        words = {change.word for change in changes}
+        word_ids = list({change.word_id for change in changes})
+
+        cursor = conn.cursor()
+        select = self._select(cursor)
+        current = {}
+        for start in range(0, len(word_ids), 500):
+            chunk = word_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'{select} WHERE id IN ({placeholders})', chunk)
+            for word, is_common, frequency_rank in cursor.fetchall():
+                current[word] = (0 if is_common else 1, frequency_rank)
+        words.update(current)
+
+        with self._lock:
+            for word in words:
+                present = word in self._ranks
+                if word in current:
+                    if not present:
+                        self._add(word)
+                    self._ranks[word] = current[word]
+                elif present:
+                    self._remove(word)
+                    del self._ranks[word]
+            self.updates += len(words)
+
+    def suggest(self, word: str, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Get up to ``limit`` (word, distance) pairs at the smallest edit
+        distance (up to max_distance) at which any word is found, common and
+        frequent words first.
+
+        Most misspellings are one edit away, so the one-edit search runs
+        first; the wider search, which verifies far more candidates, only
+        runs when it finds nothing.
+        """
+        word = word.lower()
+        with self._lock:
+            for max_distance in range(1, self.max_distance + 1):
+                matches = self._search(word, max_distance, limit)
+                if matches:
+                    return matches
+        return []
+
+    def _search(self, word: str, max_distance: int, limit: int) -> List[Tuple[str, int]]:
+        """Best ``limit`` words within ``max_distance`` edits (lock held)"""
+        seen = {word}
+        found = []
+        # A word d edits away shares a delete with the query by level d
+        for edits in self._edit_levels(word)[:max_distance + 1]:
+            for edit in edits:
+                entry = self._deletes.get(edit)
+                if entry is None:
+                    continue
+                for candidate in ((entry,) if type(entry) is str else entry):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    distance = edit_distance(word, candidate, max_distance)
+                    if distance <= max_distance:
+                        found.append((distance, self._ranks[candidate], candidate))
+
+        best = heapq.nsmallest(limit, found)
+        return [(candidate, distance) for distance, _, candidate in best]
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def stats(self) -> Dict:
+        """Get index size and build information"""
+        return {
+            'words': len(self._ranks),
+            'deletes': len(self._deletes),
+            'max_distance': self.max_distance,
+            'prefix_length': self.prefix_length,
+            'build_seconds': round(self.build_seconds, 3),
+            'updates': self.updates
+        }
+
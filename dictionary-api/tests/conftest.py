@@ -0,0 +1,60 @@
+"""
+Shared fixtures: a fresh EnhancedDictionaryAPI on a temporary database per
+test, and a helper that stores words the way the populators do
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+
+# enhanced_api builds its module-level instance on import; keep it off the real database
+_import_dir = tempfile.mkdtemp(prefix='dictionary-api-tests-')
+os.environ['DATABASE_PATH'] = os.path.join(_import_dir, 'dictionary.db')
+os.environ['RATE_LIMIT_DB'] = os.path.join(_import_dir, 'rate_limits.db')
+
+import enhanced_api  # noqa: E402
+from word_signatures import word_signatures  # noqa: E402
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """An EnhancedDictionaryAPI on an empty database, also serving the Flask routes"""
+    monkeypatch.setattr(enhanced_api, 'DATABASE_PATH', str(tmp_path / 'dictionary.db'))
+    instance = enhanced_api.EnhancedDictionaryAPI()
+    monkeypatch.setattr(enhanced_api, 'dictionary_api', instance)
+    yield instance
+    instance.rate_limiter.close()
+    instance.pool.close()
+
+
+@pytest.fixture
+def client(api):
+    return enhanced_api.app.test_client()
+
+
+@pytest.fixture
+def add_words(api):
+    """Store word rows (dicts of column values) and let the in-memory indexes catch up"""
+    def add(*rows):
+        with api.pool.writer() as conn:
+            for row in rows:
+                values = {
+                    'word_lowercase': row['word'].lower(),
+                    'definitions': json.dumps([f"Meaning of {row['word']}"]),
+                    'part_of_speech': 'noun',
+                    'word_length': len(row['word']),
+                    **word_signatures(row['word']),
+                    **row
+                }
+                columns = ', '.join(values)
+                placeholders = ', '.join('?' * len(values))
+                conn.execute(f'INSERT INTO dictionary ({columns}) VALUES ({placeholders})',
+                             list(values.values()))
+        api.change_feed.poll(force=True)
+    return add
@@ -0,0 +1,45 @@
+"""Anagram lookups through the letters_sorted signature"""
+
+from word_signatures import backfill_signatures, letters_sorted
+
+
+def test_signature_ignores_case_and_punctuation():
+    assert letters_sorted('Listen') == 'eilnst'
+    assert letters_sorted("o'clock") == letters_sorted('cloc-ko') == 'cckloo'
+    assert letters_sorted('silent') == letters_sorted('enlist')
+    assert letters_sorted('-') == ''
+
+
+def test_exact_anagrams_most_frequent_first(api, add_words):
+    add_words(
+        {'word': 'enlist', 'frequency_rank': 300},
+        {'word': 'listen', 'frequency_rank': 100},
+        {'word': 'silent', 'frequency_rank': 200},
+        {'word': 'tinsel', 'frequency_rank': 200},
+        # One letter short or extra is not an anagram
+        {'word': 'lines'},
+        {'word': 'glisten'}
+    )
+
+    assert api.find_anagrams('NETSIL') == ['listen', 'silent', 'tinsel', 'enlist']
+    assert api.find_anagrams('netsil', limit=2) == ['listen', 'silent']
+    assert api.find_anagrams('xyz') == []
+
+
+def test_backfill_fills_rows_stored_without_signatures(api, add_words):
+    add_words({'word': 'stone', 'letters_sorted': None, 'letter_pattern': None},
+              {'word': 'notes', 'letters_sorted': None, 'letter_pattern': None})
+    assert api.find_anagrams('onset') == []
+
+    with api.pool.writer() as conn:
+        assert backfill_signatures(conn.cursor()) == 2
+        assert backfill_signatures(conn.cursor()) == 0
+
+    assert sorted(api.find_anagrams('onset')) == ['notes', 'stone']
+
+
+def test_route_requires_letters(client, add_words):
+    add_words({'word': 'cat'}, {'word': 'act'})
+
+    assert sorted(client.get('/api/anagrams?letters=tac').get_json()['data']['words']) == ['act', 'cat']
+    assert client.get("/api/anagrams?letters=-'").status_code == 400
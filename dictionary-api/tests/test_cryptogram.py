@@ -0,0 +1,38 @@
+"""Cryptogram candidates through the letter_pattern signature"""
+
+from word_signatures import letter_pattern
+
+
+def test_signature_numbers_letters_by_first_appearance():
+    assert letter_pattern('letter') == 'ABCCBD'
+    assert letter_pattern('XQZZQW') == 'ABCCBD'
+    assert letter_pattern('ABCCBD') == 'ABCCBD'
+    assert letter_pattern("don't") == "ABC'D"
+    assert letter_pattern('re-read') == 'AB-ABCD'
+
+
+def test_candidates_share_the_repetition_pattern(api, add_words):
+    add_words(
+        {'word': 'letter', 'is_common': 1, 'frequency_rank': 200},
+        {'word': 'better', 'is_common': 1, 'frequency_rank': 100},
+        {'word': 'lessen', 'is_common': 1, 'frequency_rank': 50},
+        {'word': 'setter', 'is_common': 0, 'frequency_rank': 1},
+        # Same length, different repetitions
+        {'word': 'butter', 'is_common': 1, 'frequency_rank': 10},
+        {'word': 'kitten', 'is_common': 1, 'frequency_rank': 10}
+    )
+
+    # Enciphered words and signatures find the same words, common ones first
+    assert api.cryptogram_candidates('XQZZQW') == ['lessen', 'better', 'letter', 'setter']
+    assert api.cryptogram_candidates('ABCCBD', common_only=True) == ['lessen', 'better', 'letter']
+    assert api.cryptogram_candidates('abccbd', limit=1) == ['lessen']
+    assert api.cryptogram_candidates('AAB') == []
+
+
+def test_route_reports_the_pattern(client, add_words):
+    add_words({'word': 'noon'}, {'word': 'deed'})
+
+    data = client.get('/api/cryptogram/candidates?pattern=XYYX').get_json()['data']
+    assert data['pattern'] == 'ABBA'
+    assert sorted(data['words']) == ['deed', 'noon']
+    assert client.get('/api/cryptogram/candidates?pattern=--').status_code == 400
@@ -0,0 +1,85 @@
+"""Keyset pagination: walking every page returns exactly the unpaginated order"""
+
+import itertools
+
+import pytest
+
+from pagination import InvalidCursor
+
+
+@pytest.fixture
+def words(add_words):
+    # Every combination of NULL / zero / set ranking keys, several words each
+    rows = []
+    for n, (is_common, usage_frequency) in enumerate(
+            itertools.product((None, 0, 1), (None, 0, 5, 10))):
+        for suffix in ('a', 'b', 'c', 'd', 'e'):
+            rows.append({'word': f'stab{n:02d}{suffix}', 'is_common': is_common,
+                         'usage_frequency': usage_frequency})
+    add_words(*rows)
+    return rows
+
+
+def walk(fetch, limit):
+    """Concatenate every page of a paginated method"""
+    results, cursor = fetch(limit, None)
+    pages = 1
+    while cursor:
+        page, cursor = fetch(limit, cursor)
+        results.extend(page)
+        pages += 1
+    return results, pages
+
+
+def test_criteria_walk_matches_order_by_with_null_keys(api, words):
+    with api.pool.writer() as conn:
+        expected = [row[0] for row in conn.execute('''
+            SELECT word FROM dictionary
+            ORDER BY COALESCE(is_common, 0) DESC, COALESCE(usage_frequency, 0) DESC, word
+        ''')]
+
+    results, pages = walk(
+        lambda limit, cursor: api.get_words_by_criteria(part_of_speech='noun', limit=limit, cursor=cursor),
+        limit=7
+    )
+
+    assert [result['word'] for result in results] == expected
+    assert pages == -(-len(expected) // 7)
+
+
+def test_search_walk_matches_single_page(api, words):
+    # 'stab' uses the trigram index where available, 'ab' the LIKE scan
+    for pattern in ('stab', 'ab'):
+        everything, cursor = api.search_words(pattern, limit=1000)
+        assert cursor is None
+        assert len(everything) == len(words)
+
+        results, _ = walk(lambda limit, cursor: api.search_words(pattern, limit, cursor=cursor), limit=4)
+        assert results == everything
+
+
+def test_full_text_walk_matches_single_page(api, words):
+    everything, _ = api.full_text_search('meaning', limit=1000)
+    results, pages = walk(lambda limit, cursor: api.full_text_search('meaning', limit, cursor), limit=9)
+
+    assert [result['word'] for result in results] == [result['word'] for result in everything]
+    assert len(results) == len(words)
+    assert pages > 1
+
+
+def test_cursor_is_bound_to_its_query(api, words):
+    _, cursor = api.search_words('stab', limit=2)
+
+    with pytest.raises(InvalidCursor):
+        api.search_words('ab', limit=2, cursor=cursor)
+    with pytest.raises(InvalidCursor):
+        api.get_words_by_criteria(limit=2, cursor=cursor)
+
+
+def test_route_follows_next_cursor_and_rejects_bad_ones(client, words):
+    first = client.get('/api/words/criteria?limit=10').get_json()['data']
+    second = client.get(f"/api/words/criteria?limit=10&cursor={first['next_cursor']}").get_json()['data']
+
+    assert second['count'] == 10
+    assert not {word['word'] for word in first['words']} & {word['word'] for word in second['words']}
+    assert client.get('/api/words/criteria?cursor=garbage').status_code == 400
@@ -0,0 +1,68 @@
+"""Hangman-style positional matching in PatternIndex"""
+
+import sqlite3
+
+import pytest
+
+from change_feed import Change
+from pattern_index import PatternIndex
+
+WORDS = [
+    # word, is_common, frequency_rank
+    ('cat', 1, 50), ('cot', 1, 20), ('cut', 0, 10), ('ctt', 0, 5), ('cct', 0, 5),
+    ('act', 1, 30), ('tact', 1, 40), ('that', 0, 60), ('Hello', 1, 1), ("it's", 1, 1),
+]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE dictionary (id INTEGER PRIMARY KEY, word TEXT, is_common BOOLEAN, '
+                 'frequency_rank INTEGER)')
+    conn.executemany('INSERT INTO dictionary (word, is_common, frequency_rank) VALUES (?, ?, ?)', WORDS)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def index(conn):
+    index = PatternIndex()
+    index.load(conn)
+    return index
+
+
+def test_fixed_letters_in_rank_order(index):
+    # Common words first, then by frequency rank
+    assert index.match('c_t', hangman=False) == (['cot', 'cat', 'cct', 'ctt', 'cut'], 5)
+    assert index.match('C_T', limit=2, hangman=False) == (['cot', 'cat'], 5)
+    assert index.match('___') == index.match('___', hangman=False)
+
+
+def test_revealed_letters_cannot_hide_behind_blanks(index):
+    # c and t are revealed, so every c and t in the word is already showing
+    assert index.match('c_t') == (['cot', 'cat', 'cut'], 3)
+    assert index.match('t___') == ([], 0)
+    assert index.match('t___', hangman=False) == (['tact', 'that'], 2)
+
+
+def test_excluded_letters(index):
+    assert index.match('c_t', exclude='ou') == (['cat'], 1)
+    assert index.match('___', exclude='c') == ([], 0)
+    assert index.match('____', exclude='xyz') == (['tact', 'that'], 2)
+
+
+def test_only_plain_words_are_indexed(index):
+    assert index.match('hello') == (['hello'], 1)
+    assert len(index) == len(WORDS) - 1
+    assert index.match('_______') == ([], 0)
+
+
+def test_refresh_applies_inserts_updates_and_deletes(conn, index):
+    conn.execute("INSERT INTO dictionary (id, word, is_common, frequency_rank) VALUES (100, 'cit', 1, 1)")
+    conn.execute("UPDATE dictionary SET word = 'cap' WHERE word = 'cot'")
+    conn.execute("DELETE FROM dictionary WHERE word = 'cut'")
+    cot_id = conn.execute("SELECT id FROM dictionary WHERE word = 'cap'").fetchone()[0]
+    index.refresh(conn, [Change(100, 'cit'), Change(cot_id, 'cot'), Change(cot_id, 'cap'), Change(3, 'cut')])
+
+    assert index.match('c_t') == (['cit', 'cat'], 2)
+    assert index.match('ca_') == (['cap', 'cat'], 2)
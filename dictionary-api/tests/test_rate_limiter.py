@@ -0,0 +1,89 @@
+"""Sliding-window rate limiting: allow/deny decisions, retry_after and eviction"""
+
+import enhanced_api
+import rate_limiter
+from rate_limiter import MemoryRateLimiter, SQLiteRateLimiter, sliding_window
+
+WINDOW = 60
+
+
+def run(state, now, count, max_requests=10):
+    """Apply ``count`` requests at time ``now``; returns the results and final state"""
+    results = []
+    for _ in range(count):
+        result, state = sliding_window(state, now, max_requests, WINDOW)
+        results.append(result)
+    return results, state
+
+
+def test_allows_up_to_the_limit_then_denies():
+    results, state = run((0, 0, 0), now=600.0, count=11)
+
+    assert [result.allowed for result in results] == [True] * 10 + [False]
+    assert [result.remaining for result in results[:10]] == list(range(9, -1, -1))
+    # Nothing in the previous window: wait for this one to end
+    assert results[-1].retry_after == WINDOW
+    # Rejected requests are not counted
+    assert state == (10, 10, 0)
+
+
+def test_previous_window_is_weighted_by_overlap():
+    # A full previous window, halfway through the current one: half of it still counts
+    results, state = run((9, 10, 0), now=630.0, count=6)
+
+    assert [result.allowed for result in results] == [True] * 5 + [False]
+    assert state == (10, 5, 10)
+    # The estimate 10 * (1 - elapsed) + 5 drops to 9 at 36s into the window
+    assert results[-1].retry_after == 6
+
+    result, _ = sliding_window(state, 636.5, 10, WINDOW)
+    assert result.allowed
+
+
+def test_idle_windows_reset_the_counts():
+    results, state = run((5, 10, 10), now=630.0, count=10)
+    assert all(result.allowed for result in results)
+    assert state == (10, 10, 0)
+
+
+def test_memory_limiter_tracks_clients_separately_and_evicts_idle_ones(monkeypatch):
+    limiter = MemoryRateLimiter(evict_interval=3600)
+    now = [600.0]
+    monkeypatch.setattr(rate_limiter.time, 'time', lambda: now[0])
+    try:
+        assert all(limiter.hit('a', 2, WINDOW).allowed for _ in range(2))
+        assert not limiter.hit('a', 2, WINDOW).allowed
+        assert limiter.hit('b', 2, WINDOW).allowed
+
+        # One window later the counts still weigh in; two windows later they are gone
+        now[0] += WINDOW
+        assert limiter.evict_idle() == 0
+        now[0] += WINDOW
+        assert limiter.evict_idle() == 2
+
+        stats = limiter.stats()
+        assert (stats['allowed'], stats['rejected'], stats['evicted'], stats['clients']) == (3, 1, 2, 0)
+    finally:
+        limiter.close()
+
+
+def test_sqlite_limiters_share_one_limit(tmp_path):
+    path = str(tmp_path / 'rate_limits.db')
+    first, second = SQLiteRateLimiter(path, 3600), SQLiteRateLimiter(path, 3600)
+    try:
+        decisions = [limiter.hit('client', 4, WINDOW).allowed for limiter in (first, second) * 3]
+        assert decisions == [True] * 4 + [False] * 2
+        assert first.stats()['clients'] == 1
+    finally:
+        first.close()
+        second.close()
+
+
+def test_rejection_sets_retry_after_and_no_store(client):
+    for _ in range(enhanced_api.RATE_LIMIT_REQUESTS):
+        assert client.get('/api/autocomplete?q=a').status_code == 200
+
+    response = client.get('/api/autocomplete?q=a')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.headers['Cache-Control'] == 'no-store'
@@ -0,0 +1,82 @@
+"""SymSpell suggestions at edit distances 1 and 2"""
+
+import sqlite3
+
+import pytest
+
+from change_feed import Change
+from spelling_suggestions import SpellingIndex, edit_distance
+
+WORDS = [
+    # word, is_common, frequency_rank
+    ('receive', 1, 100), ('recipe', 1, 50), ('deceive', 0, 10), ('relieve', 1, 300),
+    ('house', 1, 20), ('horse', 1, 40), ('mouse', 0, 5), ('hose', 1, 60),
+    ('accommodation', 1, 500), ('accumulation', 0, 700),
+]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE dictionary (id INTEGER PRIMARY KEY, word TEXT, is_common BOOLEAN, '
+                 'frequency_rank INTEGER)')
+    conn.executemany('INSERT INTO dictionary (word, is_common, frequency_rank) VALUES (?, ?, ?)', WORDS)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def index(conn):
+    index = SpellingIndex(max_distance=2, prefix_length=7)
+    index.load(conn)
+    return index
+
+
+def test_edit_distance_counts_transpositions_and_stops_at_the_bound():
+    assert edit_distance('house', 'house', 2) == 0
+    assert edit_distance('recieve', 'receive', 2) == 1
+    assert edit_distance('hose', 'house', 2) == 1
+    assert edit_distance('houses', 'house', 2) == 1
+    assert edit_distance('hxuxe', 'house', 2) == 2
+    assert edit_distance('abcdef', 'house', 2) == 3
+    assert edit_distance('a', 'abcd', 2) == 3
+
+
+def test_distance_one_common_words_first(index):
+    # Substitution, deletion, insertion and transposition are each one edit
+    assert index.suggest('hoxse') == [('house', 1), ('horse', 1), ('hose', 1)]
+    assert index.suggest('huse') == [('house', 1), ('hose', 1)]
+    assert index.suggest('hoose') == [('house', 1), ('horse', 1), ('hose', 1)]
+    assert index.suggest('Receve') == [('receive', 1)]
+    assert index.suggest('hoxse', limit=1) == [('house', 1)]
+
+
+def test_distance_two_only_when_nothing_is_one_edit_away(index):
+    assert index.suggest('reseeve') == [('receive', 2), ('relieve', 2)]
+    assert index.suggest('mhxse') == [('hose', 2), ('mouse', 2)]
+    assert index.suggest('zzzzz') == []
+
+
+def test_typos_past_the_indexed_prefix(index):
+    # Only the first 7 letters are indexed; the full words are compared
+    assert index.suggest('accommodatoin') == [('accommodation', 1)]
+    assert index.suggest('accomodation') == [('accommodation', 1)]
+    assert index.suggest('accumulatoins') == [('accumulation', 2)]
+
+
+def test_refresh_adds_and_removes_words(conn, index):
+    conn.execute("INSERT INTO dictionary (id, word, is_common, frequency_rank) VALUES (100, 'horde', 1, 1)")
+    conn.execute("DELETE FROM dictionary WHERE word = 'horse'")
+    index.refresh(conn, [Change(100, 'horde'), Change(6, 'horse')])
+
+    assert index.suggest('hoxse') == [('house', 1), ('hose', 1)]
+    assert index.suggest('horsx') == [('horde', 2), ('house', 2), ('hose', 2)]
+    assert len(index) == len(WORDS)
+
+
+def test_missing_word_response_carries_suggestions(client, add_words):
+    add_words({'word': 'lantern', 'is_common': 1}, {'word': 'pattern'})
+
+    response = client.get('/api/word/lanturn')
+    assert response.status_code == 404
+    assert response.get_json()['suggestions'] == [{'word': 'lantern', 'distance': 1}]
@@ -0,0 +1,60 @@
+"""Trigger-maintained dictionary_stats always equals a full rebuild_stats"""
+
+from dictionary_schema import rebuild_stats
+
+
+def stats_counts(conn):
+    """Non-zero (metric, bucket) counts; triggers leave emptied buckets at 0"""
+    return dict(((metric, bucket), count) for metric, bucket, count in conn.execute(
+        'SELECT metric, bucket, count FROM dictionary_stats WHERE count != 0'
+    ))
+
+
+def assert_matches_rebuild(api):
+    with api.pool.writer() as conn:
+        maintained = stats_counts(conn)
+        rebuild_stats(conn.cursor())
+        assert maintained == stats_counts(conn)
+
+
+def test_insert(api, add_words):
+    add_words(
+        {'word': 'alpha', 'is_common': 1, 'difficulty_level': 1},
+        {'word': 'beta', 'part_of_speech': 'verb', 'difficulty_level': 3},
+        {'word': 'gamma', 'part_of_speech': '', 'definitions': '[]', 'difficulty_level': None},
+        {'word': 'delta', 'word_length': None, 'created_at': '2024-01-31 12:00:00'}
+    )
+    assert_matches_rebuild(api)
+
+    stats = api.get_statistics()
+    assert stats['total_words'] == 4
+    assert stats['words_with_definitions'] == 3
+    assert stats['common_words'] == 1
+    assert stats['by_part_of_speech'] == {'noun': 2, 'verb': 1}
+
+
+def test_update(api, add_words):
+    add_words({'word': 'alpha', 'difficulty_level': 1}, {'word': 'beta', 'is_common': 1})
+    with api.pool.writer() as conn:
+        conn.execute('''
+            UPDATE dictionary SET difficulty_level = 4, part_of_speech = 'adjective',
+                                  definitions = '[]', word_length = 9
+            WHERE word = 'alpha'
+        ''')
+        conn.execute("UPDATE dictionary SET is_common = 0, created_at = '2023-05-01' WHERE word = 'beta'")
+        # Columns the stats do not track leave them alone
+        conn.execute("UPDATE dictionary SET example = 'An example' WHERE word = 'beta'")
+    assert_matches_rebuild(api)
+    assert api.get_statistics()['by_difficulty'][4] == 1
+
+
+def test_delete(api, add_words):
+    add_words({'word': 'alpha'}, {'word': 'beta', 'is_common': 1}, {'word': 'gamma', 'difficulty_level': 2})
+    with api.pool.writer() as conn:
+        conn.execute("DELETE FROM dictionary WHERE word IN ('beta', 'gamma')")
+    assert_matches_rebuild(api)
+
+    stats = api.get_statistics()
+    assert stats['total_words'] == 1
+    assert stats['common_words'] == 0
+    assert 2 not in stats['by_difficulty']
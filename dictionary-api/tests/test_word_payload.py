@@ -0,0 +1,70 @@
+"""Stored /api/word payloads: served as-is, and never served stale"""
+
+import gzip
+import json
+
+import pytest
+
+from word_payload import rebuild_payloads
+
+
+@pytest.fixture
+def stored(api, add_words):
+    add_words({'word': 'lantern', 'example': 'Light the lantern.', 'difficulty_level': 2},
+              {'word': 'harbor', 'difficulty_level': 3})
+    with api.pool.writer() as conn:
+        assert rebuild_payloads(conn.cursor()) == 2
+
+
+def payload(api, word):
+    with api.pool.writer() as conn:
+        return conn.execute('SELECT payload FROM dictionary WHERE word = ?', (word,)).fetchone()[0]
+
+
+def test_payload_is_the_response_body(api, client, stored):
+    response = client.get('/api/word/lantern')
+
+    assert response.get_data() == payload(api, 'lantern')
+    assert response.get_json()['data']['example'] == 'Light the lantern.'
+
+
+def test_content_update_clears_the_payload(api, client, stored):
+    with api.pool.writer() as conn:
+        conn.execute("UPDATE dictionary SET example = 'Carry the lantern.' WHERE word = 'lantern'")
+
+    assert payload(api, 'lantern') is None
+    assert payload(api, 'harbor') is not None
+    # Served from the row columns instead
+    assert client.get('/api/word/lantern').get_json()['data']['example'] == 'Carry the lantern.'
+
+
+def test_update_writing_a_new_payload_keeps_it(api, stored):
+    body = json.dumps({'data': {'word': 'lantern'}, 'success': True}).encode('utf-8')
+    with api.pool.writer() as conn:
+        conn.execute("UPDATE dictionary SET difficulty_level = 4, payload = ? WHERE word = 'lantern'", (body,))
+
+    assert payload(api, 'lantern') == body
+
+
+def test_untracked_column_update_keeps_the_payload(api, stored):
+    before = payload(api, 'lantern')
+    with api.pool.writer() as conn:
+        conn.execute("UPDATE dictionary SET usage_frequency = 50 WHERE word = 'lantern'")
+        # Rewriting a column with its current value changes nothing either
+        conn.execute("UPDATE dictionary SET difficulty_level = 2 WHERE word = 'lantern'")
+
+    assert payload(api, 'lantern') == before
+
+
+def test_compressed_payload_is_sent_to_gzip_clients(api, client, stored):
+    with api.pool.writer() as conn:
+        rebuild_payloads(conn.cursor(), compress=True, words=['LANTERN'])
+    stored_payload = payload(api, 'lantern')
+    assert stored_payload[:2] == b'\x1f\x8b'
+
+    gzipped = client.get('/api/word/lantern', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzipped.get_data() == stored_payload
+
+    plain = client.get('/api/word/lantern', headers={'Accept-Encoding': 'identity'})
+    assert plain.get_data() == gzip.decompress(stored_payload)
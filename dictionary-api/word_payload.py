@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Pre-serialized Word Payloads
+Ready-to-send ``/api/word`` response bodies stored in the dictionary table's
+``payload`` column, so lookups skip the row -> dict -> JSON round trip
+"""
+
+import gzip
+import json
+import hashlib
+import sqlite3
+import logging
+from collections import namedtuple
+from typing import Dict, Iterable, Mapping, Optional
+
+from dictionary_schema import PAYLOAD_SOURCE_COLUMNS, table_columns
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Rows re-serialized per statement by rebuild_payloads
+REBUILD_BATCH = 5000
+
+
+def word_data(row: Mapping) -> Dict:
+    """
+    Build the word definition dict served by the APIs from a dictionary row
+    (a sqlite3.Row or dict). Difficulty and commonness are included when the
+    schema has them.
+    """
+    keys = row.keys()
+    data = {
+        'word': row['word'],
+        'definitions': json.loads(row['definitions']) if row['definitions'] else [],
+        'phonetic': row['phonetic'] or '',
+        'part_of_speech': row['part_of_speech'] or '',
+        'example': row['example'] or '',
+        'etymology': row['etymology'] or ''
+    }
+    if 'difficulty_level' in keys:
+        data['difficulty_level'] = row['difficulty_level']
+    if 'is_common' in keys:
+        data['is_common'] = bool(row['is_common'])
+    return data
+
+
+def encode_payload(data: Dict, compress: bool = False) -> bytes:
+    """Serialize the full ``/api/word`` success body, gzipped if requested"""
+    body = json.dumps({'data': data, 'success': True}, separators=(',', ':')).encode('utf-8')
+    # mtime=0 keeps the compressed bytes identical for identical content
+    return gzip.compress(body, mtime=0) if compress else body
+
+
+class WordEntry(namedtuple('WordEntry', ['body', 'gzip_body', 'etag'])):
+    """
+    A word's response body ready to send, plus its gzip form when the stored
+    payload was pre-compressed and a strong ETag of the uncompressed body.
+
+    The body may be a ``memoryview`` into a snapshot mapping; it is only
+    copied when it is actually written to a response.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_payload(cls, payload) -> 'WordEntry':
+        if payload[:2] == GZIP_MAGIC:
+            body, gzip_body = gzip.decompress(payload), payload
+        else:
+            body, gzip_body = payload, None
+        return cls(body, gzip_body, hashlib.blake2b(body, digest_size=12).hexdigest())
+
+    @classmethod
+    def from_data(cls, data: Dict) -> 'WordEntry':
+        return cls.from_payload(encode_payload(data))
+
+    def data(self) -> Dict:
+        """Decode the word definition dict (for callers that merge words)"""
+        return json.loads(str(self.body, 'utf-8'))['data']
+
+
+def rebuild_payloads(cursor: sqlite3.Cursor, compress: bool = False,
+                     words: Optional[Iterable[str]] = None) -> int:
+    """
+    Re-serialize the payload of every row, or only of ``words`` (matched
+    case-insensitively). Returns the number of payloads written.
+    """
+    columns = table_columns(cursor)
+    source = [column for column in PAYLOAD_SOURCE_COLUMNS if column in columns]
+    key_column = 'word_lowercase' if 'word_lowercase' in columns else 'word'
+    select = f"SELECT id, {', '.join(source)} FROM dictionary"
+
+    def encode_rows(rows):
+        return [(encode_payload(word_data(dict(zip(source, row[1:]))), compress), row[0])
+                for row in rows]
+
+    written = 0
+    if words is not None:
+        words = sorted({word.lower() for word in words})
+        for start in range(0, len(words), 500):
+            chunk = words[start:start + 500]
+            cursor.execute(f"{select} WHERE {key_column} IN ({','.join('?' * len(chunk))})", chunk)
+            updates = encode_rows(cursor.fetchall())
+            cursor.executemany('UPDATE dictionary SET payload = ? WHERE id = ?', updates)
+            written += len(updates)
+        return written
+
+    # Page by id rather than updating under an open SELECT
+    last_id = 0
+    while True:
+        cursor.execute(f'{select} WHERE id > ? ORDER BY id LIMIT ?', (last_id, REBUILD_BATCH))
+        rows = cursor.fetchall()
+        if not rows:
+            return written
+        cursor.executemany('UPDATE dictionary SET payload = ? WHERE id = ?', encode_rows(rows))
+        written += len(rows)
+        last_id = rows[-1][0]
+        logger.info(f"Rebuilt {written} payloads")
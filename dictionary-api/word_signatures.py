@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Word Signatures
+Derived per-word keys stored next to each dictionary row, so word-game
+queries (anagrams, cryptogram candidates) are answered by one index seek
+"""
+
+import sqlite3
+import logging
+from typing import Callable, Dict
+
+from dictionary_schema import add_missing_columns, table_columns
+
+logger = logging.getLogger(__name__)
+
+# Rows re-computed per statement by backfill_signatures
+BACKFILL_BATCH = 5000
+
+
+def letters_sorted(word: str) -> str:
+    """
+    Anagram signature: the word's letters, lowercased and sorted, ignoring
+    hyphens, apostrophes and spaces. Two words are exact anagrams when
+    their signatures are equal.
+    """
+    return ''.join(sorted(c for c in word.lower() if c.isalpha()))
+
+
+def letter_pattern(word: str) -> str:
+    """
+    Letter-repetition signature: each distinct letter replaced by A, B, C...
+    in order of first appearance, so "letter" becomes ``ABCCBD``. Other
+    characters (hyphens, apostrophes) are kept, since a cryptogram shows
+    them as-is.
+    """
+    codes = {}
+    pattern = []
+    for c in word.lower():
+        if c.isalpha():
+            c = codes.setdefault(c, chr(ord('A') + len(codes)))
+        pattern.append(c)
+    return ''.join(pattern)
+
+
+# Signature column -> function computing it from the word
+SIGNATURES: Dict[str, Callable[[str], str]] = {
+    'letters_sorted': letters_sorted,
+    'letter_pattern': letter_pattern,
+}
+
+# Signature column -> columns after it in its index, so equal-signature
+# rows come back already in ranking order
+SIGNATURE_INDEXES = {
+    'letters_sorted': ('frequency_rank', 'word'),
+    'letter_pattern': ('is_common DESC', 'frequency_rank', 'word'),
+}
+
+
+def word_signatures(word: str) -> Dict[str, str]:
+    """Every signature column value for a word"""
+    return {column: signature(word) for column, signature in SIGNATURES.items()}
+
+
+def create_signature_columns(cursor: sqlite3.Cursor):
+    """
+    Add the signature columns and their indexes. Writers fill the columns
+    when they store a word; ``backfill_signatures`` fills rows stored
+    before the columns existed.
+    """
+    add_missing_columns(cursor, {'is_common': 'BOOLEAN DEFAULT 0', 'frequency_rank': 'INTEGER DEFAULT 999999'})
+    add_missing_columns(cursor, {column: 'TEXT' for column in SIGNATURES})
+    for column, ordering in SIGNATURE_INDEXES.items():
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{column}
+            ON dictionary({', '.join((column,) + ordering)})
+        ''')
+
+
+def backfill_signatures(cursor: sqlite3.Cursor, only_missing: bool = True) -> int:
+    """
+    Compute the signature columns of rows where any is NULL, or of every
+    row. Returns the number of rows updated.
+    """
+    columns = list(SIGNATURES)
+    key_column = 'word_lowercase' if 'word_lowercase' in table_columns(cursor) else 'word'
+    where = ' OR '.join(f'{column} IS NULL' for column in columns) if only_missing else '1'
+    assignments = ', '.join(f'{column} = ?' for column in columns)
+
+    # Page by id rather than updating under an open SELECT
+    written = 0
+    last_id = 0
+    while True:
+        cursor.execute(f'''
+            SELECT id, {key_column} FROM dictionary
+            WHERE id > ? AND ({where}) ORDER BY id LIMIT ?
+        ''', (last_id, BACKFILL_BATCH))
+        rows = cursor.fetchall()
+        if not rows:
+            return written
+        cursor.executemany(
+            f'UPDATE dictionary SET {assignments} WHERE id = ?',
+            [tuple(SIGNATURES[column](word) for column in columns) + (row_id,) for row_id, word in rows]
+        )
+        written += len(rows)
+        last_id = rows[-1][0]
+        logger.info(f"Backfilled signatures for {written} words")